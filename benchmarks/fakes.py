@@ -0,0 +1,290 @@
+"""
+Local stand-ins for AssemblyAI and the AI service, for load tests.
+
+Both servers are plain stdlib HTTP servers with configurable latency and error
+distributions. Point the backend at them with
+
+    ASSEMBLYAI_BASE_URL=http://localhost:9001
+    AI_SERVICE_URL=http://localhost:9002
+
+and run `python -m benchmarks.fakes` (or let `benchmarks.loadtest --start-fakes`
+run them in-process).
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Distribution:
+    """
+    A latency distribution in seconds, parsed from a short spec:
+
+        0.2                   fixed
+        uniform:0.1:0.5       uniform between the bounds
+        lognormal:0.5:0.4     log-normal with the given median and sigma
+        exp:0.3               exponential with the given mean
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, rest = spec.partition(":")
+        if not rest:
+            value = float(kind)
+            self._sample = lambda: value
+            return
+        args = [float(a) for a in rest.split(":")]
+        if kind == "uniform":
+            low, high = args
+            self._sample = lambda: random.uniform(low, high)
+        elif kind == "lognormal":
+            median, sigma = args
+            mu = math.log(median)
+            self._sample = lambda: random.lognormvariate(mu, sigma)
+        elif kind == "exp":
+            (mean,) = args
+            self._sample = lambda: random.expovariate(1 / mean)
+        else:
+            raise ValueError(f"Unknown distribution: {spec}")
+
+    def sample(self) -> float:
+        return max(self._sample(), 0.0)
+
+    def __repr__(self):
+        return f"Distribution({self.spec!r})"
+
+
+class FaultProfile:
+    """Per-request latency plus a probability of answering with HTTP 500."""
+
+    def __init__(self, latency: str = "0", error_rate: float = 0.0):
+        self.latency = Distribution(latency)
+        self.error_rate = error_rate
+
+    def apply(self) -> bool:
+        """Sleep for a sampled latency; True if this request should fail."""
+        time.sleep(self.latency.sample())
+        return random.random() < self.error_rate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "qcloser-fake/1.0"
+    routes: list = []
+    faults: FaultProfile = FaultProfile()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        for route_method, pattern, handler in self.routes:
+            match = re.fullmatch(pattern, self.path.split("?")[0])
+            if route_method == method and match:
+                break
+        else:
+            return self._send(404, {"error": f"no route for {method} {self.path}"})
+
+        if self.faults.apply():
+            return self._send(500, {"error": "injected failure"})
+        status, payload = handler(self.server, body, *match.groups())
+        self._send(status, payload)
+
+    def _send(self, status: int, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+def _serve(routes, faults: FaultProfile, port: int, **state) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"routes": routes, "faults": faults})
+    server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+    server.daemon_threads = True
+    for key, value in state.items():
+        setattr(server, key, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# AssemblyAI
+# ---------------------------------------------------------------------------
+
+SAMPLE_UTTERANCES = [
+    {"speaker": "A", "text": "Thanks for taking the time today. How are you handling renewals now?", "start": 0, "end": 4200, "confidence": 0.95},
+    {"speaker": "B", "text": "Mostly spreadsheets, and we lose track of deals every quarter.", "start": 4300, "end": 8100, "confidence": 0.93},
+    {"speaker": "A", "text": "What does a lost renewal cost you?", "start": 8200, "end": 10400, "confidence": 0.96},
+    {"speaker": "B", "text": "Probably a few hundred thousand a year. We need something before Q3.", "start": 10500, "end": 15000, "confidence": 0.94},
+]
+
+
+def _upload(server, body):
+    return 200, {"upload_url": f"https://cdn.fake-assemblyai.local/upload/{uuid.uuid4().hex}"}
+
+
+def _submit(server, body):
+    job_id = uuid.uuid4().hex
+    with server.lock:
+        server.jobs[job_id] = time.monotonic() + server.transcription_time.sample()
+    return 200, {"id": job_id, "status": "queued"}
+
+
+def _poll(server, body, job_id):
+    with server.lock:
+        ready_at = server.jobs.get(job_id)
+    if ready_at is None:
+        return 404, {"error": "transcript not found"}
+    if time.monotonic() < ready_at:
+        return 200, {"id": job_id, "status": "processing"}
+    return 200, {
+        "id": job_id,
+        "status": "completed",
+        "language_code": "en",
+        "text": " ".join(u["text"] for u in SAMPLE_UTTERANCES),
+        "utterances": SAMPLE_UTTERANCES,
+    }
+
+
+def serve_assemblyai(port: int, faults: FaultProfile, transcription_time: str = "5"):
+    routes = [
+        ("POST", r"/v2/upload", _upload),
+        ("POST", r"/v2/transcript", _submit),
+        ("GET", r"/v2/transcript/([0-9a-f]+)", _poll),
+    ]
+    return _serve(
+        routes, faults, port,
+        jobs={}, lock=threading.Lock(), transcription_time=Distribution(transcription_time),
+    )
+
+
+# ---------------------------------------------------------------------------
+# AI service
+# ---------------------------------------------------------------------------
+
+AI_VERSION = "fake-1"
+
+
+def _version(server, body):
+    return 200, {
+        "version": AI_VERSION,
+        "features": ["gzip", "transcript_ref"],
+        "analysis_fields": {
+            "feedback": ["analysis_text", "spin"],
+            "followup": ["analysis_text", "buying_signals"],
+        },
+    }
+
+
+def _has_transcript(server, body) -> bool:
+    """Remember transcripts sent in full; False if one sent by hash is unknown."""
+    payload = json.loads(body or b"{}")
+    digest = payload.get("transcript_sha256")
+    if digest is None:
+        return True
+    with server.lock:
+        if "transcript" in payload:
+            server.transcripts[digest] = payload["transcript"]
+        return digest in server.transcripts
+
+
+def _stage(handler):
+    def wrapped(server, body):
+        if not _has_transcript(server, body):
+            return 409, {"error": "transcript_unknown"}
+        return handler(server, body)
+    return wrapped
+
+
+def _analyze(server, body):
+    return 200, {"version": AI_VERSION, "analysis_json": {
+        "analysis_text": "The buyer loses renewals to spreadsheet tracking and has a Q3 deadline.",
+        "buying_signals": ["Quantified pain", "Explicit timeline"],
+        "spin": {"situation": "Spreadsheets", "problem": "Lost renewals", "implication": "Revenue loss", "need_payoff": "Before Q3"},
+    }}
+
+
+def _feedback(server, body):
+    return 200, {"version": AI_VERSION, "feedback_json": {
+        "strengths": ["Asked an implication question early"],
+        "improvements": ["Confirm the decision process"],
+        "score": 7,
+    }}
+
+
+def _followup(server, body):
+    return 200, {"version": AI_VERSION, "followup_json": {
+        "message": "Great speaking today — sharing a short plan to get renewals tracked before Q3.",
+        "next_questions": ["Who else signs off on tooling?"],
+    }}
+
+
+def serve_ai(port: int, faults: FaultProfile):
+    routes = [
+        ("GET", r"/version", _version),
+        ("POST", r"/analyze", _stage(_analyze)),
+        ("POST", r"/feedback", _stage(_feedback)),
+        ("POST", r"/followup", _stage(_followup)),
+    ]
+    return _serve(routes, faults, port, transcripts={}, lock=threading.Lock())
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--assemblyai-port", type=int, default=9001)
+    parser.add_argument("--ai-port", type=int, default=9002)
+    parser.add_argument("--assemblyai-latency", default="lognormal:0.15:0.5",
+                        help="per-request latency of the fake AssemblyAI")
+    parser.add_argument("--assemblyai-error-rate", type=float, default=0.0)
+    parser.add_argument("--transcription-time", default="uniform:3:15",
+                        help="time until a submitted transcript completes")
+    parser.add_argument("--ai-latency", default="lognormal:2:0.5",
+                        help="per-request latency of the fake AI service")
+    parser.add_argument("--ai-error-rate", type=float, default=0.0)
+
+
+def start_from_args(args):
+    return (
+        serve_assemblyai(
+            args.assemblyai_port,
+            FaultProfile(args.assemblyai_latency, args.assemblyai_error_rate),
+            args.transcription_time,
+        ),
+        serve_ai(args.ai_port, FaultProfile(args.ai_latency, args.ai_error_rate)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    args = parser.parse_args()
+    start_from_args(args)
+    print(
+        f"fake AssemblyAI on :{args.assemblyai_port}, fake AI service on :{args.ai_port} "
+        "— Ctrl-C to stop"
+    )
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
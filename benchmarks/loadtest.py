@@ -0,0 +1,243 @@
+"""
+Drive N concurrent uploads through the real API and Celery workers and report
+throughput, end-to-end and per-stage latency, and DB query counts.
+
+The backend must be running with ASSEMBLYAI_BASE_URL / AI_SERVICE_URL pointed
+at the fakes (see benchmarks/fakes.py) and, for request query counts,
+QUERY_COUNT_HEADER=True. Example:
+
+    python -m benchmarks.loadtest --start-fakes \\
+        --base-url http://localhost:8000 --email bench@example.com --password ... \\
+        -n 50 -c 10 --max-p95 120 --json results.json
+
+Exits with status 1 when a --max-p95 / --min-throughput budget is missed, so it
+can gate a deploy.
+"""
+
+import argparse
+import io
+import json
+import math
+import statistics
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from . import fakes
+
+TERMINAL_STATUSES = {"done", "failed"}
+
+
+def percentile(values, q: float):
+    """Nearest-rank percentile; None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _summary(values) -> dict:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 3),
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def sample_wav(seconds: float = 1.0, rate: int = 8000) -> bytes:
+    """A silent mono WAV — the fake AssemblyAI never looks at the audio."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buf.getvalue()
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.base_url = args.base_url.rstrip("/")
+        self.session = requests.Session()
+        self.audio = sample_wav(args.audio_seconds)
+        self.query_counts = {"upload": [], "detail": []}
+        self.upload_latency = []
+
+    def login(self):
+        resp = self.session.post(
+            f"{self.base_url}/api/auth/token/",
+            json={"email": self.args.email, "password": self.args.password},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        self.session.headers["Authorization"] = f"Bearer {resp.json()['access']}"
+
+    def _record_queries(self, endpoint: str, resp):
+        count = resp.headers.get("X-DB-Queries")
+        if count is not None:
+            self.query_counts[endpoint].append(int(count))
+
+    def upload(self, i: int) -> dict:
+        started = time.monotonic()
+        resp = self.session.post(
+            f"{self.base_url}/api/recordings/",
+            files={"audio_file": (f"bench-{i}.wav", self.audio, "audio/wav")},
+            data={"deal_title": f"Benchmark deal {i}", "language": "auto"},
+            timeout=120,
+        )
+        elapsed = time.monotonic() - started
+        self.upload_latency.append(elapsed)
+        self._record_queries("upload", resp)
+        if resp.status_code != 201:
+            return {"id": None, "status": f"upload_http_{resp.status_code}", "started": started}
+        return {"id": resp.json()["id"], "status": "uploaded", "started": started}
+
+    def wait(self, job: dict) -> dict:
+        deadline = job["started"] + self.args.timeout
+        while time.monotonic() < deadline:
+            resp = self.session.get(f"{self.base_url}/api/recordings/{job['id']}/", timeout=30)
+            self._record_queries("detail", resp)
+            if resp.ok:
+                job["status"] = resp.json()["status"]
+                if job["status"] in TERMINAL_STATUSES:
+                    job["finished"] = time.monotonic()
+                    return job
+            time.sleep(self.args.poll_interval)
+        job["status"] = f"timeout ({job['status']})"
+        return job
+
+    def run_one(self, i: int) -> dict:
+        job = self.upload(i)
+        if job["id"] is None:
+            return job
+        return self.wait(job)
+
+    def stage_latency(self, since: datetime) -> list:
+        resp = self.session.get(
+            f"{self.base_url}/api/recordings/stage-latency/",
+            params={"since": since.isoformat()},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        return resp.json()["stages"]
+
+    def worker_queries(self) -> dict:
+        """Mean queries per task run from the worker's Prometheus exporter."""
+        if not self.args.worker_metrics:
+            return {}
+        from prometheus_client.parser import text_string_to_metric_families
+
+        resp = requests.get(self.args.worker_metrics, timeout=10)
+        resp.raise_for_status()
+        totals = {}
+        for family in text_string_to_metric_families(resp.text):
+            if family.name != "qcloser_task_db_queries":
+                continue
+            for sample in family.samples:
+                task = sample.labels.get("task")
+                if sample.name.endswith("_sum"):
+                    totals.setdefault(task, [0, 0])[0] = sample.value
+                elif sample.name.endswith("_count"):
+                    totals.setdefault(task, [0, 0])[1] = sample.value
+        return totals
+
+    def run(self) -> dict:
+        self.login()
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.args.clock_skew)
+        workers_before = self.worker_queries()
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency) as pool:
+            jobs = list(pool.map(self.run_one, range(self.args.count)))
+        wall = time.monotonic() - started
+
+        workers_after = self.worker_queries()
+        task_queries = {}
+        for task, (total, runs) in workers_after.items():
+            prev_total, prev_runs = workers_before.get(task, (0, 0))
+            if runs > prev_runs:
+                task_queries[task] = round((total - prev_total) / (runs - prev_runs), 1)
+
+        statuses = {}
+        for job in jobs:
+            statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+        done = [j for j in jobs if j["status"] == "done"]
+
+        return {
+            "recordings": self.args.count,
+            "concurrency": self.args.concurrency,
+            "wall_seconds": round(wall, 2),
+            "throughput_per_minute": round(len(done) / wall * 60, 2) if wall else 0,
+            "statuses": statuses,
+            "upload_seconds": _summary(self.upload_latency),
+            "end_to_end_seconds": _summary([j["finished"] - j["started"] for j in done]),
+            "stages": self.stage_latency(since),
+            "db_queries": {
+                "requests": {k: _summary(v) for k, v in self.query_counts.items()},
+                "tasks_mean_per_run": task_queries,
+            },
+        }
+
+
+def check_budgets(report: dict, args) -> list:
+    failures = []
+    p95 = report["end_to_end_seconds"].get("p95")
+    if args.max_p95 is not None and (p95 is None or p95 > args.max_p95):
+        failures.append(f"end-to-end p95 {p95}s exceeds {args.max_p95}s")
+    if args.min_throughput is not None and report["throughput_per_minute"] < args.min_throughput:
+        failures.append(
+            f"throughput {report['throughput_per_minute']}/min below {args.min_throughput}/min"
+        )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("-n", "--count", type=int, default=20, help="recordings to upload")
+    parser.add_argument("-c", "--concurrency", type=int, default=5)
+    parser.add_argument("--audio-seconds", type=float, default=1.0)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=600, help="per recording, seconds")
+    parser.add_argument("--clock-skew", type=float, default=5,
+                        help="seconds subtracted from the start time for the stage-latency window")
+    parser.add_argument("--worker-metrics", default="",
+                        help="worker Prometheus URL, e.g. http://localhost:9808/metrics")
+    parser.add_argument("--start-fakes", action="store_true",
+                        help="run the fake AssemblyAI / AI servers in this process")
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    parser.add_argument("--max-p95", type=float, help="fail if end-to-end p95 exceeds this")
+    parser.add_argument("--min-throughput", type=float,
+                        help="fail if completed recordings per minute fall below this")
+    fakes.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.start_fakes:
+        fakes.start_from_args(args)
+
+    report = LoadTest(args).run()
+    print(json.dumps(report, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = check_budgets(report, args)
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
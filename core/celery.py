@@ -2,6 +2,8 @@ import os
 from celery import Celery
 from celery.schedules import crontab
 import core.tasks  # noqa: F401 — ensures flush_expired_tokens is registered
+import core.metrics  # noqa: F401 — connects the Celery instrumentation signals
+import core.tracing  # noqa: F401 — propagates traceparent through task headers
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 app = Celery("core")
@@ -9,10 +11,39 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 app.conf.beat_schedule = {
+    "relay-outbox-every-30-seconds": {
+        "task": "services.conversations.tasks.relay_outbox",
+        "schedule": 30,
+    },
+    "admit-pipeline-jobs-every-15-seconds": {
+        "task": "services.conversations.tasks.admit_pipeline_jobs",
+        "schedule": 15,
+    },
+    "advance-bulk-jobs-every-30-seconds": {
+        "task": "services.conversations.tasks.advance_bulk_jobs",
+        "schedule": 30,
+    },
     "sweep-stuck-deliveries-every-5-minutes": {
         "task": "services.conversations.tasks.sweep_stuck_deliveries",
         "schedule": 300,
     },
+    "resume-stuck-pipelines-every-5-minutes": {
+        "task": "services.conversations.tasks.resume_stuck_pipelines",
+        "schedule": 300,
+    },
+    "refresh-dashboard-rollups-every-5-minutes": {
+        "task": "services.conversations.tasks.refresh_dashboard_rollups",
+        "schedule": 300,
+    },
+    "schedule-recording-digests-every-minute": {
+        "task": "services.conversations.tasks.schedule_recording_digests",
+        "schedule": 60,
+    },
+    # Beat runs in UTC (no CELERY_TIMEZONE) — 15:00 UTC is end of the working day in Israel.
+    "schedule-daily-digests": {
+        "task": "services.conversations.tasks.schedule_daily_digests",
+        "schedule": crontab(hour=15, minute=0),
+    },
     "flush-expired-tokens": {
         "task": "core.tasks.flush_expired_tokens",
         "schedule": crontab(hour=3, minute=0),
@@ -0,0 +1,211 @@
+"""
+Prometheus metrics shared by the web and worker processes.
+
+Gunicorn and Celery prefork both run several processes; set PROMETHEUS_MULTIPROC_DIR
+to a shared, writable directory so each scrape aggregates all of them.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from celery import signals
+from django.db import connection
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# AI stages and transcription run from seconds to tens of minutes.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+TASK_RUNTIME = Histogram(
+    "qcloser_task_runtime_seconds",
+    "Celery task execution time.",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_QUEUE_LATENCY = Histogram(
+    "qcloser_task_queue_latency_seconds",
+    "Time between publishing a Celery task and a worker starting it.",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_RETRIES = Counter(
+    "qcloser_task_retries_total",
+    "Celery task retries.",
+    ["task"],
+)
+PIPELINE_STAGE_DURATION = Histogram(
+    "qcloser_pipeline_stage_seconds",
+    "Wall time of one recording pipeline stage.",
+    ["stage", "org", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+AI_SERVICE_LATENCY = Histogram(
+    "qcloser_ai_service_request_seconds",
+    "AI service HTTP request latency.",
+    ["endpoint", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+AI_SERVICE_REJECTIONS = Counter(
+    "qcloser_ai_service_rejections_total",
+    "AI service calls not made because the circuit was open or the concurrency limit reached.",
+    ["reason"],
+)
+ASSEMBLYAI_LATENCY = Histogram(
+    "qcloser_assemblyai_request_seconds",
+    "AssemblyAI HTTP request latency.",
+    ["operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+TASK_DB_QUERIES = Histogram(
+    "qcloser_task_db_queries",
+    "Database queries executed by one Celery task run.",
+    ["task"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+STATUS_TRANSITIONS = Counter(
+    "qcloser_recording_status_transitions_total",
+    "CallRecording status changes, by the status entered.",
+    ["status", "org"],
+)
+
+
+@contextmanager
+def timed(histogram, **labels):
+    """
+    Observe the duration of the block on `histogram`, adding an `outcome`
+    label of "success" or "error".
+    """
+    start = time.monotonic()
+    outcome = "success"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        histogram.labels(outcome=outcome, **labels).observe(time.monotonic() - start)
+
+
+class QueryCounter:
+    """`connection.execute_wrapper` hook that counts executed queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryCountMiddleware:
+    """
+    Adds `X-DB-Queries` to every response. Enabled with QUERY_COUNT_HEADER for
+    load tests and local profiling; works without DEBUG.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        response["X-DB-Queries"] = str(counter.count)
+        return response
+
+
+def _registry():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_latest() -> tuple[bytes, str]:
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+# ---------------------------------------------------------------------------
+# Celery instrumentation
+# ---------------------------------------------------------------------------
+
+_task_started = {}
+
+
+@signals.before_task_publish.connect
+def _stamp_published_at(headers=None, **kwargs):
+    # Overwrite on every publish: retries re-send the message with the old headers.
+    if headers is not None:
+        headers["published_at"] = time.time()
+
+
+def _ready_at(request) -> float | None:
+    """
+    When the task became runnable: publish time, or its ETA for countdown/retry
+    messages, so deliberate delays don't count as queue wait.
+    """
+    published_at = request.get("published_at")
+    if not published_at:
+        return None
+    ready_at = float(published_at)
+    eta = request.get("eta")
+    if eta:
+        try:
+            ready_at = max(ready_at, datetime.fromisoformat(str(eta)).timestamp())
+        except ValueError:
+            pass
+    return ready_at
+
+
+@signals.task_prerun.connect
+def _task_prerun(task_id=None, task=None, **kwargs):
+    counter = QueryCounter()
+    wrapper = connection.execute_wrapper(counter)
+    wrapper.__enter__()
+    _task_started[task_id] = (time.monotonic(), counter, wrapper)
+    ready_at = _ready_at(task.request)
+    if ready_at is not None:
+        TASK_QUEUE_LATENCY.labels(task=task.name).observe(max(time.time() - ready_at, 0))
+
+
+@signals.task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        started_at, counter, wrapper = started
+        wrapper.__exit__(None, None, None)
+        TASK_RUNTIME.labels(task=task.name, state=state or "UNKNOWN").observe(
+            time.monotonic() - started_at
+        )
+        TASK_DB_QUERIES.labels(task=task.name).observe(counter.count)
+
+
+@signals.task_retry.connect
+def _task_retry(sender=None, **kwargs):
+    TASK_RETRIES.labels(task=sender.name).inc()
+
+
+@signals.worker_init.connect
+def _start_worker_exporter(**kwargs):
+    from django.conf import settings
+
+    port = getattr(settings, "METRICS_WORKER_PORT", None)
+    if port:
+        start_http_server(port, registry=_registry())
+
+
+@signals.worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **kwargs):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
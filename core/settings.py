@@ -22,6 +22,24 @@ ALLOWED_HOSTS = [
 
 AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://ai:8001")
 AI_SERVICE_TOKEN = os.getenv("AI_SERVICE_TOKEN", "")
+# How long the AI service's GET /version (stage versions, features) is trusted (seconds).
+AI_VERSION_CACHE_TTL = int(os.getenv("AI_VERSION_CACHE_TTL", "60"))
+# Request bodies at least this large are gzipped, if the AI service accepts it.
+AI_SERVICE_GZIP_MIN_BYTES = int(os.getenv("AI_SERVICE_GZIP_MIN_BYTES", "8192"))
+# How long a transcript sent in full is assumed cached by the AI service, which
+# is then sent only its hash (if it supports transcript references). Seconds.
+AI_TRANSCRIPT_REF_TTL = int(os.getenv("AI_TRANSCRIPT_REF_TTL", "3600"))
+# Load protection for AI service calls (services/conversations/circuit.py). The
+# circuit opens after AI_CIRCUIT_FAILURES consecutive failures (transient errors
+# or calls over AI_CIRCUIT_SLOW_CALL seconds) and probes after AI_CIRCUIT_COOLDOWN.
+AI_CIRCUIT_FAILURES = int(os.getenv("AI_CIRCUIT_FAILURES", "5"))
+AI_CIRCUIT_SLOW_CALL = int(os.getenv("AI_CIRCUIT_SLOW_CALL", "60"))
+AI_CIRCUIT_COOLDOWN = int(os.getenv("AI_CIRCUIT_COOLDOWN", "30"))
+# Calls in flight across all processes adapt between these bounds, shrinking
+# when calls take longer than AI_LATENCY_TARGET seconds.
+AI_CONCURRENCY_MIN = int(os.getenv("AI_CONCURRENCY_MIN", "2"))
+AI_CONCURRENCY_MAX = int(os.getenv("AI_CONCURRENCY_MAX", "16"))
+AI_LATENCY_TARGET = int(os.getenv("AI_LATENCY_TARGET", "20"))
 
 # OpenAi key
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -53,6 +71,7 @@ AUTH_USER_MODEL = "accounts.User"
 
 # Middleware
 MIDDLEWARE = [
+    "core.tracing.TracingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -120,12 +139,16 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "services.accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_THROTTLE_RATES": {
+        # Recording uploads per organization (applied to POST /api/recordings/ only).
+        "org_upload": os.getenv("ORG_UPLOAD_RATE", "60/min"),
+    },
 }
 
 SIMPLE_JWT = {
@@ -136,6 +159,27 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
 
+# Cache
+# Shared by all web/worker processes when REDIS_CACHE_URL is set; per-process otherwise.
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL", "")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+            "KEY_PREFIX": "qcloser",
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+# Authenticated users/orgs are cached for AUTH_CACHE_TTL in the shared cache and
+# AUTH_CACHE_LOCAL_TTL in each process (bounds how stale a deactivation can be elsewhere).
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", "300"))
+AUTH_CACHE_LOCAL_TTL = int(os.getenv("AUTH_CACHE_LOCAL_TTL", "10"))
+
 # I18N
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = "Asia/Jerusalem"
@@ -179,6 +223,59 @@ if not DEBUG:
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
 
+# Pipeline scheduling (services/conversations/scheduler.py)
+PIPELINE_MAX_CONCURRENCY = int(os.getenv("PIPELINE_MAX_CONCURRENCY", "8"))
+PIPELINE_ORG_MAX_CONCURRENCY = int(os.getenv("PIPELINE_ORG_MAX_CONCURRENCY", "3"))
+PIPELINE_BULK_MAX_CONCURRENCY = int(os.getenv("PIPELINE_BULK_MAX_CONCURRENCY", "4"))
+# A running job older than this no longer holds a slot (its worker is presumed dead).
+PIPELINE_JOB_TIMEOUT = timedelta(seconds=int(os.getenv("PIPELINE_JOB_TIMEOUT", "1800")))
+PIPELINE_ADMIT_DEBOUNCE = 2  # seconds
+# Retries of a run after a transient AI service error (timeout, 429, 5xx), with
+# exponential backoff from BASE_DELAY up to MAX_DELAY seconds.
+PIPELINE_MAX_RETRIES = int(os.getenv("PIPELINE_MAX_RETRIES", "5"))
+PIPELINE_RETRY_BASE_DELAY = int(os.getenv("PIPELINE_RETRY_BASE_DELAY", "10"))
+PIPELINE_RETRY_MAX_DELAY = int(os.getenv("PIPELINE_RETRY_MAX_DELAY", "300"))
+# A recording mid-stage with no live job and no stage started for this long is
+# re-queued by resume_stuck_pipelines.
+PIPELINE_STUCK_AFTER = timedelta(seconds=int(os.getenv("PIPELINE_STUCK_AFTER", "900")))
+
+# Org dashboard (services/conversations/dashboard.py)
+# Upload days, counting today, whose rollups every refresh rebuilds.
+DASHBOARD_ROLLUP_DAYS = int(os.getenv("DASHBOARD_ROLLUP_DAYS", "2"))
+
+# Audio playback (services/conversations/playback.py): lifetime of the signed
+# playback URLs handed out for locally stored audio. S3 URLs use AWS_QUERYSTRING_EXPIRE.
+PLAYBACK_URL_TTL = int(os.getenv("PLAYBACK_URL_TTL", "3600"))
+
+# Exports (services/conversations/export.py): rows read and encoded per chunk.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Bulk imports (services/conversations/bulk.py)
+BULK_IMPORT_CONCURRENCY = int(os.getenv("BULK_IMPORT_CONCURRENCY", "4"))
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "20"))
+BULK_IMPORT_MAX_IN_FLIGHT = int(os.getenv("BULK_IMPORT_MAX_IN_FLIGHT", "50"))
+BULK_RERUN_BATCH_SIZE = int(os.getenv("BULK_RERUN_BATCH_SIZE", "100"))
+BULK_RERUN_MAX_QUEUED = int(os.getenv("BULK_RERUN_MAX_QUEUED", "200"))
+
+# Metrics
+# Workers expose /metrics on this port when set; web serves it at /metrics.
+METRICS_WORKER_PORT = int(os.getenv("METRICS_WORKER_PORT", "0")) or None
+# Scrapes of the web /metrics endpoint must send "Authorization: Bearer <token>".
+# Unset, /metrics answers 404 (except with DEBUG on).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Adds an X-DB-Queries response header (used by benchmarks/loadtest.py).
+QUERY_COUNT_HEADER = os.getenv("QUERY_COUNT_HEADER", "False").lower() in ("1", "true", "yes")
+if QUERY_COUNT_HEADER:
+    MIDDLEWARE.insert(1, "core.metrics.QueryCountMiddleware")
+
+# Tracing
+# "otlp" posts OTLP/JSON to TRACING_OTLP_ENDPOINT, "file" appends it to TRACING_FILE;
+# empty disables export (trace ids are still propagated).
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "").strip().lower()
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_FILE = os.getenv("TRACING_FILE", os.path.join(BASE_DIR, "traces.jsonl"))
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "qcloser-backend")
+
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://q-closer.com")
 PASSWORD_RESET_TIMEOUT = 60 * 60 * 24 * 3  # 3 days
 
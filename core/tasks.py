@@ -1,11 +1,13 @@
 from celery import shared_task
-from django.core.management import call_command
 import logging
 
 logger = logging.getLogger(__name__)
 
 @shared_task(name="core.tasks.flush_expired_tokens")
 def flush_expired_tokens():
-    logger.info("Running flushexpiredtokens...")
-    call_command("flushexpiredtokens")
-    logger.info("flushexpiredtokens complete.")
+    # Imported here: this module is loaded by core.celery before Django is set up.
+    from services.accounts.tokens import flush_expired_outstanding_tokens
+
+    logger.info("Flushing expired outstanding tokens...")
+    deleted = flush_expired_outstanding_tokens()
+    logger.info("flush_expired_tokens complete: %d token(s) deleted.", deleted)
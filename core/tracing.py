@@ -0,0 +1,346 @@
+"""
+Lightweight distributed tracing with W3C `traceparent` propagation.
+
+One upload fans out over the web process, several Celery tasks, AssemblyAI and
+the AI service. Spans are kept in a contextvar, propagated through Celery
+message headers and outbound HTTP headers, and exported as OTLP/JSON either to
+a collector (TRACING_EXPORTER=otlp) or to a JSON-lines file
+(TRACING_EXPORTER=file) that the collector's otlpjsonfile receiver can read.
+
+With no exporter configured, ids are still generated and propagated so logs and
+response headers can be correlated, but nothing is recorded.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+import requests
+from celery import signals
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = 1, 2, 3, 4, 5
+
+EXPORT_BATCH_SIZE = 256
+EXPORT_INTERVAL = 2.0
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    kind: int = INTERNAL
+    attributes: dict = field(default_factory=dict)
+    start_ns: int = 0
+    end_ns: int = 0
+    error: str | None = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def parse_traceparent(value) -> tuple[str, str] | None:
+    """(trace_id, parent span_id) from a traceparent header, or None if invalid."""
+    match = _TRACEPARENT_RE.match((value or "").strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return match.group(1), match.group(2)
+
+
+def inject(headers: dict) -> dict:
+    """Add the current span's traceparent to `headers` (in place) and return it."""
+    span = _current.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.traceparent
+    return headers
+
+
+def start_span(name: str, *, parent: str | None = None, kind: int = INTERNAL, **attributes):
+    """
+    Start a span and make it current. `parent` is a remote traceparent; without
+    it the span continues the current trace or starts a new one.
+    Returns (span, token) — pass both to end_span().
+    """
+    remote = parse_traceparent(parent) if parent else None
+    local = _current.get()
+    if remote:
+        trace_id, parent_id = remote
+    elif local is not None:
+        trace_id, parent_id = local.trace_id, local.span_id
+    else:
+        trace_id, parent_id = secrets.token_hex(16), None
+
+    span = Span(
+        name=name,
+        trace_id=trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent_id,
+        kind=kind,
+        attributes={k: v for k, v in attributes.items() if v is not None},
+        start_ns=time.time_ns(),
+    )
+    return span, _current.set(span)
+
+
+def end_span(span: Span, token, error: BaseException | None = None):
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    _current.reset(token)
+    _exporter.submit(span)
+
+
+@contextmanager
+def span(name: str, *, parent: str | None = None, kind: int = INTERNAL, **attributes):
+    current, token = start_span(name, parent=parent, kind=kind, **attributes)
+    try:
+        yield current
+    except BaseException as exc:
+        end_span(current, token, error=exc)
+        raise
+    end_span(current, token)
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(span: Span) -> dict:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+        # STATUS_CODE_ERROR = 2, STATUS_CODE_UNSET = 0
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 0},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+def to_otlp(spans: list, service_name: str) -> dict:
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": "qcloser"},
+                "spans": [_otlp_span(s) for s in spans],
+            }],
+        }]
+    }
+
+
+class _Exporter:
+    """
+    Buffers finished spans and ships them from a daemon thread, so request and
+    task code never blocks on the collector. The thread is started lazily per
+    process — Celery prefork children don't inherit the parent's.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=10_000)
+        self._pid = None
+        self._lock = threading.Lock()
+        self._settings = None
+
+    def _config(self):
+        if self._settings is None:
+            from django.conf import settings
+
+            self._settings = {
+                "exporter": getattr(settings, "TRACING_EXPORTER", ""),
+                "file": getattr(settings, "TRACING_FILE", "traces.jsonl"),
+                "endpoint": getattr(settings, "TRACING_OTLP_ENDPOINT", ""),
+                "service": getattr(settings, "TRACING_SERVICE_NAME", "qcloser"),
+            }
+        return self._settings
+
+    def configure(self, **overrides):
+        """Replace the settings-derived configuration (tests, management commands)."""
+        self._settings = {**self._config(), **overrides}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._config()["exporter"])
+
+    def submit(self, span: Span):
+        if not self.enabled:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            logger.warning("tracing: export queue full, dropping span %s", span.name)
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name="trace-exporter", daemon=True).start()
+
+    def _run(self):
+        while True:
+            time.sleep(EXPORT_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        while True:
+            batch = []
+            while len(batch) < EXPORT_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            try:
+                self._export(batch)
+            except Exception as exc:
+                logger.warning("tracing: failed to export %d spans — %s", len(batch), exc)
+
+    def _export(self, batch: list):
+        config = self._config()
+        payload = to_otlp(batch, config["service"])
+        if config["exporter"] == "file":
+            with open(config["file"], "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+        elif config["exporter"] == "otlp":
+            resp = requests.post(config["endpoint"], json=payload, timeout=5)
+            resp.raise_for_status()
+        else:
+            raise ValueError(f"Unknown TRACING_EXPORTER: {config['exporter']}")
+
+
+_exporter = _Exporter()
+configure = _exporter.configure
+flush = _exporter.flush
+atexit.register(flush)
+
+
+# ---------------------------------------------------------------------------
+# Celery propagation
+# ---------------------------------------------------------------------------
+
+_task_spans = {}
+
+
+@signals.before_task_publish.connect
+def _inject_task_headers(headers=None, **kwargs):
+    # Keep an existing traceparent: retries re-publish with the original headers,
+    # and the outbox relay sets the one captured when the task was staged.
+    if headers is not None and TRACEPARENT_HEADER not in headers:
+        inject(headers)
+
+
+def _task_traceparent(request) -> str | None:
+    value = request.get(TRACEPARENT_HEADER)
+    if not value:
+        value = (getattr(request, "headers", None) or {}).get(TRACEPARENT_HEADER)
+    return value
+
+
+@signals.task_prerun.connect
+def _start_task_span(task_id=None, task=None, **kwargs):
+    _task_spans[task_id] = start_span(
+        f"celery.task {task.name}",
+        parent=_task_traceparent(task.request),
+        kind=CONSUMER,
+        **{"celery.task_id": task_id, "celery.retries": task.request.retries or 0},
+    )
+
+
+@signals.task_postrun.connect
+def _end_task_span(task_id=None, state=None, **kwargs):
+    started = _task_spans.pop(task_id, None)
+    if started is None:
+        return
+    current, token = started
+    current.set_attribute("celery.state", state or "UNKNOWN")
+    if state == "FAILURE":
+        current.error = "task failed"
+    try:
+        end_span(current, token)
+    except ValueError:
+        # The token belongs to a different context (eager/threaded pools) — still export.
+        current.end_ns = time.time_ns()
+        _exporter.submit(current)
+
+
+@signals.worker_process_shutdown.connect
+def _flush_on_shutdown(**kwargs):
+    flush()
+
+
+# ---------------------------------------------------------------------------
+# Django
+# ---------------------------------------------------------------------------
+
+class TracingMiddleware:
+    """
+    Continues an incoming traceparent (or starts a trace) for each request and
+    returns the trace id in `X-Trace-Id`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with span(
+            f"HTTP {request.method}",
+            parent=request.headers.get(TRACEPARENT_HEADER),
+            kind=SERVER,
+            **{"http.method": request.method, "http.target": request.path},
+        ) as current:
+            response = self.get_response(request)
+            route = getattr(getattr(request, "resolver_match", None), "route", None)
+            if route:
+                current.name = f"HTTP {request.method} /{route}"
+            current.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                current.error = f"HTTP {response.status_code}"
+        response["X-Trace-Id"] = current.trace_id
+        return response
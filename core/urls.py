@@ -1,12 +1,16 @@
+import hmac
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.http import HttpResponse
 from django.urls import path, include
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.routers import DefaultRouter
-from services.conversations.views import CallRecordingViewSet
+from core.metrics import render_latest
+from services.conversations.views import BulkJobViewSet, CallRecordingViewSet
 
 
 @api_view(["GET"])
@@ -14,11 +18,29 @@ from services.conversations.views import CallRecordingViewSet
 def ping(request):
     return Response({"status": "ok", "message": "qcloser backend is alive"})
 
+
+def metrics(request):
+    # Labels carry org ids and per-org volume: without a token the endpoint
+    # only exists under DEBUG.
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    elif not hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        return HttpResponse(status=401)
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)
+
+
 router = DefaultRouter()
 router.register("recordings", CallRecordingViewSet, basename="recording")
+router.register("bulk-jobs", BulkJobViewSet, basename="bulk-job")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics), # Prometheus scrape endpoint
     path("api/ping/", ping), # simple endpoint to check if the backend is responding (for deployment in AWS / Docker / Render / Railway)
     path("api/auth/", include("services.accounts.urls")),
     path("api/", include(router.urls)), # DRF generates GET,POST,PATCH... routes for recordings. bc of router
@@ -1,14 +1,27 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
-from .models import Organization, User
+from .models import Organization, OrganizationUsage, User
 
 
 @admin.register(Organization)
 class OrganizationAdmin(admin.ModelAdmin):
-    list_display = ("name", "domain", "created_at")
+    list_display = (
+        "name", "domain", "delivery_mode", "daily_upload_quota",
+        "monthly_audio_minutes_quota", "monthly_ai_calls_quota", "created_at",
+    )
     search_fields = ("name", "domain")
 
 
+@admin.register(OrganizationUsage)
+class OrganizationUsageAdmin(admin.ModelAdmin):
+    list_display = (
+        "org", "date", "uploads", "uploaded_bytes", "audio_seconds",
+        "ai_analyze_calls", "ai_feedback_calls", "ai_followup_calls",
+    )
+    list_filter = ("org",)
+    date_hierarchy = "date"
+
+
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
     add_form_template = None  # suppress Django's "enter a username and password" template message
@@ -22,7 +35,7 @@ class UserAdmin(DjangoUserAdmin):
         ("Personal info", {"fields": ("first_name", "last_name")}),
         ("Permissions", {"fields": ("is_active", "is_staff", "is_superuser", "groups", "user_permissions")}),
         ("Important dates", {"fields": ("last_login", "date_joined")}),
-        ("Organization", {"fields": ("org",)}),
+        ("Organization", {"fields": ("org", "delivery_mode")}),
     )
 
     add_fieldsets = (
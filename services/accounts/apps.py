@@ -5,3 +5,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "services.accounts"
     label = "accounts"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,140 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import Organization, User
+
+USER_KEY = "auth:user:{}"
+ORG_KEY = "auth:org:{}"
+
+# Never cached: the hash isn't needed to authenticate a request, and loads lazily
+# (as a deferred field) on the rare request that does use it.
+_USER_EXCLUDED = {"password"}
+
+
+class _LocalCache:
+    """
+    Small per-process TTL cache in front of the shared cache. Other processes'
+    invalidations only reach it by expiry, so keep AUTH_CACHE_LOCAL_TTL short.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl: float):
+        with self._lock:
+            if len(self._data) >= self.max_entries:
+                self._data.clear()
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = _LocalCache()
+
+
+def _snapshot(instance, excluded=frozenset()) -> dict:
+    return {
+        f.attname: getattr(instance, f.attname)
+        for f in instance._meta.concrete_fields
+        if f.attname not in excluded
+    }
+
+
+def _restore(model, values: dict):
+    # A fresh instance per request, so views can't leak changes into the cache.
+    return model.from_db(None, list(values), list(values.values()))
+
+
+def _cached(key: str, load):
+    values = local_cache.get(key)
+    if values is None:
+        values = cache.get(key)
+        if values is None:
+            values = load()
+            if values is None:
+                return None
+            cache.set(key, values, settings.AUTH_CACHE_TTL)
+        local_cache.set(key, values, settings.AUTH_CACHE_LOCAL_TTL)
+    return values
+
+
+def get_cached_user(user_id) -> User | None:
+    """User (with `org` attached) for an id, through the local and shared caches."""
+
+    def load_user():
+        user = User.objects.filter(pk=user_id).first()
+        return _snapshot(user, _USER_EXCLUDED) if user else None
+
+    user_values = _cached(USER_KEY.format(user_id), load_user)
+    if user_values is None:
+        return None
+    user = _restore(User, user_values)
+
+    def load_org():
+        org = Organization.objects.filter(pk=user.org_id).first()
+        return _snapshot(org) if org else None
+
+    org_values = _cached(ORG_KEY.format(user.org_id), load_org)
+    if org_values is not None:
+        user.org = _restore(Organization, org_values)
+    return user
+
+
+def invalidate_user(user_id):
+    key = USER_KEY.format(user_id)
+    local_cache.delete(key)
+    cache.delete(key)
+
+
+def invalidate_org(org_id):
+    key = ORG_KEY.format(org_id)
+    local_cache.delete(key)
+    cache.delete(key)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user and their organization from a
+    short-TTL cache instead of the database on every request. Tokens issued
+    before a user moved to another org are rejected via the `org_id` claim.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        org_id = validated_token.get("org_id")
+        if org_id is not None and org_id != user.org_id:
+            raise AuthenticationFailed(
+                _("Token organization no longer matches"), code="org_changed"
+            )
+        return user
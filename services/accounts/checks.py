@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.security, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend.endswith("LocMemCache"):
+        return [
+            Warning(
+                "The default cache is per-process, so token revocations (logout, "
+                "refresh rotation) are not seen by other processes.",
+                hint="Set REDIS_CACHE_URL.",
+                id="accounts.W001",
+            )
+        ]
+    return []
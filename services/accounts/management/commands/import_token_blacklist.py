@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from services.accounts.tokens import import_legacy_blacklist
+
+
+class Command(BaseCommand):
+    help = "Copy unexpired token_blacklist entries into the cache-backed revocation set."
+
+    def handle(self, *args, **options):
+        imported = import_legacy_blacklist()
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} revoked token(s)."))
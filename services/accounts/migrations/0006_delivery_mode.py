@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-19 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_alter_user_org'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='delivery_mode',
+            field=models.CharField(choices=[('immediate', 'Immediately, one email per stage'), ('recording_digest', 'One email per recording'), ('daily_digest', 'One email per day')], default='immediate', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='delivery_mode',
+            field=models.CharField(blank=True, choices=[('immediate', 'Immediately, one email per stage'), ('recording_digest', 'One email per recording'), ('daily_digest', 'One email per day')], default='', help_text="Leave empty to use the organization's delivery mode.", max_length=32),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_delivery_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='daily_upload_quota',
+            field=models.PositiveIntegerField(blank=True, help_text='Recordings that may be uploaded per day (UTC).', null=True),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='monthly_ai_calls_quota',
+            field=models.PositiveIntegerField(blank=True, help_text='AI service calls (all stages) per calendar month.', null=True),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='monthly_audio_minutes_quota',
+            field=models.PositiveIntegerField(blank=True, help_text='Minutes of transcribed audio per calendar month.', null=True),
+        ),
+        migrations.CreateModel(
+            name='OrganizationUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('uploads', models.PositiveIntegerField(default=0)),
+                ('uploaded_bytes', models.PositiveBigIntegerField(default=0)),
+                ('audio_seconds', models.PositiveBigIntegerField(default=0)),
+                ('ai_analyze_calls', models.PositiveIntegerField(default=0)),
+                ('ai_feedback_calls', models.PositiveIntegerField(default=0)),
+                ('ai_followup_calls', models.PositiveIntegerField(default=0)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage', to='accounts.organization')),
+            ],
+            options={
+                'ordering': ['org', 'date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='organizationusage',
+            constraint=models.UniqueConstraint(fields=('org', 'date'), name='org_usage_unique_day'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_org_usage_quotas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organization',
+            name='max_concurrent_pipelines',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Pipelines this org may run at once. Empty = PIPELINE_ORG_MAX_CONCURRENCY.', null=True),
+        ),
+        migrations.AddField(
+            model_name='organization',
+            name='pipeline_weight',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Relative share of pipeline workers when several orgs are waiting.'),
+        ),
+    ]
@@ -26,6 +26,15 @@ class EmailUserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
+class DeliveryMode(models.TextChoices):
+    """
+    How pipeline notifications reach the salesperson.
+    """
+    IMMEDIATE = "immediate", "Immediately, one email per stage"
+    RECORDING_DIGEST = "recording_digest", "One email per recording"
+    DAILY_DIGEST = "daily_digest", "One email per day"
+
+
 class Organization(models.Model):
     """
     A company / team using the system.
@@ -37,6 +46,32 @@ class Organization(models.Model):
         blank=True,
         help_text="Optional: email domain like 'acme.com' for future auto-org matching.",
     )
+    delivery_mode = models.CharField(
+        max_length=32,
+        choices=DeliveryMode.choices,
+        default=DeliveryMode.IMMEDIATE,
+    )
+
+    # Quotas — empty means unlimited.
+    daily_upload_quota = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Recordings that may be uploaded per day (UTC)."
+    )
+    monthly_audio_minutes_quota = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Minutes of transcribed audio per calendar month."
+    )
+    monthly_ai_calls_quota = models.PositiveIntegerField(
+        null=True, blank=True, help_text="AI service calls (all stages) per calendar month."
+    )
+
+    # Pipeline scheduling (see conversations/scheduler.py).
+    pipeline_weight = models.PositiveSmallIntegerField(
+        default=1, help_text="Relative share of pipeline workers when several orgs are waiting."
+    )
+    max_concurrent_pipelines = models.PositiveSmallIntegerField(
+        null=True, blank=True,
+        help_text="Pipelines this org may run at once. Empty = PIPELINE_ORG_MAX_CONCURRENCY.",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -64,6 +99,14 @@ class User(AbstractUser):
         related_name="users",
     )
 
+    delivery_mode = models.CharField(
+        max_length=32,
+        choices=DeliveryMode.choices,
+        blank=True,
+        default="",
+        help_text="Leave empty to use the organization's delivery mode.",
+    )
+
     # later: role, is_sales_rep, is_manager, etc.
 
     def save(self, *args, **kwargs):
@@ -72,3 +115,31 @@ class User(AbstractUser):
 
     def __str__(self) -> str:
         return f"{self.email} ({self.org.name})"
+
+
+class OrganizationUsage(models.Model):
+    """
+    Per-organization, per-day (UTC) consumption counters. Rows are incremented
+    in place with F() expressions by services.accounts.usage.
+    """
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="usage")
+    date = models.DateField()
+    uploads = models.PositiveIntegerField(default=0)
+    uploaded_bytes = models.PositiveBigIntegerField(default=0)
+    audio_seconds = models.PositiveBigIntegerField(default=0)
+    ai_analyze_calls = models.PositiveIntegerField(default=0)
+    ai_feedback_calls = models.PositiveIntegerField(default=0)
+    ai_followup_calls = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["org", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["org", "date"], name="org_usage_unique_day"),
+        ]
+
+    @property
+    def ai_calls(self) -> int:
+        return self.ai_analyze_calls + self.ai_feedback_calls + self.ai_followup_calls
+
+    def __str__(self) -> str:
+        return f"Usage {self.org_id} {self.date}"
@@ -1,26 +1,58 @@
 from django.contrib.auth import password_validation
 from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
 
-from .models import Organization, User
+from .models import Organization, OrganizationUsage, User
+from .tokens import RevocableRefreshToken
+
+
+def user_role(user) -> str:
+    if user.is_superuser:
+        return "superuser"
+    if user.is_staff:
+        return "admin"
+    return "user"
 
 
 class OrganizationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Organization
-        fields = ["id", "name", "created_at"]
+        fields = [
+            "id",
+            "name",
+            "delivery_mode",
+            "daily_upload_quota",
+            "monthly_audio_minutes_quota",
+            "monthly_ai_calls_quota",
+            "created_at",
+        ]
+
+
+class OrganizationUsageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrganizationUsage
+        fields = [
+            "date",
+            "uploads",
+            "uploaded_bytes",
+            "audio_seconds",
+            "ai_analyze_calls",
+            "ai_feedback_calls",
+            "ai_followup_calls",
+            "ai_calls",
+        ]
 
 
 class UserSerializer(serializers.ModelSerializer):
     role = serializers.SerializerMethodField()
 
     def get_role(self, obj):
-        if obj.is_superuser:
-            return "superuser"
-        if obj.is_staff:
-            return "admin"
-        return "user"
+        return user_role(obj)
 
     class Meta:
         model = User
@@ -62,19 +94,32 @@ class UserManagementSerializer(serializers.ModelSerializer):
 class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ["id", "email", "first_name", "last_name", "is_active"]
+        fields = ["id", "email", "first_name", "last_name", "is_active", "delivery_mode"]
         read_only_fields = ["id", "email", "is_active"]
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RevocableRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        # Copied into every access token minted from this refresh token.
+        token = super().get_token(user)
+        token["org_id"] = user.org_id
+        token["role"] = user_role(user)
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
         data["email"] = self.user.email
         data["org_id"] = self.user.org_id
-        if self.user.is_superuser:
-            data["role"] = "superuser"
-        elif self.user.is_staff:
-            data["role"] = "admin"
-        else:
-            data["role"] = "user"
+        data["role"] = user_role(self.user)
         return data
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+
+class RevocableTokenBlacklistSerializer(TokenBlacklistSerializer):
+    token_class = RevocableRefreshToken
@@ -1,7 +1,23 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
 
-from .models import Organization, User
+from .authentication import get_cached_user
+from .models import Organization, OrganizationUsage, User
+from .tokens import (
+    RevocableRefreshToken,
+    flush_expired_outstanding_tokens,
+    import_legacy_blacklist,
+    is_revoked,
+)
+from .usage import QuotaExceeded, check_upload_quota, record_usage, today
 
 
 class AuthTestCase(TestCase):
@@ -379,3 +395,224 @@ class OrgAdminAccessTestCase(TestCase):
         self.assertEqual(response.status_code, 404)
         other_user.refresh_from_db()
         self.assertTrue(other_user.is_active)
+
+
+class CachedAuthenticationTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Org A")
+        self.user = User.objects.create_user(
+            email="rep@orga.com", password="strongpassword123", org=self.org, is_staff=True
+        )
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "rep@orga.com", "password": "strongpassword123"},
+            content_type="application/json",
+        )
+        self.access = response.data["access"]
+        self.me_url = reverse("user_me")
+
+    def _me(self):
+        return self.client.get(self.me_url, HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_access_token_carries_org_and_role_claims(self):
+        token = AccessToken(self.access)
+        self.assertEqual(token["org_id"], self.org.id)
+        self.assertEqual(token["role"], "admin")
+
+    def test_warm_cache_resolves_user_and_org_without_queries(self):
+        self.assertEqual(self._me().status_code, 200)
+        with self.assertNumQueries(0):
+            user = get_cached_user(self.user.id)
+            self.assertEqual(str(user), "rep@orga.com (Org A)")
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.assertEqual(self._me().status_code, 200)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertEqual(self._me().status_code, 401)
+
+    def test_token_from_previous_org_is_rejected(self):
+        self.assertEqual(self._me().status_code, 200)
+        self.user.org = Organization.objects.create(name="Org B")
+        self.user.save(update_fields=["org"])
+        self.assertEqual(self._me().status_code, 401)
+
+    def test_org_change_refreshes_cached_org(self):
+        get_cached_user(self.user.id)
+        self.org.name = "Renamed"
+        self.org.save()
+        self.assertEqual(get_cached_user(self.user.id).org.name, "Renamed")
+
+    def test_password_hash_is_not_cached(self):
+        get_cached_user(self.user.id)
+        user = get_cached_user(self.user.id)
+        self.assertIn("password", user.get_deferred_fields())
+        self.assertTrue(user.check_password("strongpassword123"))
+
+
+class TokenRevocationTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Org A")
+        self.user = User.objects.create_user(
+            email="rep@orga.com", password="strongpassword123", org=self.org
+        )
+
+    def _refresh(self, token):
+        return self.client.post(
+            reverse("token_refresh"), {"refresh": str(token)}, content_type="application/json"
+        )
+
+    def test_login_refresh_and_logout_write_no_token_rows(self):
+        response = self.client.post(
+            reverse("token_obtain_pair"),
+            {"email": "rep@orga.com", "password": "strongpassword123"},
+            content_type="application/json",
+        )
+        refresh = self._refresh(response.data["refresh"]).data["refresh"]
+        self.client.post(
+            reverse("token_blacklist"), {"refresh": refresh}, content_type="application/json"
+        )
+        self.assertEqual(OutstandingToken.objects.count(), 0)
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+    def test_rotated_refresh_token_is_revoked(self):
+        token = RevocableRefreshToken.for_user(self.user)
+        self.assertEqual(self._refresh(token).status_code, 200)
+        self.assertTrue(is_revoked(token["jti"]))
+        self.assertEqual(self._refresh(token).status_code, 401)
+
+    def _outstanding(self, expires_in):
+        jti = f"jti-{OutstandingToken.objects.count()}"
+        return OutstandingToken.objects.create(
+            user=self.user, jti=jti, token="x", expires_at=timezone.now() + expires_in
+        )
+
+    def test_flush_deletes_expired_prefix_in_batches(self):
+        for _ in range(5):
+            BlacklistedToken.objects.create(token=self._outstanding(timedelta(days=-1)))
+        live = self._outstanding(timedelta(days=1))
+
+        self.assertEqual(flush_expired_outstanding_tokens(batch_size=2), 5)
+        self.assertEqual(list(OutstandingToken.objects.all()), [live])
+        self.assertEqual(BlacklistedToken.objects.count(), 0)
+
+    def test_legacy_blacklist_is_imported(self):
+        revoked = self._outstanding(timedelta(days=1))
+        BlacklistedToken.objects.create(token=revoked)
+        BlacklistedToken.objects.create(token=self._outstanding(timedelta(days=-1)))
+
+        self.assertEqual(import_legacy_blacklist(), 1)
+        self.assertTrue(is_revoked(revoked.jti))
+
+
+class UsageTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Org A")
+        self.admin = User.objects.create_user(
+            email="admin@orga.com", password="strongpassword123", org=self.org, is_staff=True
+        )
+        self.rep = User.objects.create_user(
+            email="rep@orga.com", password="strongpassword123", org=self.org
+        )
+
+    def test_record_usage_accumulates_on_one_row_per_day(self):
+        record_usage(self.org.id, uploads=1, uploaded_bytes=100)
+        record_usage(self.org.id, uploads=1, uploaded_bytes=50, ai_analyze_calls=1)
+        usage = OrganizationUsage.objects.get(org=self.org, date=today())
+        self.assertEqual((usage.uploads, usage.uploaded_bytes, usage.ai_calls), (2, 150, 1))
+
+    def test_record_usage_rejects_unknown_counter(self):
+        with self.assertRaises(ValueError):
+            record_usage(self.org.id, downloads=1)
+
+    def test_upload_quota(self):
+        self.org.daily_upload_quota = 2
+        record_usage(self.org.id, uploads=1)
+        check_upload_quota(self.org)
+        record_usage(self.org.id, uploads=1)
+        with self.assertRaises(QuotaExceeded):
+            check_upload_quota(self.org)
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_upload_over_quota_is_429(self):
+        self.org.daily_upload_quota = 1
+        self.org.save()
+        record_usage(self.org.id, uploads=1)
+        self.client.force_login(self.rep)
+        response = self.client.post(
+            "/api/recordings/",
+            {"audio_file": SimpleUploadedFile("call.wav", b"RIFF", content_type="audio/wav")},
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("daily_upload_quota", response.data["detail"])
+
+    @patch("services.conversations.tasks.poll_transcription")
+    def test_pipeline_not_started_over_ai_quota(self, mock_poll):
+        from services.conversations.models import CallRecording
+        from services.conversations.tasks import poll_transcription_until_done
+
+        mock_poll.return_value = {"status": "completed", "text": "hi", "audio_duration": 90}
+        self.org.monthly_ai_calls_quota = 3
+        self.org.save()
+        record_usage(self.org.id, ai_analyze_calls=3)
+        recording = CallRecording.objects.create(
+            org=self.org,
+            audio_file="test/dummy.mp3",
+            transcription_job_id="job",
+            status=CallRecording.Status.TRANSCRIBING,
+        )
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            poll_transcription_until_done.apply(args=[recording.id])
+
+        recording.refresh_from_db()
+        self.assertEqual(recording.status, CallRecording.Status.FAILED)
+        self.assertEqual(recording.error_stage, "quota")
+        self.assertEqual(callbacks, [])
+        self.assertEqual(OrganizationUsage.objects.get(org=self.org).audio_seconds, 90)
+
+    @patch("services.conversations.views.poll_transcription")
+    def test_reading_a_transcript_counts_its_audio_once(self, mock_poll):
+        from services.conversations.models import CallRecording
+
+        mock_poll.return_value = {"status": "completed", "text": "hi", "audio_duration": 90}
+        recording = CallRecording.objects.create(
+            org=self.org,
+            audio_file="test/dummy.mp3",
+            transcription_job_id="job",
+            status=CallRecording.Status.TRANSCRIBING,
+        )
+        self.client.force_login(self.rep)
+        url = f"/api/recordings/{recording.id}/transcript/"
+        self.assertEqual(self.client.get(url).data["transcript"], "hi")
+
+        CallRecording.objects.filter(id=recording.id).update(status=CallRecording.Status.DONE)
+        response = self.client.get(url)
+        self.assertEqual(response.data["state"], "completed")
+        mock_poll.assert_called_once()
+        recording.refresh_from_db()
+        self.assertEqual(recording.status, CallRecording.Status.DONE)
+        self.assertEqual(OrganizationUsage.objects.get(org=self.org).audio_seconds, 90)
+
+    def test_usage_endpoint(self):
+        self.org.monthly_ai_calls_quota = 10
+        self.org.save()
+        record_usage(self.org.id, uploads=2, ai_feedback_calls=4)
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("org_usage"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["totals"]["uploads"], 2)
+        self.assertEqual(len(response.data["daily"]), 1)
+        self.assertEqual(
+            response.data["quotas"]["monthly_ai_calls_quota"],
+            {"limit": 10, "used": 4, "remaining": 6},
+        )
+        self.assertIsNone(response.data["quotas"]["daily_upload_quota"]["limit"])
+
+    def test_usage_endpoint_requires_org_admin(self):
+        self.client.force_login(self.rep)
+        self.assertEqual(self.client.get(reverse("org_usage")).status_code, 403)
+
+    def test_usage_endpoint_rejects_bad_dates(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("org_usage"), {"since": "last week"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,19 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class OrgRateThrottle(SimpleRateThrottle):
+    """
+    Rate limit shared by every user of an organization, so one tenant can't
+    exceed it by spreading requests over several accounts. Subclasses set
+    `scope`; rates come from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].
+    """
+
+    def get_cache_key(self, request, view):
+        org_id = getattr(request.user, "org_id", None)
+        if org_id is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": f"org-{org_id}"}
+
+
+class OrgUploadRateThrottle(OrgRateThrottle):
+    scope = "org_upload"
@@ -0,0 +1,107 @@
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import BlacklistMixin, RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow, datetime_from_epoch
+
+REVOKED_KEY = "auth:revoked:{}"
+
+
+def revoke_jti(jti: str, expires_at) -> bool:
+    """
+    Add a token id to the revocation set until the token would expire anyway.
+    Returns False for tokens that are already expired (nothing to store).
+    """
+    ttl = int((expires_at - aware_utcnow()).total_seconds()) + 1
+    if ttl <= 0:
+        return False
+    cache.set(REVOKED_KEY.format(jti), 1, ttl)
+    return True
+
+
+def is_revoked(jti: str) -> bool:
+    return cache.get(REVOKED_KEY.format(jti)) is not None
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    Refresh token revoked through a cache-backed set instead of the
+    token_blacklist tables: issuing writes nothing, and refresh/logout do one
+    cache read/write instead of DB lookups and inserts. Entries expire with
+    the token, so the set never needs flushing.
+    """
+
+    def verify(self, *args, **kwargs):
+        # Explicit, so revocation doesn't depend on token_blacklist staying installed.
+        self.check_blacklist()
+        super(BlacklistMixin, self).verify(*args, **kwargs)
+
+    def check_blacklist(self):
+        if is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        return revoke_jti(
+            self.payload[api_settings.JTI_CLAIM], datetime_from_epoch(self.payload["exp"])
+        )
+
+    @classmethod
+    def for_user(cls, user):
+        # Skip BlacklistMixin.for_user, which records an OutstandingToken row.
+        return super(BlacklistMixin, cls).for_user(user)
+
+
+# ---------------------------------------------------------------------------
+# Legacy token_blacklist tables
+# ---------------------------------------------------------------------------
+# Nothing new is written to OutstandingToken/BlacklistedToken; rows issued before
+# the switch drain out as they expire.
+
+FLUSH_BATCH_SIZE = 1000
+
+
+def flush_expired_outstanding_tokens(batch_size: int = FLUSH_BATCH_SIZE) -> int:
+    """
+    Delete expired OutstandingToken rows (and their BlacklistedToken) in
+    primary-key order, one batch at a time. All refresh tokens share a lifetime,
+    so expiry follows id order: stop at the first unexpired row instead of
+    scanning the unindexed expires_at column. Returns the number of tokens deleted.
+    """
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+
+    now = timezone.now()
+    deleted = 0
+    while True:
+        batch = list(
+            OutstandingToken.objects.order_by("id").values_list("id", "expires_at")[:batch_size]
+        )
+        expired = [token_id for token_id, expires_at in batch if expires_at <= now]
+        if expired:
+            BlacklistedToken.objects.filter(token_id__in=expired).delete()
+            OutstandingToken.objects.filter(id__in=expired).delete()
+            deleted += len(expired)
+        if len(expired) < batch_size:
+            return deleted
+
+
+def import_legacy_blacklist() -> int:
+    """
+    Copy unexpired BlacklistedToken rows into the revocation set, so tokens
+    revoked before the switch stay revoked. Run once when deploying it.
+    """
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+    imported = 0
+    rows = (
+        BlacklistedToken.objects
+        .filter(token__expires_at__gt=timezone.now())
+        .values_list("token__jti", "token__expires_at")
+    )
+    for jti, expires_at in rows.iterator():
+        imported += revoke_jti(jti, expires_at)
+    return imported
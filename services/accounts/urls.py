@@ -1,8 +1,8 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView, TokenBlacklistView
 
 from .views import (
     CustomTokenObtainPairView,
+    LogoutView,
     MeView,
     OrganizationCreateView,
     OrganizationDetailView,
@@ -10,17 +10,20 @@ from .views import (
     OrgUserDetailView,
     PasswordResetRequestView,
     PasswordResetConfirmView,
+    RevocableTokenRefreshView,
+    UsageView,
 )
 
 urlpatterns = [
     path("token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("logout/", TokenBlacklistView.as_view(), name="token_blacklist"),
+    path("token/refresh/", RevocableTokenRefreshView.as_view(), name="token_refresh"),
+    path("logout/", LogoutView.as_view(), name="token_blacklist"),
     path("me/", MeView.as_view(), name="user_me"),
     path("orgs/", OrganizationCreateView.as_view(), name="org_create"),
     path("orgs/<int:pk>/", OrganizationDetailView.as_view(), name="org_detail"),
     path("users/", OrgUserListCreateView.as_view(), name="org_user_list_create"),
     path("users/<int:pk>/", OrgUserDetailView.as_view(), name="org_user_detail"),
+    path("usage/", UsageView.as_view(), name="org_usage"),
     path("password-reset/", PasswordResetRequestView.as_view(), name="password_reset_request"),
     path("password-reset/confirm/", PasswordResetConfirmView.as_view(), name="password_reset_confirm"),
 ]
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import Organization, OrganizationUsage
+
+COUNTERS = (
+    "uploads",
+    "uploaded_bytes",
+    "audio_seconds",
+    "ai_analyze_calls",
+    "ai_feedback_calls",
+    "ai_followup_calls",
+)
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, quota: str, limit: int, used: float):
+        self.quota = quota
+        self.limit = limit
+        self.used = used
+        super().__init__(f"{quota} exceeded: {used:g} used of {limit}")
+
+
+def today() -> date:
+    return timezone.now().date()
+
+
+def record_usage(org_id, **deltas):
+    """
+    Add `deltas` (counter name -> amount) to today's usage row for the org.
+    One UPDATE in the common case; the first write of the day inserts the row.
+    """
+    deltas = {name: amount for name, amount in deltas.items() if amount}
+    if org_id is None or not deltas:
+        return
+    unknown = set(deltas) - set(COUNTERS)
+    if unknown:
+        raise ValueError(f"Unknown usage counters: {sorted(unknown)}")
+
+    increments = {name: F(name) + amount for name, amount in deltas.items()}
+    rows = OrganizationUsage.objects.filter(org_id=org_id, date=today())
+    if rows.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            OrganizationUsage.objects.create(org_id=org_id, date=today(), **deltas)
+    except IntegrityError:
+        # Another process created today's row first.
+        rows.update(**increments)
+
+
+def usage_totals(org_id, since: date, until: date) -> dict:
+    """Summed counters for days in [since, until]."""
+    totals = OrganizationUsage.objects.filter(
+        org_id=org_id, date__gte=since, date__lte=until
+    ).aggregate(**{name: Sum(name) for name in COUNTERS})
+    totals = {name: totals[name] or 0 for name in COUNTERS}
+    totals["ai_calls"] = (
+        totals["ai_analyze_calls"] + totals["ai_feedback_calls"] + totals["ai_followup_calls"]
+    )
+    totals["audio_minutes"] = round(totals["audio_seconds"] / 60, 2)
+    return totals
+
+
+def month_bounds(day: date) -> tuple[date, date]:
+    start = day.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+
+def quota_status(org: Organization) -> dict:
+    """Current consumption against each configured quota (None = unlimited)."""
+    day = today()
+    daily = usage_totals(org.id, day, day)
+    monthly = usage_totals(org.id, *month_bounds(day))
+    return {
+        "daily_upload_quota": (org.daily_upload_quota, daily["uploads"]),
+        "monthly_audio_minutes_quota": (org.monthly_audio_minutes_quota, monthly["audio_minutes"]),
+        "monthly_ai_calls_quota": (org.monthly_ai_calls_quota, monthly["ai_calls"]),
+    }
+
+
+def _enforce(org: Organization, quotas):
+    if all(getattr(org, quota) is None for quota in quotas):
+        return
+    status = quota_status(org)
+    for quota in quotas:
+        limit, used = status[quota]
+        if limit is not None and used >= limit:
+            raise QuotaExceeded(quota, limit, used)
+
+
+def check_upload_quota(org: Organization):
+    """
+    Raise QuotaExceeded if the org may not upload another recording. Soft
+    limits: concurrent uploads can overshoot by the number in flight.
+    """
+    _enforce(org, ["daily_upload_quota", "monthly_audio_minutes_quota"])
+
+
+def check_pipeline_quota(org: Organization):
+    """Raise QuotaExceeded if the org may not start more AI pipeline work."""
+    _enforce(org, ["monthly_ai_calls_quota"])
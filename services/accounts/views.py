@@ -6,6 +6,7 @@ from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import default_token_generator
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.mail import send_mail
+from django.utils.dateparse import parse_date
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from rest_framework.exceptions import ValidationError
@@ -18,17 +19,25 @@ from rest_framework.generics import (
 from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import (
+    TokenBlacklistView,
+    TokenObtainPairView,
+    TokenRefreshView,
+)
 
-from .models import Organization, User
+from .models import Organization, OrganizationUsage, User
 from .permissions import IsOrgAdmin
 from .serializers import (
     CustomTokenObtainPairSerializer,
     OrganizationSerializer,
+    OrganizationUsageSerializer,
+    RevocableTokenBlacklistSerializer,
+    RevocableTokenRefreshSerializer,
     UserManagementSerializer,
     UserSerializer,
     UserUpdateSerializer,
 )
+from .usage import month_bounds, quota_status, today, usage_totals
 
 
 logger = logging.getLogger(__name__)
@@ -56,6 +65,14 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class RevocableTokenRefreshView(TokenRefreshView):
+    serializer_class = RevocableTokenRefreshSerializer
+
+
+class LogoutView(TokenBlacklistView):
+    serializer_class = RevocableTokenBlacklistSerializer
+
+
 class MeView(RetrieveAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
@@ -104,6 +121,61 @@ class OrgUserDetailView(RetrieveUpdateDestroyAPIView):
         return Response(serializer.data)
 
 
+class UsageView(APIView):
+    """
+    GET /api/auth/usage/?since=YYYY-MM-DD&until=YYYY-MM-DD
+
+    Daily usage rows and totals for the caller's organization (superusers may pass
+    ?org_id=), plus consumption against each quota. Defaults to the current month.
+    """
+    permission_classes = [IsOrgAdmin]
+
+    def get(self, request):
+        org = request.user.org
+        if request.user.is_superuser and request.query_params.get("org_id"):
+            try:
+                org = Organization.objects.get(pk=request.query_params["org_id"])
+            except (Organization.DoesNotExist, ValueError):
+                return Response({"error": "Unknown org_id."}, status=404)
+
+        default_since, default_until = month_bounds(today())
+        try:
+            since = self._date_param(request, "since", default_since)
+            until = self._date_param(request, "until", default_until)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+        if since > until:
+            return Response({"error": "since must not be after until."}, status=400)
+
+        rows = OrganizationUsage.objects.filter(org=org, date__gte=since, date__lte=until)
+        quotas = {
+            name: {
+                "limit": limit,
+                "used": used,
+                "remaining": None if limit is None else max(limit - used, 0),
+            }
+            for name, (limit, used) in quota_status(org).items()
+        }
+        return Response({
+            "org_id": org.id,
+            "since": since,
+            "until": until,
+            "totals": usage_totals(org.id, since, until),
+            "daily": OrganizationUsageSerializer(rows, many=True).data,
+            "quotas": quotas,
+        })
+
+    @staticmethod
+    def _date_param(request, name, default):
+        value = request.query_params.get(name)
+        if not value:
+            return default
+        parsed = parse_date(value)
+        if parsed is None:
+            raise ValueError(f"{name} must be a date (YYYY-MM-DD).")
+        return parsed
+
+
 class PasswordResetRequestView(APIView):
     permission_classes = [AllowAny]
 
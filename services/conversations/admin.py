@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import CallRecording, NotificationDelivery
+from .models import (
+    BulkJob,
+    CallRecording,
+    NotificationDelivery,
+    NotificationDigest,
+    OutboxMessage,
+    PipelineJob,
+    RecordingInsights,
+    RecordingRollup,
+)
 
 
 @admin.register(CallRecording)
@@ -11,12 +20,12 @@ class CallRecordingAdmin(admin.ModelAdmin):
 @admin.register(NotificationDelivery)
 class NotificationDeliveryAdmin(admin.ModelAdmin):
     list_display = (
-        "id", "recording", "kind", "channel", "salesperson_email",
+        "id", "recording", "kind", "channel", "mode", "salesperson_email",
         "status", "attempts", "subject", "truncated_body", "truncated_last_error",
         "created_at", "last_attempt_at", "sent_at",
     )
     readonly_fields = ("created_at",)
-    list_filter = ("kind", "channel", "status")
+    list_filter = ("kind", "channel", "mode", "status")
 
     @admin.display(description="body")
     def truncated_body(self, obj):
@@ -29,3 +38,55 @@ class NotificationDeliveryAdmin(admin.ModelAdmin):
         if not obj.last_error:
             return ""
         return obj.last_error[:80] + ("…" if len(obj.last_error) > 80 else "")
+
+
+@admin.register(NotificationDigest)
+class NotificationDigestAdmin(admin.ModelAdmin):
+    list_display = (
+        "id", "mode", "salesperson_email", "recording", "status", "attempts",
+        "subject", "created_at", "sent_at",
+    )
+    readonly_fields = ("created_at",)
+    list_filter = ("mode", "status")
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "task_name", "args", "attempts", "created_at", "dispatched_at")
+    readonly_fields = ("created_at",)
+    list_filter = ("task_name",)
+
+
+@admin.register(PipelineJob)
+class PipelineJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "recording", "org", "lane", "state", "created_at", "admitted_at", "finished_at")
+    readonly_fields = ("created_at",)
+    list_filter = ("lane", "state", "org")
+
+
+@admin.register(BulkJob)
+class BulkJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id", "org", "kind", "state", "source", "total", "processed", "failed",
+        "created_at", "finished_at",
+    )
+    readonly_fields = ("created_at", "updated_at", "checkpoint")
+    list_filter = ("kind", "state")
+
+
+@admin.register(RecordingRollup)
+class RecordingRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "org", "date", "salesperson_email", "status", "error_stage",
+        "recordings", "completed", "turnaround_seconds",
+    )
+    list_filter = ("status", "org")
+
+
+@admin.register(RecordingInsights)
+class RecordingInsightsAdmin(admin.ModelAdmin):
+    list_display = (
+        "recording", "org", "recording_created_at", "commitment", "outcome_likelihood",
+        "buying_signal_score", "feedback_score", "updated_at",
+    )
+    list_filter = ("commitment", "org")
@@ -1,17 +1,160 @@
+import gzip
+import hashlib
+import json
+import logging
 import os
 import requests
 from django.conf import settings
+from django.core.cache import cache
+
+from core import tracing
+from core.metrics import AI_SERVICE_LATENCY, timed
+
+from . import circuit
+from .circuit import AIServiceUnavailable  # noqa: F401 — raised by the calls below
 
 AI_URL = getattr(settings, "AI_SERVICE_URL", "http://ai:8001").rstrip("/")
 AI_TOKEN = getattr(settings, "AI_SERVICE_TOKEN", "")
 
+INFO_KEY = "ai:service_info"
+TRANSCRIPT_SENT_KEY = "ai:transcript_sent:{}"
+_STAGES = ("analyze", "feedback", "followup")
+
+logger = logging.getLogger(__name__)
+
+
+class AIServiceError(RuntimeError):
+    """
+    An AI service call failed. `transient` failures (timeouts, connection errors,
+    429 and 5xx) are worth retrying; anything else will fail the same way again.
+    """
+
+    def __init__(self, message: str, *, transient: bool, status_code: int | None = None):
+        super().__init__(message)
+        self.transient = transient
+        self.status_code = status_code
+
 
 def _headers():
     h = {"Content-Type": "application/json"}
     token = getattr(settings, "AI_SERVICE_TOKEN", None)
     if token:
         h["X-AI-Token"] = token.strip()
-    return h
+    return tracing.inject(h)
+
+
+def _counts_against_service(exc: Exception) -> bool:
+    return isinstance(exc, AIServiceError) and exc.transient
+
+
+def _post(endpoint: str, payload: dict) -> dict:
+    """
+    POST to the AI service. Raises AIServiceUnavailable without calling it
+    while the circuit is open or the service is at its concurrency limit.
+    Bodies of AI_SERVICE_GZIP_MIN_BYTES or more are gzipped if the service
+    accepts it.
+    """
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    encoding = {}
+    if len(body) >= settings.AI_SERVICE_GZIP_MIN_BYTES and supports("gzip"):
+        body = gzip.compress(body, compresslevel=5)
+        encoding = {"Content-Encoding": "gzip"}
+
+    with circuit.guard(_counts_against_service), tracing.span(
+        f"ai_service POST {endpoint}",
+        kind=tracing.CLIENT,
+        **{"http.url": f"{AI_URL}{endpoint}", "recording_id": payload.get("recording_id")},
+    ), timed(AI_SERVICE_LATENCY, endpoint=endpoint):
+        try:
+            r = requests.post(
+                f"{AI_URL}{endpoint}", data=body, headers={**_headers(), **encoding}, timeout=120
+            )
+            r.raise_for_status()
+        except requests.HTTPError as exc:
+            code = exc.response.status_code if exc.response is not None else None
+            raise AIServiceError(
+                f"AI service {endpoint} returned HTTP {code}",
+                transient=code is None or code == 429 or code >= 500,
+                status_code=code,
+            ) from exc
+        except (requests.Timeout, requests.ConnectionError) as exc:
+            raise AIServiceError(f"AI service {endpoint} unreachable: {exc}", transient=True) from exc
+        return r.json()
+
+
+def service_info() -> dict:
+    """
+    The AI service's GET /version response, cached for AI_VERSION_CACHE_TTL;
+    {} if it can't be read. Besides versions it may list optional protocol
+    `features` and, per stage, the `analysis_fields` that stage reads.
+    """
+    info = cache.get(INFO_KEY)
+    if info is not None:
+        return info
+    try:
+        r = requests.get(f"{AI_URL}/version", headers=_headers(), timeout=5)
+        r.raise_for_status()
+        info = r.json()
+    except (requests.RequestException, ValueError) as exc:
+        logger.warning("ai_client: could not read AI service version — %s", exc)
+        info = {}
+    if not isinstance(info, dict):
+        info = {}
+    cache.set(INFO_KEY, info, settings.AI_VERSION_CACHE_TTL)
+    return info
+
+
+def supports(feature: str) -> bool:
+    """
+    Whether the AI service advertises an optional feature:
+    "gzip" (gzipped request bodies) or "transcript_ref" (see _post_stage).
+    """
+    return feature in (service_info().get("features") or ())
+
+
+def stage_versions() -> dict:
+    """
+    {stage: version} as reported by the AI service's GET /version. The service
+    may report one version for all stages ({"version": ...}) or one per stage
+    ({"analyze": ..., ...}). Returns {} (version unknown) if it doesn't say.
+    """
+    data = service_info()
+    if "version" in data:
+        data = dict.fromkeys(_STAGES, data["version"])
+    return {stage: str(data[stage]) for stage in _STAGES if data.get(stage)}
+
+
+def _project_analysis(stage: str, analysis_json):
+    """
+    Only the analysis fields `stage` reads, if the service says which
+    (analysis_fields in /version); otherwise the whole analysis.
+    """
+    fields = (service_info().get("analysis_fields") or {}).get(stage)
+    if not fields or not isinstance(analysis_json, dict):
+        return analysis_json
+    return {name: analysis_json[name] for name in fields if name in analysis_json}
+
+
+def _post_stage(endpoint: str, payload: dict, transcript: str) -> dict:
+    """
+    _post with the transcript added. With "transcript_ref" the service caches
+    transcripts by SHA-256, so once one has been sent only its hash is. If the
+    service has evicted it, it answers 409 and the full transcript is sent again.
+    """
+    if not transcript or not supports("transcript_ref"):
+        return _post(endpoint, {**payload, "transcript": transcript})
+
+    digest = hashlib.sha256(transcript.encode()).hexdigest()
+    sent_key = TRANSCRIPT_SENT_KEY.format(digest)
+    if cache.get(sent_key):
+        try:
+            return _post(endpoint, {**payload, "transcript_sha256": digest})
+        except AIServiceError as exc:
+            if exc.status_code != 409:
+                raise
+    result = _post(endpoint, {**payload, "transcript": transcript, "transcript_sha256": digest})
+    cache.set(sent_key, 1, settings.AI_TRANSCRIPT_REF_TTL)
+    return result
 
 
 def analyze_via_ai_service(
@@ -19,15 +162,10 @@ def analyze_via_ai_service(
 ):
     payload = {
         "recording_id": recording_id,
-        "transcript": transcript,
         "language": language or "auto",
         "deal_title": deal_title,
     }
-    r = requests.post(
-        f"{AI_URL}/analyze", json=payload, headers=_headers(), timeout=120
-    )
-    r.raise_for_status()
-    return r.json()
+    return _post_stage("/analyze", payload, transcript)
 
 
 def feedback_via_ai_service(
@@ -39,17 +177,12 @@ def feedback_via_ai_service(
     analysis_json: dict | None = None,
 ):
     payload = {
-        "transcript": transcript,
         "language": language or "auto",
         "deal_title": deal_title,
         "recording_id": recording_id,
-        "analysis_json": analysis_json,
+        "analysis_json": _project_analysis("feedback", analysis_json),
     }
-    r = requests.post(
-        f"{AI_URL}/feedback", json=payload, headers=_headers(), timeout=120
-    )
-    r.raise_for_status()
-    return r.json()
+    return _post_stage("/feedback", payload, transcript)
 
 
 def generate_followup_via_ai_service(
@@ -67,19 +200,10 @@ def generate_followup_via_ai_service(
     """
     payload = {
         "recording_id": recording_id,
-        "transcript": transcript,
         "deal_title": deal_title,
-        "analysis_json": analysis_json,
+        "analysis_json": _project_analysis("followup", analysis_json),
         "language": language,
         "channel": channel,
         "tone": tone,
     }
-
-    r = requests.post(
-        f"{AI_URL}/followup",
-        json=payload,
-        headers=_headers(),
-        timeout=120,
-    )
-    r.raise_for_status()
-    return r.json()
+    return _post_stage("/followup", payload, transcript)
@@ -5,3 +5,11 @@ class ConversationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "services.conversations"
     label = "conversations"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from . import signals  # noqa: F401
+        from .search import install_sqlite_index
+
+        post_migrate.connect(install_sqlite_index, sender=self)
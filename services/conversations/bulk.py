@@ -0,0 +1,495 @@
+"""
+Bulk operations over many recordings: historical imports and pipeline re-runs.
+
+An import creates all of its CallRecording rows up front (bulk_create), then
+advance_bulk_job submits them to AssemblyAI a batch at a time:
+
+- at most BULK_IMPORT_CONCURRENCY submissions run in parallel,
+- at most BULK_IMPORT_MAX_IN_FLIGHT of the job's recordings are transcribing
+  at once,
+- one batch of BULK_IMPORT_BATCH_SIZE per advance, and beat advances every
+  running job periodically.
+
+Finished transcriptions queue their pipeline run in the scheduler's bulk lane,
+so imports never delay other orgs' fresh calls. Each submission is saved as soon
+as it returns, so a job interrupted by a deploy or crash resumes where it stopped.
+
+The bucket is shared by every org, so API imports (staged=True) may only name
+objects under the org's staging prefix, imports/<org_id>/, that no other org's
+recording already points at. Arbitrary storage keys, S3 prefixes and local
+files are for `manage.py import_recordings` only.
+
+A re-run walks the recordings matching its filter in id order. Each advance
+clears the chosen stage outputs for up to BULK_RERUN_BATCH_SIZE of them and
+queues their pipeline jobs in the bulk lane. An incremental re-run clears
+nothing: the pipeline itself recomputes only the stale stages (versioning.py). It stops topping up while
+BULK_RERUN_MAX_QUEUED of its jobs are still waiting for admission.
+"""
+
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from services.accounts.usage import record_usage
+
+from .models import BulkJob, CallRecording, PipelineJob, StageEvent
+from .outbox import enqueue_task
+from .scheduler import cancel_queued_jobs, rerun_fields, schedule_pipelines
+from .timeline import finish_stage, start_stage
+from .transcription_service import submit_transcription
+
+logger = logging.getLogger(__name__)
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".mp4", ".ogg", ".oga", ".flac", ".webm", ".aac"}
+CREATE_BATCH_SIZE = 500
+ADVANCE_LOCK_KEY = "bulk:advance:{}"
+ADVANCE_LOCK_TIMEOUT = 600
+STAGING_PREFIX = "imports/{}/"
+
+
+class BulkJobError(ValueError):
+    pass
+
+
+class ImportItem(NamedTuple):
+    audio: str  # local file path, or the name of an object already in storage
+    deal_title: str = ""
+    salesperson_email: str = ""
+    client_email: str = ""
+    language: str = CallRecording.Language.AUTO
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+
+def _item(row: dict, defaults: dict) -> ImportItem:
+    row = {key: (value or "").strip() for key, value in row.items() if key in ImportItem._fields}
+    merged = {**defaults, **{key: value for key, value in row.items() if value}}
+    if not merged.get("audio"):
+        raise BulkJobError(f"Manifest row has no audio: {row}")
+    language = merged.get("language") or CallRecording.Language.AUTO
+    if language not in CallRecording.Language.values:
+        raise BulkJobError(
+            f"Unsupported language {language!r}; use one of {CallRecording.Language.values}."
+        )
+    return ImportItem(**{**merged, "language": language})
+
+
+def read_manifest(stream, name: str, defaults=None) -> list:
+    """
+    Items from a CSV (header row) or JSONL manifest with the columns `audio`,
+    `deal_title`, `salesperson_email`, `client_email` and `language`.
+    """
+    defaults = defaults or {}
+    try:
+        lines = stream.read().decode("utf-8-sig").splitlines()
+    except UnicodeDecodeError:
+        raise BulkJobError("Manifest must be UTF-8 text.")
+    if name.lower().endswith(".csv"):
+        return [_item(row, defaults) for row in csv.DictReader(lines)]
+    if name.lower().endswith((".jsonl", ".ndjson")):
+        items = []
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                raise BulkJobError(f"Line {number} is not valid JSON: {exc}")
+            items.append(_item({key: str(value) for key, value in row.items()}, defaults))
+        return items
+    raise BulkJobError("Manifest must be a .csv or .jsonl file.")
+
+
+def scan_directory(path: str, defaults=None) -> list:
+    """One item per audio file under `path`, titled after the file name."""
+    if not os.path.isdir(path):
+        raise BulkJobError(f"Not a directory: {path}")
+    items = []
+    for root, _, files in os.walk(path):
+        for filename in sorted(files):
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() in AUDIO_EXTENSIONS:
+                items.append(_item({"audio": os.path.join(root, filename), "deal_title": stem}, defaults or {}))
+    return sorted(items)
+
+
+def list_s3_prefix(prefix: str, defaults=None) -> list:
+    """One item per audio object under `prefix` in the storage bucket (no copying)."""
+    if not settings.USE_S3:
+        raise BulkJobError("S3 imports need USE_S3=True.")
+    import boto3
+
+    client = boto3.client(
+        "s3",
+        region_name=settings.AWS_S3_REGION_NAME,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    )
+    items = []
+    pages = client.get_paginator("list_objects_v2").paginate(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME, Prefix=prefix
+    )
+    for page in pages:
+        for obj in page.get("Contents", []):
+            stem, ext = os.path.splitext(os.path.basename(obj["Key"]))
+            if ext.lower() in AUDIO_EXTENSIONS:
+                items.append(_item({"audio": obj["Key"], "deal_title": stem}, defaults or {}))
+    return items
+
+
+def staging_prefix(org) -> str:
+    return STAGING_PREFIX.format(org.id)
+
+
+def _is_staged(org, key: str) -> bool:
+    # Storage keys are compared as written; ".", ".." and empty segments could
+    # resolve outside the prefix on filesystem storage, so they never match.
+    parts = key[:-1].split("/") if key.endswith("/") else key.split("/")
+    return key.startswith(staging_prefix(org)) and not any(part in ("", ".", "..") for part in parts)
+
+
+def staged_prefix(org, prefix: str) -> str:
+    """`prefix` if it lies within the org's staging prefix, else BulkJobError."""
+    prefix = (prefix or "").strip()
+    if not prefix.endswith("/"):
+        prefix += "/"
+    if not _is_staged(org, prefix):
+        raise BulkJobError(f"Imports must come from under {staging_prefix(org)}.")
+    return prefix
+
+
+def _check_staged(org, names: list):
+    outside = [name for name in names if not _is_staged(org, name) or name.endswith("/")]
+    if outside:
+        raise BulkJobError(f"Audio must be stored under {staging_prefix(org)}: {outside[:5]}")
+    taken = (
+        CallRecording.objects
+        .filter(audio_file__in=set(names))
+        .exclude(org=org)
+        .values_list("audio_file", flat=True)
+        .distinct()
+    )
+    taken = sorted(taken)
+    if taken:
+        raise BulkJobError(f"Audio already belongs to another organization: {taken[:5]}")
+
+
+def _stored_name(audio: str) -> str:
+    # Local files are copied into storage; anything else must already be there.
+    if os.path.isfile(audio):
+        with open(audio, "rb") as f:
+            return default_storage.save(
+                f"call_recordings/{os.path.basename(audio)}", File(f)
+            )
+    return audio
+
+
+# ---------------------------------------------------------------------------
+# Jobs
+# ---------------------------------------------------------------------------
+
+
+def create_import_job(
+    org, items, *, created_by=None, source: str = "", staged: bool = False
+) -> BulkJob:
+    """
+    Create the job and all of its recordings, and queue its first advance.
+    Items naming local files are copied into storage first, and other storage
+    keys are used as they are. With staged (API callers), nothing is copied
+    and every item must be an object in the org's staging prefix not used by
+    another org. Uploads count toward the org's usage but aren't held to the
+    daily upload quota — imports are planned, one-off volume.
+    """
+    if not items:
+        raise BulkJobError("Nothing to import.")
+    if staged:
+        names = [item.audio for item in items]
+        _check_staged(org, names)
+    else:
+        names = [_stored_name(item.audio) for item in items]
+
+    with transaction.atomic():
+        job = BulkJob.objects.create(
+            org=org,
+            created_by=created_by,
+            kind=BulkJob.Kind.IMPORT,
+            state=BulkJob.State.PENDING,
+            source=source[:512],
+            total=len(items),
+        )
+        CallRecording.objects.bulk_create(
+            [
+                CallRecording(
+                    org=org,
+                    uploaded_by=created_by,
+                    bulk_job=job,
+                    audio_file=name,
+                    deal_title=item.deal_title,
+                    salesperson_email=item.salesperson_email,
+                    client_email=item.client_email,
+                    language=item.language,
+                    status=CallRecording.Status.WAITING_TRANSCRIPTION,
+                )
+                for item, name in zip(items, names)
+            ],
+            batch_size=CREATE_BATCH_SIZE,
+        )
+        record_usage(org.id, uploads=len(items))
+        enqueue_advance(job)
+    return job
+
+
+# Re-runs skip recordings that are mid-transcription or mid-pipeline.
+RERUNNABLE_STATUSES = [
+    CallRecording.Status.TRANSCRIBED,
+    CallRecording.Status.ANALYZED,
+    CallRecording.Status.FEEDBACK_READY,
+    CallRecording.Status.FOLLOWUP_READY,
+    CallRecording.Status.DONE,
+    CallRecording.Status.FAILED,
+]
+
+
+def create_rerun_job(
+    org, stages, *, since=None, until=None, statuses=None, created_by=None, incremental=False
+) -> BulkJob:
+    """
+    Re-run `stages` for the org's recordings created in [since, until) whose
+    status is one of `statuses` (default: any not currently in progress).
+    With `incremental`, `stages` is ignored and only stale outputs are redone.
+    """
+    if incremental:
+        stages = []
+    else:
+        try:
+            rerun_fields(stages)
+        except ValueError as exc:
+            raise BulkJobError(str(exc))
+    statuses = list(statuses or [])
+    if set(statuses) - set(RERUNNABLE_STATUSES):
+        raise BulkJobError(f"Statuses must be among {[str(s) for s in RERUNNABLE_STATUSES]}.")
+
+    job = BulkJob(
+        org=org,
+        created_by=created_by,
+        kind=BulkJob.Kind.RERUN,
+        state=BulkJob.State.PENDING,
+        params={
+            "stages": list(stages),
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None,
+            "statuses": statuses,
+            "incremental": incremental,
+        },
+    )
+    job.total = rerun_queryset(job).count()
+    if not job.total:
+        raise BulkJobError("No recordings match the filter.")
+    with transaction.atomic():
+        job.save()
+        enqueue_advance(job)
+    return job
+
+
+def rerun_queryset(job: BulkJob):
+    params = job.params
+    qs = (
+        CallRecording.objects
+        .filter(org_id=job.org_id, status__in=params.get("statuses") or RERUNNABLE_STATUSES)
+        .exclude(transcript="")
+    )
+    if params.get("since"):
+        qs = qs.filter(created_at__gte=parse_datetime(params["since"]))
+    if params.get("until"):
+        qs = qs.filter(created_at__lt=parse_datetime(params["until"]))
+    return qs
+
+
+def enqueue_advance(job: BulkJob):
+    from .tasks import advance_bulk_job
+
+    enqueue_task(advance_bulk_job, job.id)
+
+
+def cancel_job(job: BulkJob) -> BulkJob:
+    """
+    Stop a job: nothing more is submitted or admitted. Work already running
+    (transcriptions, admitted pipeline runs) finishes normally. Re-run
+    recordings whose outputs were cleared but never admitted stay
+    `transcribed` and can be re-run individually.
+    """
+    with transaction.atomic():
+        job = BulkJob.objects.select_for_update().get(id=job.id)
+        if job.state in (BulkJob.State.COMPLETED, BulkJob.State.CANCELLED):
+            return job
+        job.state = BulkJob.State.CANCELLED
+        job.finished_at = timezone.now()
+        job.save(update_fields=["state", "finished_at", "updated_at"])
+        if job.kind == BulkJob.Kind.RERUN:
+            cancel_queued_jobs(bulk_job=job)
+            return job
+        job.recordings.filter(
+            status=CallRecording.Status.WAITING_TRANSCRIPTION, transcription_job_id=""
+        ).update(
+            status=CallRecording.Status.FAILED,
+            error_stage="cancelled",
+            error_message=f"Bulk job {job.id} was cancelled.",
+        )
+        cancel_queued_jobs(recording__bulk_job=job)
+    return job
+
+
+def job_progress(job: BulkJob) -> dict:
+    """Imports: the job's recordings by status. Re-runs: its pipeline jobs by state."""
+    if job.kind == BulkJob.Kind.RERUN:
+        rows = job.pipeline_jobs.order_by().values_list("state")
+    else:
+        rows = job.recordings.order_by().values_list("status")
+    return dict(rows.annotate(n=Count("id")))
+
+
+def advance(job_id: int) -> bool:
+    """
+    Process the next batch of a job. Returns True while there is more to do.
+    Concurrent advances of the same job are skipped rather than doubled up.
+    """
+    lock = ADVANCE_LOCK_KEY.format(job_id)
+    if not cache.add(lock, 1, ADVANCE_LOCK_TIMEOUT):
+        return True
+    try:
+        job = BulkJob.objects.filter(id=job_id).first()
+        if job is None or job.state not in (BulkJob.State.PENDING, BulkJob.State.RUNNING):
+            return False
+        if job.state == BulkJob.State.PENDING:
+            job.state = BulkJob.State.RUNNING
+            job.save(update_fields=["state", "updated_at"])
+        if job.kind == BulkJob.Kind.RERUN:
+            return _advance_rerun(job)
+        return _advance_import(job)
+    finally:
+        cache.delete(lock)
+
+
+def _advance_import(job: BulkJob) -> bool:
+    in_flight = (
+        job.recordings
+        .filter(status__in=[CallRecording.Status.WAITING_TRANSCRIPTION, CallRecording.Status.TRANSCRIBING])
+        .exclude(transcription_job_id="")
+        .count()
+    )
+    size = min(settings.BULK_IMPORT_BATCH_SIZE, settings.BULK_IMPORT_MAX_IN_FLIGHT - in_flight)
+    pending = job.recordings.filter(
+        id__gt=job.checkpoint,
+        status=CallRecording.Status.WAITING_TRANSCRIPTION,
+        transcription_job_id="",
+    ).order_by("id")
+    batch = list(pending[:size]) if size > 0 else []
+
+    if batch:
+        _submit_batch(job, batch)
+    elif not pending.exists():
+        _complete(job)
+        return False
+    return True
+
+
+def _complete(job: BulkJob):
+    job.state = BulkJob.State.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=["state", "finished_at", "updated_at"])
+    logger.info("bulk job %s: completed (%d processed, %d failed)", job.id, job.processed, job.failed)
+
+
+def _advance_rerun(job: BulkJob) -> bool:
+    queued = job.pipeline_jobs.filter(state=PipelineJob.State.QUEUED).count()
+    size = min(settings.BULK_RERUN_BATCH_SIZE, settings.BULK_RERUN_MAX_QUEUED - queued)
+    if size <= 0:
+        return True
+    batch = list(
+        rerun_queryset(job)
+        .filter(id__gt=job.checkpoint)
+        .order_by("id")
+        .values_list("id", flat=True)[:size]
+    )
+    if not batch:
+        _complete(job)
+        return False
+
+    # Clearing outputs under a running pipeline would lose them; skip those.
+    busy = set(
+        PipelineJob.objects
+        .filter(recording_id__in=batch, state=PipelineJob.State.RUNNING)
+        .values_list("recording_id", flat=True)
+    )
+    ids = [recording_id for recording_id in batch if recording_id not in busy]
+    with transaction.atomic():
+        if not job.params.get("incremental"):
+            CallRecording.objects.filter(id__in=ids).update(
+                **{field: None for field in rerun_fields(job.params["stages"])},
+                status=CallRecording.Status.TRANSCRIBED,
+                error_stage=None,
+                error_message=None,
+            )
+        schedule_pipelines(ids, lane=PipelineJob.Lane.BULK, bulk_job=job)
+        job.processed += len(ids)
+        if busy:
+            job.failed += len(busy)
+            job.last_error = f"Skipped recording(s) with a running pipeline: {sorted(busy)}"
+        job.checkpoint = batch[-1]
+        job.save(update_fields=["checkpoint", "processed", "failed", "last_error", "updated_at"])
+    return True
+
+
+def _submit(recording):
+    language = recording.language
+    return submit_transcription(
+        recording, language_code=None if language == CallRecording.Language.AUTO else language
+    )
+
+
+def _submit_batch(job: BulkJob, batch: list):
+    from .tasks import poll_transcription_until_done
+
+    for recording in batch:
+        start_stage(recording, StageEvent.Stage.TRANSCRIPTION)
+
+    with ThreadPoolExecutor(max_workers=settings.BULK_IMPORT_CONCURRENCY) as pool:
+        futures = {pool.submit(_submit, recording): recording for recording in batch}
+        # Save each result as it arrives: a crash mid-batch loses no submissions.
+        for future in as_completed(futures):
+            recording = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                logger.error("bulk job %s: submit failed for recording %s — %s", job.id, recording.id, exc)
+                recording.status = CallRecording.Status.FAILED
+                recording.error_stage = "transcription_submit"
+                recording.error_message = str(exc)
+                recording.save(update_fields=["status", "error_stage", "error_message"])
+                finish_stage(recording, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.FAILED)
+                job.failed += 1
+                job.last_error = str(exc)
+                continue
+            recording.transcription_job_id = result["id"]
+            with transaction.atomic():
+                recording.save(update_fields=["transcription_job_id"])
+                enqueue_task(poll_transcription_until_done, recording.id)
+            job.processed += 1
+
+    job.checkpoint = batch[-1].id
+    job.save(update_fields=["checkpoint", "processed", "failed", "last_error", "updated_at"])
@@ -0,0 +1,163 @@
+"""
+Load protection for AI service calls, shared by every web and worker process
+through the cache (Redis in production).
+
+Circuit breaker: AI_CIRCUIT_FAILURES consecutive failures open the circuit.
+Transient errors count as failures, and so do calls slower than
+AI_CIRCUIT_SLOW_CALL. While it is open, calls are rejected without touching the
+service. After AI_CIRCUIT_COOLDOWN seconds it goes half-open and lets one probe
+call through. A successful probe closes the circuit; a failed one reopens it.
+
+Adaptive concurrency: calls in flight are capped by a limit that adapts to
+observed latency (AIMD). Each call that comes back within AI_LATENCY_TARGET
+raises the limit by 1/limit, so roughly +1 per limit calls. A slow call or
+transient error halves it, at most once per AI_LATENCY_TARGET. The limit stays
+between AI_CONCURRENCY_MIN and AI_CONCURRENCY_MAX. Each call in flight holds a
+slot key that expires on its own, so a worker killed mid-call can't leak
+capacity.
+
+Updates to the failure count and the limit are not transactional. Concurrent
+calls can race, but only enough to nudge the thresholds.
+"""
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.metrics import AI_SERVICE_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+OPEN_UNTIL_KEY = "ai:circuit:open_until"
+FAILURES_KEY = "ai:circuit:failures"
+PROBE_KEY = "ai:circuit:probe"
+LIMIT_KEY = "ai:concurrency:limit"
+DECREASED_KEY = "ai:concurrency:decreased"
+SLOT_KEY = "ai:concurrency:slot:{}"
+
+# Longer than the AI service request timeout, so a slot or probe outlives its call.
+CALL_TIMEOUT = 130
+# How long callers turned away by the concurrency limit should wait.
+BUSY_RETRY_AFTER = 5
+
+
+class AIServiceUnavailable(Exception):
+    """The call was not made: the circuit is open or the service is at its limit."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def circuit_state() -> str:
+    opened_until = cache.get(OPEN_UNTIL_KEY)
+    if opened_until is None:
+        return "closed"
+    return "open" if time.time() < opened_until else "half_open"
+
+
+def concurrency_limit() -> float:
+    limit = cache.get(LIMIT_KEY)
+    return settings.AI_CONCURRENCY_MAX if limit is None else limit
+
+
+def _open():
+    cache.set(OPEN_UNTIL_KEY, time.time() + settings.AI_CIRCUIT_COOLDOWN, None)
+    cache.delete_many([FAILURES_KEY, PROBE_KEY])
+    logger.warning("circuit: AI service circuit opened for %ss", settings.AI_CIRCUIT_COOLDOWN)
+
+
+def _close():
+    cache.delete_many([OPEN_UNTIL_KEY, FAILURES_KEY, PROBE_KEY])
+    logger.info("circuit: AI service circuit closed")
+
+
+def _check_circuit() -> bool:
+    """Raise if the call must not be made. Returns True if it is the half-open probe."""
+    opened_until = cache.get(OPEN_UNTIL_KEY)
+    if opened_until is None:
+        return False
+    wait = opened_until - time.time()
+    if wait > 0:
+        AI_SERVICE_REJECTIONS.labels(reason="circuit_open").inc()
+        raise AIServiceUnavailable("AI service circuit is open", retry_after=wait)
+    if not cache.add(PROBE_KEY, 1, CALL_TIMEOUT):
+        AI_SERVICE_REJECTIONS.labels(reason="circuit_open").inc()
+        raise AIServiceUnavailable(
+            "AI service circuit is half-open, probe in flight",
+            retry_after=settings.AI_CIRCUIT_COOLDOWN,
+        )
+    return True
+
+
+def _acquire_slot() -> str:
+    slots = max(int(concurrency_limit()), 1)
+    first = random.randrange(slots)
+    for i in range(slots):
+        key = SLOT_KEY.format((first + i) % slots)
+        if cache.add(key, 1, CALL_TIMEOUT):
+            return key
+    AI_SERVICE_REJECTIONS.labels(reason="concurrency").inc()
+    raise AIServiceUnavailable(
+        f"AI service at its concurrency limit ({slots})", retry_after=BUSY_RETRY_AFTER
+    )
+
+
+def _adjust_limit(overloaded: bool):
+    limit = concurrency_limit()
+    if overloaded:
+        if not cache.add(DECREASED_KEY, 1, settings.AI_LATENCY_TARGET):
+            return
+        limit = max(settings.AI_CONCURRENCY_MIN, limit / 2)
+        logger.info("circuit: AI service concurrency limit lowered to %.1f", limit)
+    else:
+        limit = min(settings.AI_CONCURRENCY_MAX, limit + 1 / limit)
+    cache.set(LIMIT_KEY, limit, None)
+
+
+def _record(failed: bool, probe: bool):
+    if not failed:
+        if probe:
+            _close()
+        else:
+            cache.delete(FAILURES_KEY)
+        return
+    if probe:
+        _open()
+        return
+    cache.add(FAILURES_KEY, 0, None)
+    if cache.incr(FAILURES_KEY) >= settings.AI_CIRCUIT_FAILURES:
+        _open()
+
+
+@contextmanager
+def guard(is_failure):
+    """
+    Run one AI service call under the breaker and the concurrency limit.
+    Raises AIServiceUnavailable instead of entering the block if the call
+    must not be made. `is_failure(exc)` tells which exceptions from the
+    block count against the service (the rest, e.g. a 400, don't).
+    """
+    probe = _check_circuit()
+    try:
+        slot = _acquire_slot()
+    except AIServiceUnavailable:
+        if probe:
+            cache.delete(PROBE_KEY)
+        raise
+    start = time.monotonic()
+    failed = False
+    try:
+        yield
+    except Exception as exc:
+        failed = is_failure(exc)
+        raise
+    finally:
+        cache.delete(slot)
+        latency = time.monotonic() - start
+        _record(failed or latency > settings.AI_CIRCUIT_SLOW_CALL, probe)
+        _adjust_limit(failed or latency > settings.AI_LATENCY_TARGET)
@@ -0,0 +1,184 @@
+"""
+Org dashboard aggregates, served from RecordingRollup rows.
+
+Rollups are rebuilt, not incremented: bulk imports, re-runs and cancellations
+change recordings with bulk_create/update(), which no save hook would see.
+refresh_rollups() runs on beat and rebuilds
+
+- the last DASHBOARD_ROLLUP_DAYS upload days of every org, where almost all
+  status changes happen, and
+- the upload days of recordings whose pipeline job finished since the previous
+  refresh, which covers re-runs of older recordings.
+
+Anything else (e.g. a manual action on an old recording) shows up after
+`manage.py rebuild_dashboard`. Reading a dashboard costs one query over
+days × salespeople × statuses rows, however many recordings the org has.
+"""
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Min,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import CallRecording, PipelineJob, RecordingRollup
+
+REFRESHED_AT_KEY = "dashboard:refreshed_at"
+REFRESH_LOCK_KEY = "dashboard:refresh:lock"
+REFRESH_LOCK_TIMEOUT = 600
+
+_BATCH_SIZE = 1000
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def rebuild(since, until, org_ids=None) -> int:
+    """
+    Recompute rollups for upload days [since, until] (UTC dates), for `org_ids`
+    or every org. Returns the number of rollup rows written.
+    """
+    recordings = CallRecording.objects.filter(
+        created_at__gte=_day_start(since), created_at__lt=_day_start(until + timedelta(days=1))
+    )
+    rollups = RecordingRollup.objects.filter(date__gte=since, date__lte=until)
+    if org_ids is not None:
+        recordings = recordings.filter(org_id__in=org_ids)
+        rollups = rollups.filter(org_id__in=org_ids)
+
+    rows = (
+        recordings
+        .order_by()
+        .annotate(
+            day=TruncDate("created_at", tzinfo=dt_timezone.utc),
+            failed_stage=Case(
+                When(status=CallRecording.Status.FAILED, then=Coalesce("error_stage", Value(""))),
+                default=Value(""),
+                output_field=CharField(),
+            ),
+        )
+        .values("org_id", "day", "salesperson_email", "status", "failed_stage")
+        .annotate(
+            n=Count("id"),
+            completed=Count("completed_at"),
+            turnaround=Sum(
+                ExpressionWrapper(F("completed_at") - F("created_at"), output_field=DurationField())
+            ),
+        )
+    )
+    objs = [
+        RecordingRollup(
+            org_id=row["org_id"],
+            date=row["day"],
+            salesperson_email=row["salesperson_email"],
+            status=row["status"],
+            error_stage=row["failed_stage"],
+            recordings=row["n"],
+            completed=row["completed"],
+            turnaround_seconds=row["turnaround"].total_seconds() if row["turnaround"] else 0,
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        rollups.delete()
+        RecordingRollup.objects.bulk_create(objs, batch_size=_BATCH_SIZE)
+    return len(objs)
+
+
+def rebuild_all(org_ids=None) -> int:
+    """Rebuild every day that has recordings, for `org_ids` or every org."""
+    recordings = CallRecording.objects.all()
+    if org_ids is not None:
+        recordings = recordings.filter(org_id__in=org_ids)
+    first = recordings.aggregate(first=Min("created_at"))["first"]
+    if first is None:
+        RecordingRollup.objects.filter(**({} if org_ids is None else {"org_id__in": org_ids})).delete()
+        return 0
+    first_day = first.astimezone(dt_timezone.utc).date()
+    return rebuild(first_day, timezone.now().astimezone(dt_timezone.utc).date(), org_ids)
+
+
+def refresh_rollups() -> int:
+    """Beat: rebuild recent days, and older days touched by finished pipeline runs."""
+    if not cache.add(REFRESH_LOCK_KEY, 1, REFRESH_LOCK_TIMEOUT):
+        return 0
+    try:
+        now = timezone.now()
+        today = now.astimezone(dt_timezone.utc).date()
+        recent = today - timedelta(days=settings.DASHBOARD_ROLLUP_DAYS - 1)
+        written = rebuild(recent, today)
+
+        previous = cache.get(REFRESHED_AT_KEY)
+        if previous is not None:
+            touched = (
+                PipelineJob.objects
+                .filter(finished_at__gte=previous, recording__created_at__lt=_day_start(recent))
+                .order_by()
+                .annotate(day=TruncDate("recording__created_at", tzinfo=dt_timezone.utc))
+                .values_list("org_id", "day")
+                .distinct()
+            )
+            by_org = {}
+            for org_id, day in touched:
+                by_org.setdefault(org_id, []).append(day)
+            for org_id, days in by_org.items():
+                written += rebuild(min(days), max(days), [org_id])
+
+        cache.set(REFRESHED_AT_KEY, now, None)
+        return written
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+
+
+def org_dashboard(org_id: int, since, until) -> dict:
+    """Dashboard figures for recordings the org uploaded on days [since, until]."""
+    rows = RecordingRollup.objects.filter(org_id=org_id, date__gte=since, date__lte=until).values_list(
+        "date", "salesperson_email", "status", "error_stage", "recordings", "completed", "turnaround_seconds"
+    )
+    total = completed = 0
+    turnaround = 0.0
+    by_status, failures, daily, salespeople = {}, {}, {}, {}
+    for day, email, status, error_stage, n, done, seconds in rows:
+        total += n
+        completed += done
+        turnaround += seconds
+        by_status[status] = by_status.get(status, 0) + n
+        day_row = daily.setdefault(day, {"date": day, "recordings": 0, "done": 0, "failed": 0})
+        person = salespeople.setdefault(
+            email, {"salesperson_email": email, "recordings": 0, "done": 0, "failed": 0}
+        )
+        for bucket in (day_row, person):
+            bucket["recordings"] += n
+            if status == CallRecording.Status.DONE:
+                bucket["done"] += n
+            elif status == CallRecording.Status.FAILED:
+                bucket["failed"] += n
+        if status == CallRecording.Status.FAILED:
+            failures[error_stage] = failures.get(error_stage, 0) + n
+
+    failed = by_status.get(CallRecording.Status.FAILED, 0)
+    return {
+        "recordings": total,
+        "by_status": by_status,
+        "failure_rate": round(failed / total, 4) if total else 0.0,
+        "failures_by_stage": failures,
+        "avg_turnaround_seconds": round(turnaround / completed, 1) if completed else None,
+        "daily": [daily[day] for day in sorted(daily)],
+        "salespeople": sorted(salespeople.values(), key=lambda p: (-p["recordings"], p["salesperson_email"])),
+        "refreshed_at": cache.get(REFRESHED_AT_KEY),
+    }
@@ -0,0 +1,85 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from services.accounts.models import DeliveryMode, User
+
+from .models import CallRecording, NotificationDelivery, NotificationDigest
+
+# A per-recording digest goes out once the pipeline has finished. Recordings driven
+# step by step through the view actions may never reach DONE, so don't hold forever.
+RECORDING_DIGEST_MAX_WAIT = timedelta(hours=1)
+
+
+def resolve_delivery_mode(recording) -> str:
+    """
+    The recipient's own setting wins; otherwise fall back to the org's.
+    """
+    user_mode = (
+        User.objects
+        .filter(email=recording.salesperson_email.lower().strip())
+        .values_list("delivery_mode", flat=True)
+        .first()
+    )
+    return user_mode or recording.org.delivery_mode
+
+
+def _held(mode):
+    return (
+        NotificationDelivery.objects
+        .select_for_update(skip_locked=True, of=("self",))
+        .filter(
+            status=NotificationDelivery.Status.HELD,
+            mode=mode,
+            digest__isnull=True,
+        )
+        .order_by("id")
+    )
+
+
+def _coalesce(deliveries, mode, key) -> list:
+    groups = defaultdict(list)
+    for delivery in deliveries:
+        groups[key(delivery)].append(delivery.id)
+
+    digests = []
+    for (recording_id, email), ids in groups.items():
+        digest = NotificationDigest.objects.create(
+            mode=mode,
+            salesperson_email=email,
+            recording_id=recording_id,
+        )
+        NotificationDelivery.objects.filter(id__in=ids).update(digest=digest)
+        digests.append(digest)
+    return digests
+
+
+def collect_recording_digests(now=None) -> list:
+    """
+    Attach held per-recording deliveries to one digest per (recording, recipient).
+    Must run inside a transaction — the held rows are locked while grouping.
+    """
+    now = now or timezone.now()
+    held = _held(DeliveryMode.RECORDING_DIGEST).filter(
+        Q(recording__status__in=[CallRecording.Status.DONE, CallRecording.Status.FAILED])
+        | Q(created_at__lt=now - RECORDING_DIGEST_MAX_WAIT)
+    )
+    return _coalesce(
+        held,
+        DeliveryMode.RECORDING_DIGEST,
+        key=lambda d: (d.recording_id, d.salesperson_email),
+    )
+
+
+def collect_daily_digests() -> list:
+    """
+    Attach every held daily-mode delivery to one digest per recipient.
+    Must run inside a transaction.
+    """
+    return _coalesce(
+        _held(DeliveryMode.DAILY_DIGEST),
+        DeliveryMode.DAILY_DIGEST,
+        key=lambda d: (None, d.salesperson_email),
+    )
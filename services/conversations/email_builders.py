@@ -1,29 +1,149 @@
-import json
+import re
+from functools import lru_cache
+from typing import NamedTuple
 
-from .models import CallRecording
+from django.template.loader import get_template
 
+from .models import CallRecording, NotificationDelivery, NotificationDigest
 
-def build_analysis_email(recording: CallRecording) -> tuple[str, str]:
-    subject = f"Call Analysis Ready — {recording.deal_title or f'Recording #{recording.id}'}"
-    body = (recording.analysis_json or {}).get("analysis_text", "")
-    if not body:
-        raise ValueError(
-            f"analysis_text is empty or missing for recording {recording.id}"
-        )
-    return subject, body
 
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: str
 
-def build_feedback_email(recording: CallRecording) -> tuple[str, str]:
-    if not recording.feedback_json:
-        raise ValueError(f"feedback_json is empty or missing for recording {recording.id}")
+
+@lru_cache(maxsize=None)
+def _template(name: str):
+    # Compiled once per process, regardless of DEBUG / loader configuration.
+    return get_template(f"conversations/email/{name}")
+
+
+def _render(name: str, subject: str, context: dict) -> RenderedEmail:
+    context = {"subject": subject, **context}
+    text = _template(f"{name}.txt").render(context)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    html = _template(f"{name}.html").render(context)
+    return RenderedEmail(subject, text, html)
+
+
+def _humanize(key) -> str:
+    return str(key).replace("_", " ").strip().capitalize()
+
+
+def _inline(value) -> str:
+    if isinstance(value, dict):
+        return "; ".join(f"{_humanize(k)}: {_inline(v)}" for k, v in value.items())
+    if isinstance(value, list):
+        return ", ".join(_inline(v) for v in value)
+    return str(value)
+
+
+def _sections(data) -> list:
+    """
+    Turns an AI stage output into titled sections for the email templates:
+    lists and nested objects become bullet items, scalars become a paragraph.
+    """
+    if not isinstance(data, dict):
+        return [{"title": "", "text": str(data)}]
+
+    sections = []
+    for key, value in data.items():
+        if value in (None, "", [], {}):
+            continue
+        if isinstance(value, list):
+            sections.append({"title": _humanize(key), "bullets": [_inline(v) for v in value]})
+        elif isinstance(value, dict):
+            sections.append({
+                "title": _humanize(key),
+                "bullets": [f"{_humanize(k)}: {_inline(v)}" for k, v in value.items()],
+            })
+        else:
+            sections.append({"title": _humanize(key), "text": str(value)})
+    return sections
+
+
+def _title(recording: CallRecording) -> str:
+    return recording.deal_title or f"Recording #{recording.id}"
+
+
+def stage_context(recording: CallRecording, kind: str) -> dict:
+    """
+    Template context for one pipeline stage. Raises ValueError when the stage
+    output is missing — retrying won't fix that.
+    """
+    if kind == NotificationDelivery.Kind.ANALYSIS:
+        text = (recording.analysis_json or {}).get("analysis_text", "")
+        if not text:
+            raise ValueError(
+                f"analysis_text is empty or missing for recording {recording.id}"
+            )
+        return {"heading": "Call Analysis", "text": text, "sections": []}
+
+    if kind == NotificationDelivery.Kind.FEEDBACK:
+        if not recording.feedback_json:
+            raise ValueError(f"feedback_json is empty or missing for recording {recording.id}")
+        return {"heading": "Feedback", "text": "", "sections": _sections(recording.feedback_json)}
+
+    if kind == NotificationDelivery.Kind.FOLLOWUP:
+        if not recording.followup_json:
+            raise ValueError(f"followup_json is empty or missing for recording {recording.id}")
+        return {"heading": "Follow-up", "text": "", "sections": _sections(recording.followup_json)}
+
+    raise ValueError(f"Unknown delivery kind: {kind}")
+
+
+def build_analysis_email(recording: CallRecording) -> RenderedEmail:
+    stage = stage_context(recording, NotificationDelivery.Kind.ANALYSIS)
+    subject = f"Call Analysis Ready — {_title(recording)}"
+    return _render("stage", subject, {"recording": recording, "stage": stage})
+
+
+def build_feedback_email(recording: CallRecording) -> RenderedEmail:
+    stage = stage_context(recording, NotificationDelivery.Kind.FEEDBACK)
     subject = f"{recording.deal_title} — Feedback"
-    body = json.dumps(recording.feedback_json, ensure_ascii=False)
-    return subject, body
+    return _render("stage", subject, {"recording": recording, "stage": stage})
 
 
-def build_followup_email(recording: CallRecording) -> tuple[str, str]:
-    if not recording.followup_json:
-        raise ValueError(f"followup_json is empty or missing for recording {recording.id}")
+def build_followup_email(recording: CallRecording) -> RenderedEmail:
+    stage = stage_context(recording, NotificationDelivery.Kind.FOLLOWUP)
     subject = f"{recording.deal_title} — Follow-up"
-    body = json.dumps(recording.followup_json, ensure_ascii=False)
-    return subject, body
+    return _render("stage", subject, {"recording": recording, "stage": stage})
+
+
+_BUILDERS = {
+    NotificationDelivery.Kind.ANALYSIS: build_analysis_email,
+    NotificationDelivery.Kind.FEEDBACK: build_feedback_email,
+    NotificationDelivery.Kind.FOLLOWUP: build_followup_email,
+}
+
+
+def build_stage_email(recording: CallRecording, kind: str) -> RenderedEmail:
+    builder = _BUILDERS.get(kind)
+    if builder is None:
+        raise ValueError(f"Unknown delivery kind: {kind}")
+    return builder(recording)
+
+
+def build_digest_email(digest: NotificationDigest, sections: list) -> RenderedEmail:
+    """
+    `sections` is a list of (delivery, stage_context) pairs ordered by recording.
+    """
+    if not sections:
+        raise ValueError(f"digest {digest.id} has nothing to send")
+
+    recordings = []
+    for delivery, stage in sections:
+        if not recordings or recordings[-1]["id"] != delivery.recording_id:
+            recordings.append({
+                "id": delivery.recording_id,
+                "title": _title(delivery.recording),
+                "stages": [],
+            })
+        recordings[-1]["stages"].append(stage)
+
+    if digest.recording_id:
+        subject = f"Call Insights Ready — {recordings[0]['title']}"
+    else:
+        subject = f"Your daily call digest — {len(recordings)} recording(s)"
+    return _render("digest", subject, {"recordings": recordings})
@@ -0,0 +1,255 @@
+"""
+Bulk export of recordings for analytics: CSV, or Parquet when pyarrow is
+installed.
+
+One row per recording: its own fields, the RecordingInsights columns, the
+stage outputs as JSON text, and counts of notifications sent and failed.
+Transcripts are left out (see the transcript download endpoint). Rows are read
+with a server-side cursor, EXPORT_CHUNK_SIZE at a time. Each chunk is encoded
+and handed on before the next is read: one Parquet row group, or one block of
+CSV lines. Memory stays flat however many recordings are exported.
+
+The same stream backs `manage.py export_recordings` (to a file or s3://) and
+GET /api/recordings/export/. An org runs one export at a time.
+"""
+
+import csv
+import io
+import json
+import tempfile
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import CallRecording, NotificationDelivery
+
+FORMATS = ("csv", "parquet")
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+LOCK_KEY = "export:org:{}"
+LOCK_TIMEOUT = 60 * 60
+
+# column -> (queryset lookup, type)
+_COLUMNS = {
+    "id": ("id", "int"),
+    "org_id": ("org_id", "int"),
+    "created_at": ("created_at", "timestamp"),
+    "completed_at": ("completed_at", "timestamp"),
+    "status": ("status", "string"),
+    "language": ("language", "string"),
+    "deal_title": ("deal_title", "string"),
+    "salesperson_email": ("salesperson_email", "string"),
+    "error_stage": ("error_stage", "string"),
+    "commitment": ("insights__commitment", "string"),
+    "outcome_likelihood": ("insights__outcome_likelihood", "float"),
+    "buying_signal_score": ("insights__buying_signal_score", "float"),
+    "buying_signals": ("insights__buying_signals", "int"),
+    "spin_categories": ("insights__spin_categories", "int"),
+    "feedback_score": ("insights__feedback_score", "float"),
+    "spin_situation_score": ("insights__spin_situation_score", "float"),
+    "spin_problem_score": ("insights__spin_problem_score", "float"),
+    "spin_implication_score": ("insights__spin_implication_score", "float"),
+    "spin_need_payoff_score": ("insights__spin_need_payoff_score", "float"),
+    "notifications_sent": ("notifications_sent", "int"),
+    "notifications_failed": ("notifications_failed", "int"),
+    "analysis_json": ("analysis_json", "json"),
+    "feedback_json": ("feedback_json", "json"),
+    "followup_json": ("followup_json", "json"),
+}
+_JSON_COLUMNS = [i for i, (_, kind) in enumerate(_COLUMNS.values()) if kind == "json"]
+
+
+class ExportError(Exception):
+    pass
+
+
+class ExportBusy(ExportError):
+    pass
+
+
+def _notification_count(status: str):
+    counts = (
+        NotificationDelivery.objects
+        .filter(recording=OuterRef("pk"), status=status)
+        .order_by()
+        .values("recording")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def export_rows(queryset, chunk_size: int):
+    """Yield lists of at most `chunk_size` rows (lists, in _COLUMNS order)."""
+    rows = (
+        queryset
+        .annotate(
+            notifications_sent=_notification_count(NotificationDelivery.Status.SENT),
+            notifications_failed=_notification_count(NotificationDelivery.Status.FAILED),
+        )
+        .order_by("id")
+        .values_list(*(lookup for lookup, _ in _COLUMNS.values()))
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for row in rows:
+        row = list(row)
+        for i in _JSON_COLUMNS:
+            if row[i] is not None:
+                row[i] = json.dumps(row[i], ensure_ascii=False)
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(chunks):
+    """CSV text, one block per chunk, header first."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_COLUMNS)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+            for row in chunk
+        )
+        yield buffer.getvalue()
+
+
+class _Sink(io.RawIOBase):
+    """Write-only stream whose contents are handed on and dropped as they come."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema(pa):
+    types = {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "string": pa.string(),
+        "json": pa.string(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, (_, kind) in _COLUMNS.items()])
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet exports need pyarrow installed.")
+    return pa, pq
+
+
+def iter_parquet(chunks):
+    """Parquet bytes, one row group per chunk."""
+    pa, pq = _pyarrow()
+    schema = _arrow_schema(pa)
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for chunk in chunks:
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream(queryset, fmt: str, chunk_size: int = None):
+    """Encoded export of `queryset` as an iterator of str (CSV) or bytes (Parquet)."""
+    if fmt not in FORMATS:
+        raise ExportError(f"Choose a format from {list(FORMATS)}.")
+    if fmt == "parquet":
+        _pyarrow()  # fail before anything is sent, not mid-stream
+    chunks = export_rows(queryset, chunk_size or settings.EXPORT_CHUNK_SIZE)
+    return iter_csv(chunks) if fmt == "csv" else iter_parquet(chunks)
+
+
+class OrgExport:
+    """
+    stream() for one org, holding the org's export lock until the stream is
+    exhausted or closed (Django closes streaming responses when done).
+    """
+
+    def __init__(self, org_id: int, fmt: str, queryset=None):
+        queryset = queryset if queryset is not None else CallRecording.objects.all()
+        self._chunks = stream(queryset.filter(org_id=org_id), fmt)
+        self._key = LOCK_KEY.format(org_id)
+        if not cache.add(self._key, 1, LOCK_TIMEOUT):
+            self._key = None
+            raise ExportBusy("An export for this organization is already running.")
+
+    def __iter__(self):
+        try:
+            yield from self._chunks
+        finally:
+            self.close()
+
+    def close(self):
+        if self._key is not None:
+            cache.delete(self._key)
+            self._key = None
+            self._chunks.close()
+
+
+def write(chunks, destination: str) -> str:
+    """Write an export stream to a local path or an s3://bucket/key URL."""
+    if not destination.startswith("s3://"):
+        with open(destination, "wb") as f:
+            _copy(chunks, f)
+        return destination
+
+    url = urlparse(destination)
+    if not url.netloc or not url.path.strip("/"):
+        raise ExportError(f"Expected s3://bucket/key, got {destination}.")
+    import boto3
+
+    client = boto3.client("s3", region_name=getattr(settings, "AWS_S3_REGION_NAME", None))
+    # Spooled to disk, then sent as a multipart upload: memory stays bounded.
+    with tempfile.TemporaryFile() as f:
+        _copy(chunks, f)
+        f.seek(0)
+        client.upload_fileobj(f, url.netloc, url.path.lstrip("/"))
+    return destination
+
+
+def _copy(chunks, f):
+    for chunk in chunks:
+        f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+
+def default_name(org_id, fmt: str, now) -> str:
+    return f"recordings-{org_id if org_id is not None else 'all'}-{now:%Y%m%d-%H%M%S}.{fmt}"
+
@@ -0,0 +1,76 @@
+"""
+Query-string filters and ordering for GET /api/recordings/.
+
+Only what an index on CallRecording covers is accepted (see Meta.indexes);
+every index leads with org, which get_queryset always filters on:
+
+    status, language, salesperson_email, error_stage   (org, <field>, -created_at)
+    created_after, created_before                      (org, -created_at)
+    ordering=[-]created_at                             (org, -created_at)
+    ordering=[-]deal_title                             (org, deal_title)
+
+Ordering by deal title is served by its own index, so it can't be combined
+with filters; that combination is rejected rather than run as a scan and sort.
+"""
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import CallRecording
+
+DEFAULT_ORDERING = "-created_at"
+ORDERINGS = ("created_at", "-created_at", "deal_title", "-deal_title")
+
+# param -> allowed values (None: any non-empty value). Comma-separated values
+# are OR-ed.
+_CHOICE_FILTERS = {
+    "status": set(CallRecording.Status.values),
+    "language": set(CallRecording.Language.values),
+    "error_stage": None,
+    "salesperson_email": None,
+}
+
+
+def parse_datetime_value(raw, name):
+    """ISO 8601 `raw` as an aware datetime, None if empty; ValidationError if invalid."""
+    if not raw:
+        return None
+    value = parse_datetime(raw)
+    if value is None:
+        raise ValidationError({name: "Expected an ISO 8601 datetime."})
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def filter_recordings(queryset, params):
+    """Apply the filters and ordering in `params`; ValidationError if unsupported."""
+    filters = {}
+    for name, allowed in _CHOICE_FILTERS.items():
+        raw = params.get(name)
+        if raw is None:
+            continue
+        values = [value.strip() for value in raw.split(",") if value.strip()]
+        if not values:
+            raise ValidationError({name: "Expected a value."})
+        if allowed is not None and not set(values) <= allowed:
+            raise ValidationError({name: f"Choose from {sorted(allowed)}."})
+        filters[f"{name}__in"] = values
+
+    created_after = parse_datetime_value(params.get("created_after"), "created_after")
+    created_before = parse_datetime_value(params.get("created_before"), "created_before")
+    if created_after:
+        filters["created_at__gte"] = created_after
+    if created_before:
+        filters["created_at__lt"] = created_before
+    if created_after and created_before and created_after >= created_before:
+        raise ValidationError({"created_after": "Must be earlier than 'created_before'."})
+
+    ordering = params.get("ordering") or DEFAULT_ORDERING
+    if ordering not in ORDERINGS:
+        raise ValidationError({"ordering": f"Choose from {list(ORDERINGS)}."})
+    if ordering.lstrip("-") == "deal_title" and filters:
+        raise ValidationError({"ordering": "Ordering by deal_title can't be combined with filters."})
+
+    return queryset.filter(**filters).order_by(ordering)
@@ -0,0 +1,160 @@
+"""
+Extraction of analysis and feedback fields into RecordingInsights.
+
+_FIELDS maps each column to where it lives in analysis_json / feedback_json
+(dotted paths; the first one present wins) and how to read it. Values of the
+wrong type or out of range are stored as empty rather than failing the stage:
+the AI output is free-form JSON, and one odd field shouldn't hide the rest.
+
+The pipeline re-extracts whenever it writes analysis or feedback, and so do
+the analyze / feedback actions. `manage.py backfill_insights` covers
+recordings analyzed before this existed, or after a column is added here.
+"""
+
+import math
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import RecordingInsights
+
+_SPIN = ("situation", "problem", "implication", "need_payoff")
+_SMALLINT_MAX = 32767
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            return None
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+def _likelihood(value):
+    """A probability; percentages (1 < x <= 100) are scaled down."""
+    number = _number(value)
+    if number is None or number < 0 or number > 100:
+        return None
+    return number / 100 if number > 1 else number
+
+
+def _count(value):
+    if isinstance(value, (list, dict)):
+        return min(len(value), _SMALLINT_MAX)
+    number = _number(value)
+    if number is None or number < 0:
+        return None
+    return min(int(number), _SMALLINT_MAX)
+
+
+def _commitment(value):
+    if not isinstance(value, str):
+        return ""
+    normalized = value.strip().lower().replace("-", "_").replace(" ", "_")
+    return normalized if normalized in RecordingInsights.Commitment.values else ""
+
+
+def _spin_categories(value):
+    if not isinstance(value, dict):
+        return None
+    keys = {key.strip().lower().replace("-", "_").replace(" ", "_") for key, found in value.items() if found}
+    return len(keys & set(_SPIN))
+
+
+# column -> (source field, paths, parse)
+_FIELDS = {
+    "commitment": ("analysis_json", ("commitment", "commitment_level"), _commitment),
+    "outcome_likelihood": ("analysis_json", ("outcome_likelihood",), _likelihood),
+    "buying_signal_score": ("analysis_json", ("buying_signal_score",), _number),
+    "buying_signals": ("analysis_json", ("buying_signals",), _count),
+    "spin_categories": ("analysis_json", ("spin",), _spin_categories),
+    "feedback_score": ("feedback_json", ("score",), _number),
+    **{
+        f"spin_{category}_score": ("feedback_json", (f"spin_scores.{category}",), _number)
+        for category in _SPIN
+    },
+}
+
+_COLUMNS = ["recording_id", "org_id", "recording_created_at", "salesperson_email", *_FIELDS, "updated_at"]
+_MODEL_FIELDS = [RecordingInsights._meta.get_field(column) for column in _COLUMNS]
+
+
+def _lookup(blob, path: str):
+    for key in path.split("."):
+        if not isinstance(blob, dict) or key not in blob:
+            return None
+        blob = blob[key]
+    return blob
+
+
+def extract(recording) -> dict:
+    """Column values for `recording`'s current analysis and feedback."""
+    values = {}
+    for column, (source, paths, parse) in _FIELDS.items():
+        blob = getattr(recording, source)
+        raw = next((value for value in (_lookup(blob, path) for path in paths) if value is not None), None)
+        values[column] = parse(raw)
+    return values
+
+
+def _row(recording, now) -> list:
+    values = {
+        "recording_id": recording.id,
+        "org_id": recording.org_id,
+        "recording_created_at": recording.created_at,
+        "salesperson_email": recording.salesperson_email or "",
+        **extract(recording),
+        "updated_at": now,
+    }
+    return [
+        field.get_db_prep_save(values[column], connection)
+        for column, field in zip(_COLUMNS, _MODEL_FIELDS)
+    ]
+
+
+def _upsert(rows: list):
+    # INSERT ... ON CONFLICT is supported by both Postgres and SQLite (3.24+);
+    # Django 3.2's bulk_create can't update on conflict.
+    quote = connection.ops.quote_name
+    table = quote(RecordingInsights._meta.db_table)
+    columns = ", ".join(quote(column) for column in _COLUMNS)
+    placeholders = ", ".join(["%s"] * len(_COLUMNS))
+    updates = ", ".join(f"{quote(column)} = excluded.{quote(column)}" for column in _COLUMNS[1:])
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({quote('recording_id')}) DO UPDATE SET {updates}"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def save_insights(recording):
+    """Create or refresh `recording`'s insights row (one query)."""
+    _upsert([_row(recording, timezone.now())])
+
+
+def backfill(queryset, batch_size: int = 500) -> int:
+    """Extract insights for every recording in `queryset` with analysis or feedback."""
+    recordings = (
+        queryset
+        .exclude(analysis_json__isnull=True, feedback_json__isnull=True)
+        .only("id", "org_id", "created_at", "salesperson_email", "analysis_json", "feedback_json")
+        .order_by("id")
+    )
+    now = timezone.now()
+    batch, total = [], 0
+    for recording in recordings.iterator(chunk_size=batch_size):
+        batch.append(_row(recording, now))
+        if len(batch) >= batch_size:
+            _upsert(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        _upsert(batch)
+        total += len(batch)
+    return total
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from services.conversations import insights
+from services.conversations.models import CallRecording
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract typed insight columns from the analysis and feedback of existing "
+        "recordings. Safe to re-run; rows are refreshed in place."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, action="append", help="Organization id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        recordings = CallRecording.objects.all()
+        if options["org"]:
+            recordings = recordings.filter(org_id__in=options["org"])
+        total = insights.backfill(recordings, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Extracted insights for {total} recording(s)."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from services.conversations import export
+from services.conversations.models import CallRecording
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError(f"Not an ISO 8601 datetime: {value}")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Export recordings, their insights, stage outputs and notification counts "
+        "to CSV or Parquet, streamed in chunks to a file or s3://bucket/key."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=export.FORMATS, default="parquet")
+        parser.add_argument(
+            "--output",
+            help="File path or s3://bucket/key. Default: recordings-<org>-<time>.<format> here.",
+        )
+        parser.add_argument("--org", type=int, action="append", help="Organization id (repeatable).")
+        parser.add_argument("--since", type=_datetime, help="Recordings created at or after.")
+        parser.add_argument("--until", type=_datetime, help="Recordings created before.")
+        parser.add_argument("--chunk-size", type=int, help="Rows per chunk (default EXPORT_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        recordings = CallRecording.objects.all()
+        if options["org"]:
+            recordings = recordings.filter(org_id__in=options["org"])
+        if options["since"]:
+            recordings = recordings.filter(created_at__gte=options["since"])
+        if options["until"]:
+            recordings = recordings.filter(created_at__lt=options["until"])
+
+        org = options["org"][0] if options["org"] and len(options["org"]) == 1 else None
+        output = options["output"] or export.default_name(org, options["format"], timezone.now())
+        try:
+            chunks = export.stream(recordings, options["format"], options["chunk_size"])
+            export.write(chunks, output)
+        except export.ExportError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Exported to {output}."))
@@ -0,0 +1,101 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.accounts.models import Organization, User
+from services.conversations import bulk
+from services.conversations.models import BulkJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Import historical recordings from a directory, a CSV/JSONL manifest or an S3 "
+        "prefix as one rate-limited bulk job. Workers process it unless --wait is given."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--dir", help="Directory of audio files (copied into storage).")
+        source.add_argument(
+            "--manifest",
+            help="CSV/JSONL with audio, deal_title, salesperson_email, client_email, language. "
+            "audio is a path relative to the manifest, or an existing storage key.",
+        )
+        source.add_argument("--s3-prefix", help="Import objects under this prefix of the storage bucket.")
+        source.add_argument("--resume", type=int, metavar="JOB_ID", help="Continue an existing job.")
+        parser.add_argument("--org", type=int, help="Organization id (required for new imports).")
+        parser.add_argument("--user", help="Email of the user recorded as uploader.")
+        parser.add_argument("--language", choices=["auto", "he", "en"], help="Default language.")
+        parser.add_argument("--salesperson-email", help="Default salesperson email.")
+        parser.add_argument(
+            "--wait", action="store_true",
+            help="Advance the job from this process, printing progress, until it completes.",
+        )
+        parser.add_argument("--interval", type=float, default=10, help="Seconds between batches with --wait.")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            job = BulkJob.objects.filter(id=options["resume"], kind=BulkJob.Kind.IMPORT).first()
+            if job is None:
+                raise CommandError(f"No import job {options['resume']}.")
+        else:
+            job = self._create(options)
+            self.stdout.write(f"Created import job {job.id} with {job.total} recording(s).")
+
+        if not options["wait"]:
+            return
+        while bulk.advance(job.id):
+            job.refresh_from_db()
+            self.stdout.write(
+                f"job {job.id}: {job.processed}/{job.total} submitted, {job.failed} failed"
+            )
+            time.sleep(options["interval"])
+        job.refresh_from_db()
+        self.stdout.write(self.style.SUCCESS(
+            f"Job {job.id} {job.state}: {job.processed} submitted, {job.failed} failed."
+        ))
+
+    def _create(self, options):
+        if not options["org"]:
+            raise CommandError("--org is required.")
+        try:
+            org = Organization.objects.get(id=options["org"])
+        except Organization.DoesNotExist:
+            raise CommandError(f"No organization {options['org']}.")
+        user = None
+        if options["user"]:
+            user = User.objects.filter(email=options["user"].lower(), org=org).first()
+            if user is None:
+                raise CommandError(f"No user {options['user']} in {org}.")
+
+        defaults = {
+            key: options[option]
+            for key, option in (("language", "language"), ("salesperson_email", "salesperson_email"))
+            if options[option]
+        }
+        try:
+            if options["dir"]:
+                source = options["dir"]
+                items = bulk.scan_directory(source, defaults)
+            elif options["manifest"]:
+                source = options["manifest"]
+                items = self._manifest_items(source, defaults)
+            else:
+                source = f"s3://{options['s3_prefix']}"
+                items = bulk.list_s3_prefix(options["s3_prefix"], defaults)
+            return bulk.create_import_job(org, items, created_by=user, source=source)
+        except (bulk.BulkJobError, OSError) as exc:
+            raise CommandError(str(exc))
+
+    @staticmethod
+    def _manifest_items(path, defaults):
+        with open(path, "rb") as f:
+            items = bulk.read_manifest(f, path, defaults)
+        base = os.path.dirname(os.path.abspath(path))
+        # Relative paths are relative to the manifest; storage keys pass through.
+        return [
+            item._replace(audio=os.path.join(base, item.audio))
+            if os.path.isfile(os.path.join(base, item.audio)) else item
+            for item in items
+        ]
@@ -0,0 +1,42 @@
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from services.conversations import dashboard
+
+
+def _date(value):
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise CommandError(f"Not an ISO 8601 date: {value}")
+    return parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute org dashboard rollups from recordings. Without --since, every "
+        "day since the first recording is rebuilt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, action="append", help="Organization id (repeatable).")
+        parser.add_argument("--since", type=_date, help="First upload day (UTC) to rebuild.")
+        parser.add_argument("--until", type=_date, help="Last upload day (UTC) to rebuild; default today.")
+
+    def handle(self, *args, **options):
+        org_ids = options["org"]
+        if options["since"] is None:
+            if options["until"] is not None:
+                raise CommandError("--until needs --since.")
+            written = dashboard.rebuild_all(org_ids)
+        else:
+            until = options["until"] or timezone.now().astimezone(dt_timezone.utc).date()
+            if options["since"] > until:
+                raise CommandError("--since must not be after --until.")
+            written = dashboard.rebuild(options["since"], until, org_ids)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} rollup row(s)."))
@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from services.accounts.models import Organization
+from services.conversations import bulk
+from services.conversations.models import BulkJob
+from services.conversations.scheduler import RERUN_CLEARS
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError(f"Not an ISO 8601 datetime: {value}")
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Clear and regenerate pipeline stage outputs for many recordings, one bulk "
+        "job per organization, queued in throttled batches in the bulk lane."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--org", type=int, action="append", help="Organization id (repeatable).")
+        target.add_argument("--all-orgs", action="store_true")
+        target.add_argument("--cancel", type=int, metavar="JOB_ID", help="Cancel a re-run job.")
+        parser.add_argument(
+            "--stages", nargs="+", choices=sorted(RERUN_CLEARS), default=sorted(RERUN_CLEARS),
+        )
+        parser.add_argument("--since", type=_datetime, help="Recordings created at or after.")
+        parser.add_argument("--until", type=_datetime, help="Recordings created before.")
+        parser.add_argument("--status", nargs="+", default=[], help="Only recordings in these statuses.")
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Clear nothing; regenerate only outputs stale for the current AI service version.",
+        )
+        parser.add_argument(
+            "--wait", action="store_true",
+            help="Advance the jobs from this process, printing progress, until all are queued.",
+        )
+        parser.add_argument("--interval", type=float, default=10, help="Seconds between batches with --wait.")
+
+    def handle(self, *args, **options):
+        if options["cancel"]:
+            job = BulkJob.objects.filter(id=options["cancel"], kind=BulkJob.Kind.RERUN).first()
+            if job is None:
+                raise CommandError(f"No re-run job {options['cancel']}.")
+            job = bulk.cancel_job(job)
+            self.stdout.write(f"Job {job.id} {job.state}.")
+            return
+
+        orgs = Organization.objects.all()
+        if options["org"]:
+            orgs = orgs.filter(id__in=options["org"])
+        jobs = []
+        for org in orgs:
+            try:
+                job = bulk.create_rerun_job(
+                    org,
+                    options["stages"],
+                    since=options["since"],
+                    until=options["until"],
+                    statuses=options["status"],
+                    incremental=options["incremental"],
+                )
+            except bulk.BulkJobError as exc:
+                self.stdout.write(f"{org}: {exc}")
+                continue
+            jobs.append(job)
+            self.stdout.write(f"{org}: re-run job {job.id} for {job.total} recording(s).")
+
+        if not options["wait"]:
+            return
+        active = [job.id for job in jobs]
+        while active:
+            active = [job_id for job_id in active if bulk.advance(job_id)]
+            for job in BulkJob.objects.filter(id__in=[job.id for job in jobs]):
+                self.stdout.write(f"job {job.id}: {job.processed}/{job.total} queued, {job.failed} skipped")
+            if active:
+                time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("All re-runs queued."))
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.25 on 2026-10-19 18:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0013_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDigest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('immediate', 'Immediately, one email per stage'), ('recording_digest', 'One email per recording'), ('daily_digest', 'One email per day')], max_length=32)),
+                ('salesperson_email', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('retrying', 'Retrying')], default='pending', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('subject', models.CharField(blank=True, default='', max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='notificationdelivery',
+            name='mode',
+            field=models.CharField(choices=[('immediate', 'Immediately, one email per stage'), ('recording_digest', 'One email per recording'), ('daily_digest', 'One email per day')], default='immediate', max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='notificationdelivery',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('retrying', 'Retrying'), ('skipped', 'Skipped'), ('held', 'Held')], default='pending', max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='notificationdelivery',
+            index=models.Index(fields=['status', 'mode', 'created_at'], name='delivery_held_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationdigest',
+            name='recording',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='digests', to='conversations.callrecording'),
+        ),
+        migrations.AddField(
+            model_name='notificationdelivery',
+            name='digest',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='deliveries', to='conversations.notificationdigest'),
+        ),
+    ]
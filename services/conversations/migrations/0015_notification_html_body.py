@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0014_notificationdigest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationdelivery',
+            name='html_body',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='notificationdigest',
+            name='html_body',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_delivery_mode'),
+        ('conversations', '0015_notification_html_body'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StageEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(choices=[('transcription', 'Transcription'), ('analyze', 'Analyze'), ('feedback', 'Feedback'), ('followup', 'Followup')], max_length=16)),
+                ('attempt', models.PositiveSmallIntegerField(default=1)),
+                ('outcome', models.CharField(choices=[('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='running', max_length=16)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stage_events', to='accounts.organization')),
+                ('recording', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_events', to='conversations.callrecording')),
+            ],
+            options={
+                'ordering': ['started_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='stageevent',
+            index=models.Index(fields=['org', 'stage', 'started_at'], name='stage_event_org_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stageevent',
+            index=models.Index(fields=['recording', 'stage'], name='stage_event_recording_idx'),
+        ),
+    ]
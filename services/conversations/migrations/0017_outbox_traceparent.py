@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0016_stageevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='traceparent',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
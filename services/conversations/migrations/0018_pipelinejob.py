@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_org_pipeline_scheduling'),
+        ('conversations', '0017_outbox_traceparent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lane', models.PositiveSmallIntegerField(choices=[(0, 'Interactive'), (1, 'Normal'), (2, 'Bulk')], default=1)),
+                ('state', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('finished', 'Finished'), ('cancelled', 'Cancelled')], default='queued', max_length=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('admitted_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='pipeline_jobs', to='accounts.organization')),
+                ('recording', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_jobs', to='conversations.callrecording')),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pipelinejob',
+            index=models.Index(fields=['state', 'lane', 'org', 'id'], name='pipeline_job_queue_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='pipelinejob',
+            constraint=models.UniqueConstraint(condition=models.Q(('state__in', ['queued', 'running'])), fields=('recording',), name='pipeline_job_one_active'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0019_bulkjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipelinejob',
+            name='bulk_job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pipeline_jobs', to='conversations.bulkjob'),
+        ),
+        migrations.AlterField(
+            model_name='bulkjob',
+            name='kind',
+            field=models.CharField(choices=[('import', 'Import'), ('rerun', 'Rerun')], max_length=16),
+        ),
+    ]
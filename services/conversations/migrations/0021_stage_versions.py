@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0020_bulk_rerun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='callrecording',
+            name='stage_versions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
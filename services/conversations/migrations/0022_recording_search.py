@@ -0,0 +1,64 @@
+# Generated by Django 3.2.25 on 2026-10-19 21:05
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Postgres only; SQLite gets an FTS5 table instead (search.install_sqlite_index).
+POSTGRES_SETUP = [
+    """
+    CREATE FUNCTION conversations_callrecording_search_vector() RETURNS trigger AS $$
+    DECLARE
+        cfg regconfig := CASE WHEN NEW.language = 'en'
+                              THEN 'english'::regconfig ELSE 'simple'::regconfig END;
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector(cfg, coalesce(NEW.deal_title, '')), 'A')
+            || setweight(to_tsvector(cfg, coalesce(NEW.transcript, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER conversations_callrecording_search_vector
+        BEFORE INSERT OR UPDATE OF deal_title, transcript, language
+        ON conversations_callrecording
+        FOR EACH ROW EXECUTE PROCEDURE conversations_callrecording_search_vector()
+    """,
+    # Fires the trigger for existing rows.
+    "UPDATE conversations_callrecording SET transcript = transcript",
+    """
+    CREATE INDEX conversations_callrecording_search_idx
+        ON conversations_callrecording USING gin (search_vector)
+    """,
+]
+
+POSTGRES_TEARDOWN = [
+    "DROP INDEX IF EXISTS conversations_callrecording_search_idx",
+    "DROP TRIGGER IF EXISTS conversations_callrecording_search_vector ON conversations_callrecording",
+    "DROP FUNCTION IF EXISTS conversations_callrecording_search_vector()",
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0021_stage_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='callrecording',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(_run_on_postgres(POSTGRES_SETUP), _run_on_postgres(POSTGRES_TEARDOWN)),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-19 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0022_recording_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(fields=['org', '-created_at'], name='recording_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(fields=['org', 'status', '-created_at'], name='recording_org_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(fields=['org', 'language', '-created_at'], name='recording_org_language_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(fields=['org', 'salesperson_email', '-created_at'], name='recording_org_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(condition=models.Q(('error_stage__isnull', False)), fields=['org', 'error_stage', '-created_at'], name='recording_org_error_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(fields=['org', 'deal_title'], name='recording_org_title_idx'),
+        ),
+    ]
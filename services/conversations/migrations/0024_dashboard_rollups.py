@@ -0,0 +1,69 @@
+# Generated by Django 3.2.25 on 2026-10-19 22:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_completed_at(apps, schema_editor):
+    """Recordings already done: completed when their last stage succeeded."""
+    CallRecording = apps.get_model("conversations", "CallRecording")
+    StageEvent = apps.get_model("conversations", "StageEvent")
+    last_success = (
+        StageEvent.objects
+        .filter(recording=models.OuterRef("pk"), outcome="succeeded")
+        .order_by("-finished_at")
+        .values("finished_at")[:1]
+    )
+    CallRecording.objects.filter(status="done", completed_at=None).update(
+        completed_at=models.Subquery(last_success)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_org_pipeline_scheduling'),
+        ('conversations', '0023_recording_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('salesperson_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('status', models.CharField(choices=[('waiting_transcription', 'Waiting Transcription'), ('transcribing', 'Transcribing'), ('transcribed', 'Transcribed'), ('analyzing', 'Analyzing'), ('analyzed', 'Analyzed'), ('generating_feedback', 'Generating Feedback'), ('feedback_ready', 'Feedback Ready'), ('generating_followup', 'Generating Followup'), ('followup_ready', 'Followup Ready'), ('done', 'Done'), ('failed', 'Failed')], max_length=64)),
+                ('error_stage', models.CharField(blank=True, default='', max_length=64)),
+                ('recordings', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('turnaround_seconds', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['org', 'date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='callrecording',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='callrecording',
+            index=models.Index(fields=['created_at'], name='recording_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pipelinejob',
+            index=models.Index(fields=['finished_at'], name='pipeline_job_finished_idx'),
+        ),
+        migrations.AddField(
+            model_name='recordingrollup',
+            name='org',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recording_rollups', to='accounts.organization'),
+        ),
+        migrations.AddConstraint(
+            model_name='recordingrollup',
+            constraint=models.UniqueConstraint(fields=('org', 'date', 'salesperson_email', 'status', 'error_stage'), name='recording_rollup_unique'),
+        ),
+        migrations.RunPython(backfill_completed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2.25 on 2026-10-19 19:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_org_pipeline_scheduling'),
+        ('conversations', '0024_dashboard_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecordingInsights',
+            fields=[
+                ('recording', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='insights', serialize=False, to='conversations.callrecording')),
+                ('recording_created_at', models.DateTimeField()),
+                ('salesperson_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('commitment', models.CharField(blank=True, choices=[('advance', 'Advance'), ('continuation', 'Continuation'), ('no_sale', 'No Sale')], default='', max_length=16)),
+                ('outcome_likelihood', models.FloatField(blank=True, null=True)),
+                ('buying_signal_score', models.FloatField(blank=True, null=True)),
+                ('buying_signals', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('spin_categories', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('feedback_score', models.FloatField(blank=True, null=True)),
+                ('spin_situation_score', models.FloatField(blank=True, null=True)),
+                ('spin_problem_score', models.FloatField(blank=True, null=True)),
+                ('spin_implication_score', models.FloatField(blank=True, null=True)),
+                ('spin_need_payoff_score', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField()),
+                ('org', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recording_insights', to='accounts.organization')),
+            ],
+            options={
+                'verbose_name_plural': 'recording insights',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='recordinginsights',
+            index=models.Index(fields=['org', '-recording_created_at'], name='insights_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recordinginsights',
+            index=models.Index(fields=['org', 'commitment', '-recording_created_at'], name='insights_org_commitment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recordinginsights',
+            index=models.Index(fields=['org', 'buying_signal_score'], name='insights_org_signal_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recordinginsights',
+            index=models.Index(fields=['org', 'outcome_likelihood'], name='insights_org_likelihood_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recordinginsights',
+            index=models.Index(fields=['org', 'feedback_score'], name='insights_org_feedback_idx'),
+        ),
+    ]
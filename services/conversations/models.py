@@ -1,6 +1,7 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
-from services.accounts.models import Organization, User
+from services.accounts.models import DeliveryMode, Organization, User
 
 
 class CallRecording(models.Model):
@@ -53,15 +54,48 @@ class CallRecording(models.Model):
     analysis_json = models.JSONField(null=True, blank=True)
     feedback_json = models.JSONField(null=True, blank=True)
     followup_json = models.JSONField(null=True, blank=True)
+    # Per stage: AI service version and input hash behind the output (see versioning.py).
+    stage_versions = models.JSONField(default=dict, blank=True)
     error_stage = models.CharField(max_length=64, null=True, blank=True)
     error_message = models.TextField(null=True, blank=True)
     salesperson_email = models.EmailField(blank=True, default="")
     client_email = models.EmailField(blank=True, default="")
+    # Set for recordings created by a bulk import; their pipeline runs in the bulk lane.
+    bulk_job = models.ForeignKey(
+        "BulkJob",
+        on_delete=models.SET_NULL,
+        related_name="recordings",
+        null=True,
+        blank=True,
+    )
+
+    # deal_title + transcript for full-text search, kept current by a Postgres
+    # trigger and GIN-indexed (see search.py). Unused (NULL) on SQLite.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    # When the recording first reached DONE; re-runs don't move it.
+    completed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
+        # One per filter / ordering of the recordings list (see filters.py).
+        indexes = [
+            models.Index(fields=["org", "-created_at"], name="recording_org_created_idx"),
+            models.Index(fields=["org", "status", "-created_at"], name="recording_org_status_idx"),
+            models.Index(fields=["org", "language", "-created_at"], name="recording_org_language_idx"),
+            models.Index(
+                fields=["org", "salesperson_email", "-created_at"], name="recording_org_email_idx"
+            ),
+            models.Index(
+                fields=["org", "error_stage", "-created_at"],
+                name="recording_org_error_idx",
+                condition=models.Q(error_stage__isnull=False),
+            ),
+            models.Index(fields=["org", "deal_title"], name="recording_org_title_idx"),
+            # Dashboard rollups rebuild recent upload days across every org.
+            models.Index(fields=["created_at"], name="recording_created_idx"),
+        ]
 
     class Language(models.TextChoices):
         AUTO = "auto", "Auto-detect"
@@ -79,6 +113,213 @@ class CallRecording(models.Model):
         return f"Call #{self.id} ({self.get_status_display()})"
 
 
+class RecordingInsights(models.Model):
+    """
+    Typed, indexed fields extracted from a recording's analysis_json and
+    feedback_json (see insights.py), so analytics filter and aggregate in the
+    database instead of parsing every blob. A field the AI output lacks, or
+    has in an unexpected shape, is empty.
+    """
+    class Commitment(models.TextChoices):
+        ADVANCE = "advance"
+        CONTINUATION = "continuation"
+        NO_SALE = "no_sale"
+
+    recording = models.OneToOneField(
+        CallRecording, on_delete=models.CASCADE, primary_key=True, related_name="insights"
+    )
+    # Copied from the recording, so per-org, per-period queries need no join.
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="recording_insights")
+    recording_created_at = models.DateTimeField()
+    salesperson_email = models.EmailField(blank=True, default="")
+
+    # From analysis_json
+    commitment = models.CharField(max_length=16, choices=Commitment.choices, blank=True, default="")
+    outcome_likelihood = models.FloatField(null=True, blank=True)
+    buying_signal_score = models.FloatField(null=True, blank=True)
+    buying_signals = models.PositiveSmallIntegerField(null=True, blank=True)
+    # SPIN categories (situation, problem, implication, need-payoff) the analysis found.
+    spin_categories = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # From feedback_json
+    feedback_score = models.FloatField(null=True, blank=True)
+    spin_situation_score = models.FloatField(null=True, blank=True)
+    spin_problem_score = models.FloatField(null=True, blank=True)
+    spin_implication_score = models.FloatField(null=True, blank=True)
+    spin_need_payoff_score = models.FloatField(null=True, blank=True)
+
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "recording insights"
+        indexes = [
+            models.Index(fields=["org", "-recording_created_at"], name="insights_org_created_idx"),
+            models.Index(fields=["org", "commitment", "-recording_created_at"], name="insights_org_commitment_idx"),
+            models.Index(fields=["org", "buying_signal_score"], name="insights_org_signal_idx"),
+            models.Index(fields=["org", "outcome_likelihood"], name="insights_org_likelihood_idx"),
+            models.Index(fields=["org", "feedback_score"], name="insights_org_feedback_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Insights for call #{self.recording_id}"
+
+
+class StageEvent(models.Model):
+    """
+    One attempt at one pipeline stage of a recording. Written by timeline.py.
+    """
+    class Stage(models.TextChoices):
+        TRANSCRIPTION = "transcription"
+        ANALYZE = "analyze"
+        FEEDBACK = "feedback"
+        FOLLOWUP = "followup"
+
+    class Outcome(models.TextChoices):
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    recording = models.ForeignKey(
+        CallRecording,
+        on_delete=models.CASCADE,
+        related_name="stage_events",
+    )
+    # Denormalized from recording so org-level latency queries stay on one index.
+    org = models.ForeignKey(
+        Organization,
+        on_delete=models.PROTECT,
+        related_name="stage_events",
+    )
+    stage = models.CharField(max_length=16, choices=Stage.choices)
+    attempt = models.PositiveSmallIntegerField(default=1)
+    outcome = models.CharField(max_length=16, choices=Outcome.choices, default=Outcome.RUNNING)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["started_at"]
+        indexes = [
+            models.Index(fields=["org", "stage", "started_at"], name="stage_event_org_idx"),
+            models.Index(fields=["recording", "stage"], name="stage_event_recording_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Call #{self.recording_id} {self.stage} #{self.attempt} ({self.outcome})"
+
+
+class BulkJob(models.Model):
+    """
+    A long-running operation over many recordings of one org — a historical
+    import or a pipeline re-run — advanced in rate-limited batches by bulk.py.
+    `checkpoint` is the last recording id processed, so an interrupted job
+    resumes where it stopped.
+    """
+    class Kind(models.TextChoices):
+        IMPORT = "import"
+        RERUN = "rerun"
+
+    class State(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        COMPLETED = "completed"
+        CANCELLED = "cancelled"
+
+    org = models.ForeignKey(
+        Organization,
+        on_delete=models.PROTECT,
+        related_name="bulk_jobs",
+    )
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        related_name="bulk_jobs",
+        null=True,
+        blank=True,
+    )
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    state = models.CharField(max_length=16, choices=State.choices, default=State.PENDING)
+    # Where an import came from (directory, manifest name or S3 prefix) — informational.
+    source = models.CharField(max_length=512, blank=True, default="")
+    params = models.JSONField(default=dict, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    checkpoint = models.BigIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["state"], name="bulk_job_state_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Bulk {self.kind} #{self.id} ({self.state}, {self.processed}/{self.total})"
+
+
+class PipelineJob(models.Model):
+    """
+    A pending or running run of the AI pipeline for one recording. Jobs wait in
+    per-org, per-lane queues until scheduler.py admits them to the workers.
+    """
+    class Lane(models.IntegerChoices):
+        # Lower value = admitted first.
+        INTERACTIVE = 0, "Interactive"
+        NORMAL = 1, "Normal"
+        BULK = 2, "Bulk"
+
+    class State(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        FINISHED = "finished"
+        CANCELLED = "cancelled"
+
+    recording = models.ForeignKey(
+        CallRecording,
+        on_delete=models.CASCADE,
+        related_name="pipeline_jobs",
+    )
+    # Denormalized from recording so admission only reads this table.
+    org = models.ForeignKey(
+        Organization,
+        on_delete=models.PROTECT,
+        related_name="pipeline_jobs",
+    )
+    lane = models.PositiveSmallIntegerField(choices=Lane.choices, default=Lane.NORMAL)
+    state = models.CharField(max_length=16, choices=State.choices, default=State.QUEUED)
+    # The bulk re-run that queued this job, if any.
+    bulk_job = models.ForeignKey(
+        BulkJob,
+        on_delete=models.SET_NULL,
+        related_name="pipeline_jobs",
+        null=True,
+        blank=True,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    admitted_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["state", "lane", "org", "id"], name="pipeline_job_queue_idx"),
+            models.Index(fields=["finished_at"], name="pipeline_job_finished_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recording"],
+                condition=models.Q(state__in=["queued", "running"]),
+                name="pipeline_job_one_active",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Pipeline job #{self.id} call #{self.recording_id} [{self.get_lane_display()}] ({self.state})"
+
+
 class NotificationDelivery(models.Model):
     class Kind(models.TextChoices):
         ANALYSIS = "analysis"
@@ -95,6 +336,7 @@ class NotificationDelivery(models.Model):
         FAILED = "failed"
         RETRYING = "retrying"
         SKIPPED = "skipped"
+        HELD = "held"  # waiting to be coalesced into a NotificationDigest
 
     recording = models.ForeignKey(
         CallRecording,
@@ -105,9 +347,20 @@ class NotificationDelivery(models.Model):
     channel = models.CharField(max_length=16, choices=Channel.choices, default=Channel.EMAIL)
     salesperson_email = models.EmailField()
     status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    mode = models.CharField(
+        max_length=32, choices=DeliveryMode.choices, default=DeliveryMode.IMMEDIATE
+    )
+    digest = models.ForeignKey(
+        "NotificationDigest",
+        on_delete=models.SET_NULL,
+        related_name="deliveries",
+        null=True,
+        blank=True,
+    )
     attempts = models.PositiveIntegerField(default=0)
     subject = models.CharField(max_length=255, blank=True, default="")
     body = models.TextField(blank=True, default="")
+    html_body = models.TextField(blank=True, default="")
     last_error = models.TextField(null=True, blank=True)
     last_attempt_at = models.DateTimeField(null=True, blank=True)
     sent_at = models.DateTimeField(null=True, blank=True)
@@ -117,6 +370,103 @@ class NotificationDelivery(models.Model):
     class Meta:
         ordering = ["-created_at"]
         unique_together = [("recording", "kind")]
+        indexes = [
+            models.Index(fields=["status", "mode", "created_at"], name="delivery_held_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Delivery #{self.id} [{self.kind}] → {self.salesperson_email} ({self.status})"
+
+
+class NotificationDigest(models.Model):
+    """
+    One email that coalesces several held NotificationDelivery rows —
+    either all stages of a single recording, or a salesperson's whole day.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        SENT = "sent"
+        FAILED = "failed"
+        RETRYING = "retrying"
+
+    mode = models.CharField(max_length=32, choices=DeliveryMode.choices)
+    salesperson_email = models.EmailField()
+    # Set for per-recording digests only.
+    recording = models.ForeignKey(
+        CallRecording,
+        on_delete=models.CASCADE,
+        related_name="digests",
+        null=True,
+        blank=True,
+    )
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    subject = models.CharField(max_length=255, blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    html_body = models.TextField(blank=True, default="")
+    last_error = models.TextField(null=True, blank=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Digest #{self.id} [{self.mode}] → {self.salesperson_email} ({self.status})"
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task dispatch written in the same transaction as the state change
+    that requires it. Rows are relayed to the broker after commit by outbox.py.
+    """
+    task_name = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    # Trace context of the code that staged the task, so a late relay by
+    # relay_outbox still continues the original trace.
+    traceparent = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["dispatched_at", "id"], name="outbox_pending_idx"),
+        ]
+
+    def __str__(self) -> str:
+        state = "dispatched" if self.dispatched_at else "pending"
+        return f"Outbox #{self.id} {self.task_name}{tuple(self.args)} ({state})"
+
+
+class RecordingRollup(models.Model):
+    """
+    Recordings of one org uploaded on one day (UTC), by salesperson, status and
+    (for failed ones) error stage. Rebuilt from CallRecording by dashboard.py,
+    so the dashboard reads a few rows per day instead of every recording.
+    """
+    org = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="recording_rollups")
+    date = models.DateField()
+    salesperson_email = models.EmailField(blank=True, default="")
+    status = models.CharField(max_length=64, choices=CallRecording.Status.choices)
+    error_stage = models.CharField(max_length=64, blank=True, default="")
+    recordings = models.PositiveIntegerField(default=0)
+    # Of those, how many have completed_at, and their summed upload-to-done time.
+    completed = models.PositiveIntegerField(default=0)
+    turnaround_seconds = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ["org", "date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["org", "date", "salesperson_email", "status", "error_stage"],
+                name="recording_rollup_unique",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Rollup {self.org_id} {self.date} {self.status}: {self.recordings}"
@@ -0,0 +1,86 @@
+import logging
+from datetime import timedelta
+
+from celery import current_app
+from django.db import transaction
+from django.utils import timezone
+
+from core.tracing import TRACEPARENT_HEADER, current_span
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+RELAY_BATCH_SIZE = 100
+RETENTION = timedelta(days=7)
+
+
+def enqueue_task(task, *args) -> OutboxMessage:
+    """
+    Stage a Celery task dispatch in the outbox.
+
+    Call this inside the transaction that writes the state the task depends on.
+    The row is relayed right after commit; if the broker is unreachable it stays
+    pending and relay_outbox retries it. A rollback discards it with everything else.
+    """
+    span = current_span()
+    msg = OutboxMessage.objects.create(
+        task_name=task.name,
+        args=list(args),
+        traceparent=span.traceparent if span else "",
+    )
+    transaction.on_commit(lambda: _relay_after_commit(msg.id))
+    return msg
+
+
+def _relay_after_commit(message_id: int):
+    # The commit already happened — never let a relay problem surface to the caller.
+    try:
+        relay_messages(ids=[message_id])
+    except Exception as exc:
+        logger.error("outbox: immediate relay of message %s failed — %s", message_id, exc)
+
+
+def relay_messages(ids=None, batch_size: int = RELAY_BATCH_SIZE) -> int:
+    """
+    Send up to `batch_size` pending messages to the broker and mark them dispatched.
+    Rows locked by another relay are skipped. Stops at the first broker error,
+    since the rest of the batch would almost certainly fail the same way.
+    Returns the number of messages dispatched.
+    """
+    dispatched = []
+    with transaction.atomic():
+        qs = (
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(dispatched_at__isnull=True)
+        )
+        if ids is not None:
+            qs = qs.filter(id__in=ids)
+
+        for msg in qs.order_by("id")[:batch_size]:
+            try:
+                options = {"headers": {TRACEPARENT_HEADER: msg.traceparent}} if msg.traceparent else {}
+                current_app.send_task(msg.task_name, args=msg.args, **options)
+            except Exception as exc:
+                logger.error(
+                    "outbox: failed to dispatch message %s (%s) — %s",
+                    msg.id, msg.task_name, exc,
+                )
+                msg.attempts += 1
+                msg.last_error = str(exc)
+                msg.save(update_fields=["attempts", "last_error"])
+                break
+            dispatched.append(msg.id)
+
+        if dispatched:
+            OutboxMessage.objects.filter(id__in=dispatched).update(
+                dispatched_at=timezone.now()
+            )
+    return len(dispatched)
+
+
+def purge_dispatched(older_than: timedelta = RETENTION) -> int:
+    cutoff = timezone.now() - older_than
+    deleted, _ = OutboxMessage.objects.filter(dispatched_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,142 @@
+"""
+Audio playback URLs and byte-range serving.
+
+S3: the recording's presigned URL is cached and reused until shortly before
+it expires (AWS_QUERYSTRING_EXPIRE), so serializing a page of recordings
+doesn't re-sign every URL. S3 answers Range requests itself.
+
+Local storage: the URL points at GET /api/recordings/<id>/audio/ with a
+signed, expiring token, since <audio> elements can't send an Authorization
+header. That endpoint answers Range requests with 206 Partial Content, so
+seeking in a long call doesn't download it from the start.
+"""
+
+import hashlib
+import mimetypes
+import re
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+
+URL_KEY = "playback:url:{}"
+# Cached URLs are dropped this long before they expire, so a client always
+# gets one it can still use for a while.
+REFRESH_MARGIN = 300
+TOKEN_SALT = "conversations.playback"
+
+_UNKNOWN = object()
+_BLOCK_SIZE = 64 * 1024
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _ttl() -> int:
+    return settings.AWS_QUERYSTRING_EXPIRE if settings.USE_S3 else settings.PLAYBACK_URL_TTL
+
+
+def _key(recording) -> str:
+    digest = hashlib.sha1(f"{recording.id}:{recording.audio_file.name}".encode()).hexdigest()
+    return URL_KEY.format(digest)
+
+
+def _sign(recording) -> str:
+    if settings.USE_S3:
+        return default_storage.url(recording.audio_file.name, expire=_ttl())
+    token = signing.dumps(recording.id, salt=TOKEN_SALT)
+    return f"/api/recordings/{recording.id}/audio/?token={token}"
+
+
+def prefetch(recordings):
+    """Load cached URLs for many recordings in one cache round trip."""
+    recordings = [r for r in recordings if r.audio_file]
+    cached = cache.get_many([_key(r) for r in recordings])
+    for recording in recordings:
+        recording._playback_url = cached.get(_key(recording))
+
+
+def playback_url(recording, request=None):
+    """Where to play the recording's audio from; None if it has no file."""
+    if not recording.audio_file:
+        return None
+    url = getattr(recording, "_playback_url", _UNKNOWN)
+    if url is _UNKNOWN:
+        url = cache.get(_key(recording))
+    if url is None:
+        url = _sign(recording)
+        cache.set(_key(recording), url, max(_ttl() - REFRESH_MARGIN, 1))
+    recording._playback_url = url
+    if request is not None and url.startswith("/"):
+        return request.build_absolute_uri(url)
+    return url
+
+
+def verify_token(token: str):
+    """Recording id the token was issued for; None if invalid or expired."""
+    try:
+        return signing.loads(token, salt=TOKEN_SALT, max_age=settings.PLAYBACK_URL_TTL)
+    except signing.BadSignature:
+        return None
+
+
+def parse_range(header: str, size: int):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to serve the whole
+    file (no header, or one we don't handle, like multiple ranges), or
+    ValueError if the range can't be satisfied.
+    """
+    match = _RANGE.match((header or "").strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, end
+
+
+def _read(f, start: int, length: int):
+    try:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(_BLOCK_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        f.close()
+
+
+def serve_file(name: str, range_header: str = None):
+    """The stored file `name`, whole (200) or the requested byte range (206)."""
+    size = default_storage.size(name)
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    f = default_storage.open(name, "rb")
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type)
+        response["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_read(f, start, end - start + 1), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,318 @@
+"""
+Fair-share admission of AI pipeline runs.
+
+Recordings are not sent to the workers as soon as they are ready. Each run is a
+PipelineJob waiting in its org's queue for one of three lanes; admit_jobs()
+moves jobs to RUNNING (and dispatches run_langgraph_pipeline) only while there
+is capacity:
+
+- PIPELINE_MAX_CONCURRENCY pipelines run at once across all orgs.
+- An org runs at most its max_concurrent_pipelines (default
+  PIPELINE_ORG_MAX_CONCURRENCY), so one tenant's backlog can't take every slot.
+- The bulk lane may hold at most PIPELINE_BULK_MAX_CONCURRENCY slots, leaving
+  the rest free for fresh calls.
+- Lanes are served in priority order (interactive, normal, bulk). Within a lane,
+  the next slot goes to the org with the fewest running jobs per unit of
+  pipeline_weight — weighted round-robin.
+
+Interactive jobs (user-triggered re-runs) skip the per-org cap; the global cap
+still applies.
+
+A job still RUNNING PIPELINE_JOB_TIMEOUT after admission (or after its last
+retry) is taken to have lost its worker: it holds no slot, doesn't block
+scheduling the recording again, and expire_lost_jobs() moves it to FINISHED.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from services.accounts.models import Organization
+
+from .models import CallRecording, PipelineJob
+from .outbox import enqueue_task
+
+logger = logging.getLogger(__name__)
+
+ADMIT_LOCK_KEY = "pipeline:admit:lock"
+ADMIT_REQUESTED_KEY = "pipeline:admit:requested"
+ADMIT_LOCK_TIMEOUT = 60
+
+_ACTIVE = [PipelineJob.State.QUEUED, PipelineJob.State.RUNNING]
+
+# Outputs cleared when a stage is re-run. Feedback and follow-up are both
+# generated from the analysis, so re-analyzing redoes them too.
+RERUN_CLEARS = {
+    "analyze": ["analysis_json", "feedback_json", "followup_json"],
+    "feedback": ["feedback_json"],
+    "followup": ["followup_json"],
+}
+
+
+def rerun_fields(stages) -> list:
+    """Output fields to clear for re-running `stages`; ValueError on unknown ones."""
+    unknown = set(stages) - set(RERUN_CLEARS)
+    if unknown or not stages:
+        raise ValueError(f"Choose stages from {sorted(RERUN_CLEARS)}.")
+    return sorted({field for stage in stages for field in RERUN_CLEARS[stage]})
+
+
+def lost_cutoff():
+    """Running jobs admitted before this are taken to have lost their worker."""
+    return timezone.now() - settings.PIPELINE_JOB_TIMEOUT
+
+
+def _finish(job_ids) -> None:
+    PipelineJob.objects.filter(id__in=job_ids).update(
+        state=PipelineJob.State.FINISHED, finished_at=timezone.now()
+    )
+
+
+def expire_lost_jobs(**filters) -> list:
+    """
+    Move RUNNING jobs admitted before lost_cutoff() to FINISHED, so their
+    recordings can be scheduled again. Returns those recordings' ids.
+    """
+    with transaction.atomic():
+        jobs = list(
+            PipelineJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(state=PipelineJob.State.RUNNING, admitted_at__lt=lost_cutoff(), **filters)
+            .values_list("id", "recording_id")
+        )
+        if jobs:
+            _finish([job_id for job_id, _ in jobs])
+            transaction.on_commit(request_admission)
+    return [recording_id for _, recording_id in jobs]
+
+
+def schedule_pipeline(recording, lane=PipelineJob.Lane.NORMAL) -> PipelineJob:
+    """
+    Queue a pipeline run for `recording`. Call inside the transaction that made
+    the recording ready. A recording has at most one active job: scheduling it
+    again returns that job, moved to the higher-priority lane if `lane` is one.
+    A running job that has lost its worker is finished and replaced instead.
+    """
+    job = (
+        PipelineJob.objects
+        .select_for_update()
+        .filter(recording=recording, state__in=_ACTIVE)
+        .first()
+    )
+    if (
+        job is not None
+        and job.state == PipelineJob.State.RUNNING
+        and job.admitted_at is not None
+        and job.admitted_at < lost_cutoff()
+    ):
+        logger.warning("scheduler: replacing lost pipeline job %s of recording %s", job.id, recording.id)
+        _finish([job.id])
+        job = None
+    if job is None:
+        job = PipelineJob.objects.create(recording=recording, org_id=recording.org_id, lane=lane)
+    elif job.state == PipelineJob.State.QUEUED and lane < job.lane:
+        job.lane = lane
+        job.save(update_fields=["lane"])
+    transaction.on_commit(request_admission)
+    return job
+
+
+def schedule_pipelines(recording_ids, lane=PipelineJob.Lane.BULK, bulk_job=None) -> int:
+    """
+    schedule_pipeline for many recordings at once. Recordings that already
+    have an active job are left alone. Returns the number of jobs created.
+    """
+    expire_lost_jobs(recording_id__in=recording_ids)
+    active = set(
+        PipelineJob.objects
+        .filter(recording_id__in=recording_ids, state__in=_ACTIVE)
+        .values_list("recording_id", flat=True)
+    )
+    rows = list(
+        CallRecording.objects
+        .filter(id__in=set(recording_ids) - active)
+        .values_list("id", "org_id")
+    )
+    PipelineJob.objects.bulk_create(
+        PipelineJob(recording_id=recording_id, org_id=org_id, lane=lane, bulk_job=bulk_job)
+        for recording_id, org_id in rows
+    )
+    if rows:
+        transaction.on_commit(request_admission)
+    return len(rows)
+
+
+def release_pipeline_job(recording_id: int) -> bool:
+    """Mark the recording's running job finished, freeing its slot."""
+    released = PipelineJob.objects.filter(
+        recording_id=recording_id, state=PipelineJob.State.RUNNING
+    ).update(state=PipelineJob.State.FINISHED, finished_at=timezone.now())
+    if released:
+        transaction.on_commit(request_admission)
+    return bool(released)
+
+
+def touch_pipeline_job(recording_id: int):
+    """
+    Restart the running job's timeout. Called when a run backs off to retry, so
+    a long backoff doesn't get its slot treated as lost.
+    """
+    PipelineJob.objects.filter(
+        recording_id=recording_id, state=PipelineJob.State.RUNNING
+    ).update(admitted_at=timezone.now())
+
+
+def cancel_queued_jobs(**filters) -> int:
+    """Cancel jobs that haven't been admitted yet. Running jobs finish normally."""
+    return PipelineJob.objects.filter(state=PipelineJob.State.QUEUED, **filters).update(
+        state=PipelineJob.State.CANCELLED, finished_at=timezone.now()
+    )
+
+
+def request_admission():
+    """
+    Ask a worker to run an admission pass. Requests within a few seconds of each
+    other collapse into one task; a lost request only costs latency, since
+    beat runs admit_pipeline_jobs periodically anyway.
+    """
+    from .tasks import admit_pipeline_jobs
+
+    if not cache.add(ADMIT_REQUESTED_KEY, 1, settings.PIPELINE_ADMIT_DEBOUNCE):
+        return
+    try:
+        admit_pipeline_jobs.delay()
+    except Exception as exc:
+        cache.delete(ADMIT_REQUESTED_KEY)
+        logger.error("scheduler: could not request admission — %s", exc)
+
+
+# ---------------------------------------------------------------------------
+# Admission
+# ---------------------------------------------------------------------------
+
+
+def _running_counts():
+    """
+    Running jobs by org and by lane. Jobs admitted before lost_cutoff() are
+    assumed lost with their worker and don't count.
+    """
+    rows = (
+        PipelineJob.objects
+        .filter(state=PipelineJob.State.RUNNING, admitted_at__gte=lost_cutoff())
+        .order_by()
+        .values("org_id", "lane")
+        .annotate(n=Count("id"))
+    )
+    by_org, by_lane = {}, {}
+    for row in rows:
+        by_org[row["org_id"]] = by_org.get(row["org_id"], 0) + row["n"]
+        by_lane[row["lane"]] = by_lane.get(row["lane"], 0) + row["n"]
+    return by_org, by_lane
+
+
+def plan_admissions(free: int, waiting: dict, running: dict, orgs: dict, bulk_free: int) -> dict:
+    """
+    Decide how many jobs to admit per (lane, org_id).
+
+    waiting: {lane: {org_id: (queued_count, oldest_job_id)}}
+    running: {org_id: running_count}, updated in place as slots are handed out
+    orgs:    {org_id: (weight, max_concurrent)}
+    """
+    plan = {}
+    for lane in sorted(waiting):
+        lane_free = free if lane != PipelineJob.Lane.BULK else min(free, bulk_free)
+        remaining = {org_id: count for org_id, (count, _) in waiting[lane].items()}
+        while lane_free > 0:
+            eligible = [
+                org_id for org_id, count in remaining.items()
+                if count > 0 and (
+                    lane == PipelineJob.Lane.INTERACTIVE
+                    or running.get(org_id, 0) < orgs[org_id][1]
+                )
+            ]
+            if not eligible:
+                break
+            org_id = min(
+                eligible,
+                key=lambda o: (running.get(o, 0) / orgs[o][0], waiting[lane][o][1]),
+            )
+            plan[(lane, org_id)] = plan.get((lane, org_id), 0) + 1
+            running[org_id] = running.get(org_id, 0) + 1
+            remaining[org_id] -= 1
+            lane_free -= 1
+            free -= 1
+    return plan
+
+
+def admit_jobs() -> int:
+    """
+    One admission pass. Only one runs at a time; a pass that finds another in
+    progress returns 0 and leaves the work to it. Returns the number admitted.
+    """
+    if not cache.add(ADMIT_LOCK_KEY, 1, ADMIT_LOCK_TIMEOUT):
+        return 0
+    # Requests made from here on need a new pass to see their jobs.
+    cache.delete(ADMIT_REQUESTED_KEY)
+    try:
+        return _admit()
+    finally:
+        cache.delete(ADMIT_LOCK_KEY)
+
+
+def _admit() -> int:
+    from .tasks import run_langgraph_pipeline
+
+    running, running_by_lane = _running_counts()
+    free = settings.PIPELINE_MAX_CONCURRENCY - sum(running.values())
+    if free <= 0:
+        return 0
+
+    waiting = {}
+    rows = (
+        PipelineJob.objects
+        .filter(state=PipelineJob.State.QUEUED)
+        .order_by()
+        .values("lane", "org_id")
+        .annotate(n=Count("id"), oldest=Min("id"))
+    )
+    for row in rows:
+        waiting.setdefault(row["lane"], {})[row["org_id"]] = (row["n"], row["oldest"])
+    if not waiting:
+        return 0
+
+    org_ids = {org_id for by_org in waiting.values() for org_id in by_org}
+    orgs = {
+        org_id: (max(weight, 1), cap if cap is not None else settings.PIPELINE_ORG_MAX_CONCURRENCY)
+        for org_id, weight, cap in Organization.objects.filter(id__in=org_ids).values_list(
+            "id", "pipeline_weight", "max_concurrent_pipelines"
+        )
+    }
+    bulk_free = settings.PIPELINE_BULK_MAX_CONCURRENCY - running_by_lane.get(PipelineJob.Lane.BULK, 0)
+    plan = plan_admissions(free, waiting, running, orgs, bulk_free)
+
+    admitted = 0
+    now = timezone.now()
+    for (lane, org_id), count in plan.items():
+        with transaction.atomic():
+            jobs = list(
+                PipelineJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(state=PipelineJob.State.QUEUED, lane=lane, org_id=org_id)
+                .order_by("id")
+                .values_list("id", "recording_id")[:count]
+            )
+            if not jobs:
+                continue
+            PipelineJob.objects.filter(id__in=[job_id for job_id, _ in jobs]).update(
+                state=PipelineJob.State.RUNNING, admitted_at=now
+            )
+            for _, recording_id in jobs:
+                enqueue_task(run_langgraph_pipeline, recording_id)
+        admitted += len(jobs)
+    if admitted:
+        logger.info("scheduler: admitted %d pipeline job(s) %s", admitted, plan)
+    return admitted
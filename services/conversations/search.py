@@ -0,0 +1,162 @@
+"""
+Full-text search over recordings' transcript and deal title.
+
+Postgres: CallRecording.search_vector is a tsvector kept current by a trigger
+and GIN-indexed (migration 0022). English recordings are indexed with the
+"english" configuration (stemmed). Hebrew and undetected ones use "simple",
+since Postgres ships no Hebrew configuration. Queries are parsed with both, so
+one search covers recordings in either language. Deal titles weigh more than
+transcripts.
+
+SQLite (local dev): an FTS5 table over the same columns, ranked by bm25 and
+kept current by triggers. install_sqlite_index() creates it after every
+migrate, because SQLite migrations rebuild tables and drop their triggers.
+"""
+
+import html
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, F, Value, When
+
+from .models import CallRecording
+
+# Highlight markers. Private-use characters, so they can't collide with
+# transcript text; snippets are HTML-escaped, then these become <mark> tags.
+_START, _STOP = "\ue000", "\ue001"
+_SNIPPET_WORDS = 24
+
+FTS_TABLE = "conversations_callrecording_fts"
+_RECORDINGS = CallRecording._meta.db_table
+
+_SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        AFTER INSERT ON {_RECORDINGS} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, deal_title, transcript)
+            VALUES (new.id, new.deal_title, new.transcript);
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        AFTER DELETE ON {_RECORDINGS} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, deal_title, transcript)
+            VALUES ('delete', old.id, old.deal_title, old.transcript);
+        END""",
+    f"{FTS_TABLE}_au": f"""
+        AFTER UPDATE OF deal_title, transcript ON {_RECORDINGS} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, deal_title, transcript)
+            VALUES ('delete', old.id, old.deal_title, old.transcript);
+            INSERT INTO {FTS_TABLE}(rowid, deal_title, transcript)
+            VALUES (new.id, new.deal_title, new.transcript);
+        END""",
+}
+
+
+def install_sqlite_index(using="default", **kwargs):
+    """post_migrate: create the FTS5 table and its triggers if missing."""
+    from django.db import connections
+
+    conn = connections[using]
+    if conn.vendor != "sqlite":
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+            [f"{FTS_TABLE}_%"],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing == set(_SQLITE_TRIGGERS):
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"deal_title, transcript, content='{_RECORDINGS}', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2')"
+        )
+        for name, body in _SQLITE_TRIGGERS.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        # Rows written while the triggers were missing aren't indexed yet.
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _highlight(snippet: str) -> str:
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+def search_recordings(queryset, query: str, limit: int) -> list:
+    """
+    Recordings from `queryset` matching `query`, best first, at most `limit`.
+    Each has `rank` (higher is better) and `snippet` (HTML-escaped, matches
+    wrapped in <mark>) set. Transcripts are not loaded.
+    """
+    query = query.strip()
+    if not query:
+        return []
+    queryset = queryset.defer("transcript", "transcript_json")
+    if connection.vendor == "postgresql":
+        results = _search_postgres(queryset, query, limit)
+    else:
+        results = _search_sqlite(queryset, query, limit)
+    for recording in results:
+        recording.snippet = _highlight(recording.snippet)
+    return results
+
+
+def _search_postgres(queryset, query: str, limit: int) -> list:
+    tsquery = (
+        SearchQuery(query, config="english", search_type="websearch")
+        | SearchQuery(query, config="simple", search_type="websearch")
+    )
+    config = Case(
+        When(language=CallRecording.Language.EN, then=Value("english")),
+        default=Value("simple"),
+    )
+    return list(
+        queryset
+        .filter(search_vector=tsquery)
+        .annotate(
+            rank=SearchRank(F("search_vector"), tsquery),
+            snippet=SearchHeadline(
+                "transcript", tsquery, config=config,
+                start_sel=_START, stop_sel=_STOP,
+                max_words=_SNIPPET_WORDS, min_words=_SNIPPET_WORDS // 2, max_fragments=2,
+            ),
+        )
+        .order_by("-rank", "-created_at")[:limit]
+    )
+
+
+def _fts5_query(query: str) -> str:
+    """
+    User input as an FTS5 query: every word must match (as a prefix), with
+    FTS5 operators and punctuation taken literally.
+    """
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _search_sqlite(queryset, query: str, limit: int) -> list:
+    match = _fts5_query(query)
+    if not match:
+        return []
+    ids_sql, ids_params = queryset.order_by().values("id").query.sql_with_params()
+    sql = f"""
+        SELECT rowid,
+               -bm25({FTS_TABLE}, 4.0, 1.0),
+               snippet({FTS_TABLE}, -1, %s, %s, '…', %s)
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH %s AND rowid IN ({ids_sql})
+        ORDER BY 2 DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [_START, _STOP, _SNIPPET_WORDS, match, *ids_params, limit])
+        rows = cursor.fetchall()
+
+    recordings = queryset.in_bulk([row[0] for row in rows])
+    results = []
+    for recording_id, rank, snippet in rows:
+        recording = recordings[recording_id]
+        recording.rank = rank
+        recording.snippet = snippet
+        results.append(recording)
+    return results
@@ -1,10 +1,35 @@
+from django.conf import settings
+from django.db import models
 from rest_framework import serializers
-from .models import CallRecording
+
+from . import playback
+from .models import BulkJob, CallRecording
+
+
+class AudioFileField(serializers.FileField):
+    """On S3, the cached presigned URL rather than a freshly signed one."""
+
+    def to_representation(self, value):
+        if settings.USE_S3 and value:
+            return playback.playback_url(value.instance)
+        return super().to_representation(value)
+
+
+class CallRecordingListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        recordings = list(data.all() if hasattr(data, "all") else data)
+        playback.prefetch(recordings)
+        return super().to_representation(recordings)
 
 
 class CallRecordingSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.FileField: AudioFileField,
+    }
     transcript_ready = serializers.SerializerMethodField()
     transcript_url = serializers.SerializerMethodField()
+    playback_url = serializers.SerializerMethodField()
 
     class Meta:
         model = CallRecording
@@ -23,12 +48,15 @@ class CallRecordingSerializer(serializers.ModelSerializer):
             "analysis_json",
             "feedback_json",
             "followup_json",
+            "stage_versions",
             "error_stage",
             "error_message",
             # helpers
             "transcript_ready",
             "transcript_url",
+            "playback_url",
         ]
+        list_serializer_class = CallRecordingListSerializer
         read_only_fields = [
             "status",
             "transcript",
@@ -37,10 +65,12 @@ class CallRecordingSerializer(serializers.ModelSerializer):
             "analysis_json",
             "feedback_json",
             "followup_json",
+            "stage_versions",
             "error_stage",
             "error_message",
             "transcript_ready",
             "transcript_url",
+            "playback_url",
         ]
 
     def get_transcript_ready(self, obj):
@@ -61,3 +91,38 @@ class CallRecordingSerializer(serializers.ModelSerializer):
         if not request:
             return None
         return request.build_absolute_uri(f"/api/recordings/{obj.id}/transcript/")
+
+    def get_playback_url(self, obj):
+        return playback.playback_url(obj, self.context.get("request"))
+
+
+class RecordingSearchResultSerializer(serializers.ModelSerializer):
+    """A search hit: enough to list and link the recording, plus its match."""
+
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = CallRecording
+        fields = ["id", "deal_title", "language", "status", "created_at", "rank", "snippet"]
+        read_only_fields = fields
+
+
+class BulkJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BulkJob
+        fields = [
+            "id",
+            "kind",
+            "state",
+            "source",
+            "params",
+            "total",
+            "processed",
+            "failed",
+            "last_error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core.metrics import STATUS_TRANSITIONS
+
+from .models import CallRecording
+
+
+@receiver(post_save, sender=CallRecording)
+def count_status_transition(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields and "status" in update_fields):
+        STATUS_TRANSITIONS.labels(status=instance.status, org=str(instance.org_id)).inc()
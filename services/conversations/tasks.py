@@ -1,21 +1,52 @@
 import logging
+import random
 from datetime import timedelta
 
 from langdetect import detect
 from celery import shared_task
 from celery.exceptions import MaxRetriesExceededError
+from django.conf import settings
 from django.core.mail import send_mail
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 
-from .models import CallRecording, NotificationDelivery
+from services.accounts.models import DeliveryMode
+from services.accounts.usage import QuotaExceeded, check_pipeline_quota, record_usage
+
+from . import bulk, dashboard
+from .models import (
+    BulkJob,
+    CallRecording,
+    NotificationDelivery,
+    NotificationDigest,
+    PipelineJob,
+    StageEvent,
+)
 from .transcription_service import poll_transcription, format_speaker_transcript, AssemblyAIError
 from .ai_client import (
+    AIServiceError,
+    AIServiceUnavailable,
     analyze_via_ai_service,
     feedback_via_ai_service,
     generate_followup_via_ai_service,
+    stage_versions,
+)
+from .digests import collect_daily_digests, collect_recording_digests, resolve_delivery_mode
+from .email_builders import build_digest_email, build_stage_email, stage_context
+from .insights import save_insights
+from .outbox import RELAY_BATCH_SIZE, enqueue_task, purge_dispatched, relay_messages
+from .scheduler import (
+    admit_jobs,
+    expire_lost_jobs,
+    lost_cutoff,
+    release_pipeline_job,
+    schedule_pipeline,
+    schedule_pipelines,
+    touch_pipeline_job,
 )
-from .email_builders import build_analysis_email, build_feedback_email, build_followup_email
+from .timeline import finish_stage, track_stage
+from .versioning import is_current, stamp
 
 logger = logging.getLogger(__name__)
 
@@ -47,25 +78,19 @@ def send_delivery(self, delivery_id: int):
         delivery.save(update_fields=["status", "attempts", "last_attempt_at", "updated_at"])
 
     try:
-        kind = delivery.kind
-        if kind == NotificationDelivery.Kind.ANALYSIS:
-            subject, body = build_analysis_email(delivery.recording)
-        elif kind == NotificationDelivery.Kind.FEEDBACK:
-            subject, body = build_feedback_email(delivery.recording)
-        elif kind == NotificationDelivery.Kind.FOLLOWUP:
-            subject, body = build_followup_email(delivery.recording)
-        else:
-            raise ValueError(f"Unknown delivery kind: {kind}")
-        delivery.subject = subject
-        delivery.body = body
-        delivery.save(update_fields=["subject", "body", "updated_at"])
+        if not delivery.body:
+            # Rows queued before bodies were rendered up front by queue_notification.
+            rendered = build_stage_email(delivery.recording, delivery.kind)
+            delivery.subject, delivery.body, delivery.html_body = rendered
+            delivery.save(update_fields=["subject", "body", "html_body", "updated_at"])
 
         send_mail(
-            subject=subject,
-            message=body,
+            subject=delivery.subject,
+            message=delivery.body,
             from_email=None,  # uses DEFAULT_FROM_EMAIL
             recipient_list=[delivery.salesperson_email],
             fail_silently=False,
+            html_message=delivery.html_body or None,
         )
 
         delivery.status = NotificationDelivery.Status.SENT
@@ -92,6 +117,190 @@ def send_delivery(self, delivery_id: int):
             delivery.save(update_fields=["status", "updated_at"])
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_digest(self, digest_id: int):
+    with transaction.atomic():
+        try:
+            digest = (
+                NotificationDigest.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    id=digest_id,
+                    status__in=[
+                        NotificationDigest.Status.PENDING,
+                        NotificationDigest.Status.RETRYING,
+                    ],
+                )
+                .get()
+            )
+        except NotificationDigest.DoesNotExist:
+            return
+
+        digest.status = NotificationDigest.Status.RETRYING
+        digest.attempts += 1
+        digest.last_attempt_at = timezone.now()
+        digest.save(update_fields=["status", "attempts", "last_attempt_at", "updated_at"])
+
+    deliveries = list(
+        digest.deliveries
+        .select_related("recording")
+        .exclude(status=NotificationDelivery.Status.FAILED)
+        .order_by("recording_id", "id")
+    )
+
+    try:
+        if not digest.body:
+            # First attempt: render once. A stage with missing output must not sink
+            # the whole digest — drop it and fail only that delivery.
+            sections = []
+            for delivery in deliveries:
+                try:
+                    sections.append((delivery, stage_context(delivery.recording, delivery.kind)))
+                except ValueError as exc:
+                    logger.error(
+                        "send_digest [%s]: dropping delivery %s — %s", digest_id, delivery.id, exc,
+                    )
+                    delivery.status = NotificationDelivery.Status.FAILED
+                    delivery.last_error = str(exc)
+                    delivery.save(update_fields=["status", "last_error", "updated_at"])
+            deliveries = [delivery for delivery, _ in sections]
+
+            digest.subject, digest.body, digest.html_body = build_digest_email(digest, sections)
+            digest.save(update_fields=["subject", "body", "html_body", "updated_at"])
+
+        send_mail(
+            subject=digest.subject,
+            message=digest.body,
+            from_email=None,  # uses DEFAULT_FROM_EMAIL
+            recipient_list=[digest.salesperson_email],
+            fail_silently=False,
+            html_message=digest.html_body or None,
+        )
+
+        now = timezone.now()
+        with transaction.atomic():
+            digest.status = NotificationDigest.Status.SENT
+            digest.sent_at = now
+            digest.save(update_fields=["status", "sent_at", "updated_at"])
+            NotificationDelivery.objects.filter(
+                id__in=[delivery.id for delivery in deliveries]
+            ).update(status=NotificationDelivery.Status.SENT, sent_at=now, updated_at=now)
+
+    except ValueError as exc:
+        logger.error("send_digest [%s]: data error, will not retry — %s", digest_id, exc)
+        digest.status = NotificationDigest.Status.FAILED
+        digest.last_error = str(exc)
+        digest.save(update_fields=["status", "last_error", "updated_at"])
+
+    except Exception as exc:
+        logger.error("send_digest [%s]: transient error, will retry — %s", digest_id, exc)
+        digest.last_error = str(exc)
+        digest.save(update_fields=["last_error", "updated_at"])
+        try:
+            raise self.retry(exc=exc)
+        except MaxRetriesExceededError:
+            digest.status = NotificationDigest.Status.FAILED
+            digest.save(update_fields=["status", "updated_at"])
+
+
+def queue_notification(recording, kind):
+    """
+    Create the NotificationDelivery for `kind` and stage its send in the outbox.
+
+    Call inside the transaction that saves the stage output, so the delivery row and
+    its dispatch commit (or roll back) together with it. The email is rendered here,
+    once; send attempts reuse the stored subject/body. Deliveries for recipients on
+    a digest mode are HELD instead and picked up by the digest schedulers. Failures
+    are logged and swallowed — a notification problem must never fail the pipeline stage.
+    """
+    if not recording.salesperson_email:
+        return None
+    try:
+        mode = resolve_delivery_mode(recording)
+        status = (
+            NotificationDelivery.Status.PENDING
+            if mode == DeliveryMode.IMMEDIATE
+            else NotificationDelivery.Status.HELD
+        )
+        try:
+            subject, body, html_body = build_stage_email(recording, kind)
+            last_error = None
+        except ValueError as exc:
+            # Data problem — sending later won't fix it.
+            subject, body, html_body = "", "", ""
+            status, last_error = NotificationDelivery.Status.FAILED, str(exc)
+
+        with transaction.atomic():
+            delivery, created = NotificationDelivery.objects.get_or_create(
+                recording=recording,
+                kind=kind,
+                defaults={
+                    "channel": NotificationDelivery.Channel.EMAIL,
+                    "salesperson_email": recording.salesperson_email,
+                    "mode": mode,
+                    "status": status,
+                    "subject": subject,
+                    "body": body,
+                    "html_body": html_body,
+                    "last_error": last_error,
+                },
+            )
+            if not created and delivery.status in (
+                NotificationDelivery.Status.PENDING,
+                NotificationDelivery.Status.RETRYING,
+                NotificationDelivery.Status.HELD,
+            ) and body:
+                # Stage output was regenerated before the old email went out.
+                delivery.subject, delivery.body, delivery.html_body = subject, body, html_body
+                delivery.save(update_fields=["subject", "body", "html_body", "updated_at"])
+            if delivery.status in (
+                NotificationDelivery.Status.PENDING,
+                NotificationDelivery.Status.RETRYING,
+            ):
+                enqueue_task(send_delivery, delivery.id)
+    except Exception as exc:
+        logger.error(
+            "Failed to queue NotificationDelivery [%s] for recording %s: %s",
+            kind, recording.id, exc,
+        )
+        return None
+    return delivery
+
+
+@shared_task
+def relay_outbox():
+    total = 0
+    while True:
+        sent = relay_messages()
+        total += sent
+        if sent < RELAY_BATCH_SIZE:
+            break
+    purged = purge_dispatched()
+    if total or purged:
+        logger.info("relay_outbox: dispatched %d message(s), purged %d", total, purged)
+
+
+def _schedule_digests(collect):
+    with transaction.atomic():
+        digests = collect()
+        for digest in digests:
+            enqueue_task(send_digest, digest.id)
+    return digests
+
+
+@shared_task
+def schedule_recording_digests():
+    digests = _schedule_digests(collect_recording_digests)
+    if digests:
+        logger.info("schedule_recording_digests: queued %d digest(s)", len(digests))
+
+
+@shared_task
+def schedule_daily_digests():
+    digests = _schedule_digests(collect_daily_digests)
+    logger.info("schedule_daily_digests: queued %d digest(s)", len(digests))
+
+
 @shared_task
 def sweep_stuck_deliveries():
     cutoff = timezone.now() - timedelta(minutes=10)
@@ -110,6 +319,20 @@ def sweep_stuck_deliveries():
     else:
         logger.debug("sweep_stuck_deliveries: no stuck deliveries found")
 
+    digest_ids = list(
+        NotificationDigest.objects.filter(
+            status__in=[
+                NotificationDigest.Status.PENDING,
+                NotificationDigest.Status.RETRYING,
+            ],
+            updated_at__lt=cutoff,
+        ).values_list("id", flat=True)
+    )
+    for digest_id in digest_ids:
+        send_digest.delay(digest_id)
+    if digest_ids:
+        logger.info("sweep_stuck_deliveries: re-queued %d stuck digest(s): %s", len(digest_ids), digest_ids)
+
 
 @shared_task(bind=True, max_retries=20, default_retry_delay=10)
 def poll_transcription_until_done(self, recording_id: int):
@@ -129,6 +352,7 @@ def poll_transcription_until_done(self, recording_id: int):
         rec.error_stage = "transcription"
         rec.error_message = "No transcription_job_id set — submit step may have failed."
         rec.save(update_fields=["status", "error_stage", "error_message"])
+        finish_stage(rec, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.FAILED)
         return
 
     # BUG 6 fix: update status to TRANSCRIBING now that we are actively polling
@@ -148,6 +372,7 @@ def poll_transcription_until_done(self, recording_id: int):
         rec.error_stage = "transcription"
         rec.error_message = str(exc)
         rec.save(update_fields=["status", "error_stage", "error_message"])
+        finish_stage(rec, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.FAILED)
         return
 
     st = data.get("status")
@@ -156,6 +381,8 @@ def poll_transcription_until_done(self, recording_id: int):
         raise self.retry()
 
     if st == "completed":
+        # GET /transcript/ may have stored it first; its audio is counted once.
+        first_time = rec.transcript_json is None
         rec.transcript_json = data
         rec.transcript = (
             format_speaker_transcript(data) or (data.get("text") or "").strip()
@@ -169,9 +396,25 @@ def poll_transcription_until_done(self, recording_id: int):
                 rec.language = "auto"
         else:
             rec.language = "auto"
-        rec.save(update_fields=["transcript_json", "transcript", "status", "language"])
-
-        run_langgraph_pipeline.delay(rec.id)
+        with transaction.atomic():
+            rec.save(update_fields=["transcript_json", "transcript", "status", "language"])
+            finish_stage(rec, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.SUCCEEDED)
+            if first_time:
+                record_usage(rec.org_id, audio_seconds=round(data.get("audio_duration") or 0))
+            try:
+                check_pipeline_quota(rec.org)
+            except QuotaExceeded as exc:
+                logger.warning(
+                    "poll_transcription_until_done [recording %s]: not starting pipeline — %s",
+                    recording_id, exc,
+                )
+                rec.status = CallRecording.Status.FAILED
+                rec.error_stage = "quota"
+                rec.error_message = str(exc)
+                rec.save(update_fields=["status", "error_stage", "error_message"])
+                return
+            lane = PipelineJob.Lane.BULK if rec.bulk_job_id else PipelineJob.Lane.NORMAL
+            schedule_pipeline(rec, lane=lane)
         return
 
     # unexpected status from provider
@@ -179,60 +422,182 @@ def poll_transcription_until_done(self, recording_id: int):
     rec.error_stage = "transcription"
     rec.error_message = str(data)
     rec.save(update_fields=["status", "error_stage", "error_message"])
+    finish_stage(rec, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.FAILED)
+
+
+@shared_task
+def admit_pipeline_jobs():
+    admit_jobs()
+
+
+@shared_task
+def advance_bulk_job(job_id: int):
+    bulk.advance(job_id)
 
 
 @shared_task
-def run_langgraph_pipeline(recording_id: int):
+def advance_bulk_jobs():
+    """Beat: one batch for every active bulk job."""
+    job_ids = list(
+        BulkJob.objects.filter(
+            state__in=[BulkJob.State.PENDING, BulkJob.State.RUNNING]
+        ).values_list("id", flat=True)
+    )
+    for job_id in job_ids:
+        bulk.advance(job_id)
+
+
+# Statuses only held while a pipeline stage is running.
+_IN_STAGE = [
+    CallRecording.Status.ANALYZING,
+    CallRecording.Status.GENERATING_FEEDBACK,
+    CallRecording.Status.GENERATING_FOLLOWUP,
+]
+
+
+@shared_task
+def resume_stuck_pipelines():
+    """
+    Beat: finish pipeline jobs whose worker died, and re-queue their runs.
+
+    Running jobs admitted before lost_cutoff() are moved to FINISHED first, so
+    they stop blocking the recording. If the recording never left
+    `transcribed`, the worker was lost before the first stage and the run is
+    re-queued. A recording is stuck mid-stage when it sits in a stage status
+    with no live job and no stage started for PIPELINE_STUCK_AFTER; its re-run
+    picks up at the stage that was interrupted. Anything else (e.g. lost after
+    the final save) only needed its job finished.
+    """
+    now = timezone.now()
+    lost = expire_lost_jobs()
+    live_job = PipelineJob.objects.filter(
+        Q(state=PipelineJob.State.QUEUED)
+        | Q(state=PipelineJob.State.RUNNING, admitted_at__gte=lost_cutoff()),
+        recording=OuterRef("pk"),
+    )
+    recent_stage = StageEvent.objects.filter(
+        recording=OuterRef("pk"), started_at__gte=now - settings.PIPELINE_STUCK_AFTER
+    )
+    ids = list(
+        CallRecording.objects
+        .annotate(recently_started=Exists(recent_stage))
+        .filter(
+            Q(status__in=_IN_STAGE, recently_started=False)
+            | Q(id__in=lost, status=CallRecording.Status.TRANSCRIBED)
+        )
+        .filter(~Exists(live_job))
+        .values_list("id", flat=True)
+    )
+    if lost:
+        logger.info("resume_stuck_pipelines: finished %d lost pipeline job(s)", len(lost))
+    if not ids:
+        logger.debug("resume_stuck_pipelines: no stuck pipelines found")
+        return
+    with transaction.atomic():
+        schedule_pipelines(ids, lane=PipelineJob.Lane.NORMAL)
+    logger.info("resume_stuck_pipelines: re-queued %d stuck pipeline(s): %s", len(ids), ids)
+
+
+@shared_task
+def refresh_dashboard_rollups():
+    """Beat: bring the org dashboard rollups up to date (see dashboard.py)."""
+    written = dashboard.refresh_rollups()
+    logger.debug("refresh_dashboard_rollups: wrote %d rollup row(s)", written)
+
+
+def backoff_delay(retries: int) -> float:
+    """Exponential backoff with jitter: half the step fixed, half random."""
+    step = min(settings.PIPELINE_RETRY_MAX_DELAY, settings.PIPELINE_RETRY_BASE_DELAY * 2 ** retries)
+    return step / 2 + random.uniform(0, step / 2)
+
+
+@shared_task(bind=True, max_retries=None)
+def run_langgraph_pipeline(self, recording_id: int, deferrals: int = 0):
+    # Started by the scheduler. The slot is held across retries and given back
+    # when the run ends, however it ends.
+    retrying = False
+    try:
+        can_retry = self.request.retries - deferrals < settings.PIPELINE_MAX_RETRIES
+        _run_pipeline(recording_id, retry_transient=can_retry)
+    except AIServiceUnavailable as exc:
+        # The AI service is shedding load: wait it out without using up a retry.
+        retrying = True
+        touch_pipeline_job(recording_id)
+        raise self.retry(
+            exc=exc,
+            kwargs={"deferrals": deferrals + 1},
+            countdown=exc.retry_after + random.uniform(0, settings.AI_CIRCUIT_COOLDOWN),
+        )
+    except AIServiceError as exc:
+        # Only transient errors get here, and only while retries remain. Stages
+        # are idempotent, so the retry resumes at the stage that failed.
+        retrying = True
+        touch_pipeline_job(recording_id)
+        raise self.retry(exc=exc, countdown=backoff_delay(self.request.retries))
+    finally:
+        if not retrying:
+            release_pipeline_job(recording_id)
+
+
+def _propagates(exc: Exception, retry_transient: bool) -> bool:
+    """Whether a stage error goes up to the task to defer or retry the run."""
+    if isinstance(exc, AIServiceUnavailable):
+        return True
+    return retry_transient and isinstance(exc, AIServiceError) and exc.transient
+
+
+def _note_retry(rec, stage: str, exc: Exception):
+    logger.warning(
+        "run_langgraph_pipeline [recording %s]: %s failed transiently, will retry — %s",
+        rec.id, stage, exc,
+    )
+    rec.error_stage = stage
+    rec.error_message = f"{exc} (retrying)"
+    rec.save(update_fields=["error_stage", "error_message"])
+
+
+def _run_pipeline(recording_id: int, retry_transient: bool = False):
+    """
+    AIServiceUnavailable always propagates, for the task to defer the run.
+    With retry_transient, so do transient AI service errors, for the task to
+    retry it; otherwise they fail the stage.
+    """
     try:
         rec = CallRecording.objects.get(id=recording_id)
     except CallRecording.DoesNotExist:
         logger.warning("Recording %s not found, skipping task", recording_id)
         return
 
+    # Each stage runs only if its output is missing or stale (versioning.py).
+    versions = stage_versions()
+    extract = False
+
     # -------- ANALYZE (idempotent) --------
-    if not rec.analysis_json:
+    if not is_current(rec, StageEvent.Stage.ANALYZE, versions):
         try:
-            rec.status = CallRecording.Status.ANALYZING
-            rec.save(update_fields=["status"])
-
-            out = analyze_via_ai_service(
-                transcript=rec.transcript,
-                language=rec.language,
-                deal_title=rec.deal_title,
-                recording_id=rec.id,
-            )
+            with track_stage(rec, StageEvent.Stage.ANALYZE):
+                rec.status = CallRecording.Status.ANALYZING
+                rec.save(update_fields=["status"])
+
+                out = analyze_via_ai_service(
+                    transcript=rec.transcript,
+                    language=rec.language,
+                    deal_title=rec.deal_title,
+                    recording_id=rec.id,
+                )
 
-            rec.analysis_json = out.get("analysis_json") or out
-            rec.status = CallRecording.Status.ANALYZED
-            rec.save(update_fields=["analysis_json", "status"])
-
-            if rec.salesperson_email:
-                delivery = None
-                try:
-                    delivery, _ = NotificationDelivery.objects.get_or_create(
-                        recording=rec,
-                        kind=NotificationDelivery.Kind.ANALYSIS,
-                        defaults={
-                            "channel": NotificationDelivery.Channel.EMAIL,
-                            "salesperson_email": rec.salesperson_email,
-                            "status": NotificationDelivery.Status.PENDING,
-                        },
-                    )
-                except Exception as notify_exc:
-                    logger.error(
-                        "Failed to create NotificationDelivery for recording %s: %s",
-                        rec.id, notify_exc,
-                    )
-                if delivery is not None:
-                    try:
-                        send_delivery.delay(delivery.id)
-                    except Exception as notify_exc:
-                        logger.error(
-                            "Failed to enqueue send_delivery for delivery %s (recording %s): %s",
-                            delivery.id, rec.id, notify_exc,
-                        )
+                rec.analysis_json = out.get("analysis_json") or out
+                rec.status = CallRecording.Status.ANALYZED
+                stamp(rec, StageEvent.Stage.ANALYZE, out, versions)
+                with transaction.atomic():
+                    rec.save(update_fields=["analysis_json", "stage_versions", "status"])
+                    queue_notification(rec, NotificationDelivery.Kind.ANALYSIS)
+                extract = True
 
         except Exception as e:
+            if _propagates(e, retry_transient):
+                _note_retry(rec, "analyze", e)
+                raise
             rec.status = CallRecording.Status.FAILED
             rec.error_stage = "analyze"
             rec.error_message = str(e)
@@ -240,50 +605,32 @@ def run_langgraph_pipeline(recording_id: int):
             return
 
     # -------- FEEDBACK (idempotent, failure doesn't stop followup) --------
-    if not rec.feedback_json:
+    if not is_current(rec, StageEvent.Stage.FEEDBACK, versions):
         try:
-            rec.status = CallRecording.Status.GENERATING_FEEDBACK
-            rec.save(update_fields=["status"])
-
-            out = feedback_via_ai_service(
-                transcript=rec.transcript,
-                analysis_json=rec.analysis_json,
-                language=rec.language,
-                deal_title=rec.deal_title,
-                recording_id=rec.id,
-            )
+            with track_stage(rec, StageEvent.Stage.FEEDBACK):
+                rec.status = CallRecording.Status.GENERATING_FEEDBACK
+                rec.save(update_fields=["status"])
+
+                out = feedback_via_ai_service(
+                    transcript=rec.transcript,
+                    analysis_json=rec.analysis_json,
+                    language=rec.language,
+                    deal_title=rec.deal_title,
+                    recording_id=rec.id,
+                )
 
-            rec.feedback_json = out.get("feedback_json") or out
-            rec.status = CallRecording.Status.FEEDBACK_READY
-            rec.save(update_fields=["feedback_json", "status"])
-
-            if rec.salesperson_email:
-                delivery = None
-                try:
-                    delivery, _ = NotificationDelivery.objects.get_or_create(
-                        recording=rec,
-                        kind=NotificationDelivery.Kind.FEEDBACK,
-                        defaults={
-                            "channel": NotificationDelivery.Channel.EMAIL,
-                            "salesperson_email": rec.salesperson_email,
-                            "status": NotificationDelivery.Status.PENDING,
-                        },
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to create NotificationDelivery for recording %s: %s",
-                        rec.id, e,
-                    )
-                if delivery is not None:
-                    try:
-                        send_delivery.delay(delivery.id)
-                    except Exception as e:
-                        logger.error(
-                            "Failed to enqueue send_delivery for delivery %s (recording %s): %s",
-                            delivery.id, rec.id, e,
-                        )
+                rec.feedback_json = out.get("feedback_json") or out
+                rec.status = CallRecording.Status.FEEDBACK_READY
+                stamp(rec, StageEvent.Stage.FEEDBACK, out, versions)
+                with transaction.atomic():
+                    rec.save(update_fields=["feedback_json", "stage_versions", "status"])
+                    queue_notification(rec, NotificationDelivery.Kind.FEEDBACK)
+                extract = True
 
         except Exception as e:
+            if _propagates(e, retry_transient):
+                _note_retry(rec, "feedback", e)
+                raise
             logger.error(
                 "run_langgraph_pipeline [recording %s]: feedback failed — %s",
                 recording_id, e,
@@ -292,51 +639,42 @@ def run_langgraph_pipeline(recording_id: int):
             rec.error_message = str(e)
             rec.save(update_fields=["error_stage", "error_message"])
 
-    # -------- FOLLOWUP (idempotent) --------
-    if not rec.followup_json:
+    # -------- INSIGHTS (typed columns from analysis + feedback) --------
+    if extract:
         try:
-            rec.status = CallRecording.Status.GENERATING_FOLLOWUP
-            rec.save(update_fields=["status"])
-
-            out = generate_followup_via_ai_service(
-                recording_id=rec.id,
-                transcript=rec.transcript,
-                deal_title=rec.deal_title,
-                analysis_json=rec.analysis_json,
-                language=rec.language,
+            save_insights(rec)
+        except Exception as e:
+            logger.error(
+                "run_langgraph_pipeline [recording %s]: insights extraction failed — %s",
+                recording_id, e,
             )
 
-            rec.followup_json = out.get("followup_json") or out
-            rec.status = CallRecording.Status.FOLLOWUP_READY
-            rec.save(update_fields=["followup_json", "status"])
+    # -------- FOLLOWUP (idempotent) --------
+    if not is_current(rec, StageEvent.Stage.FOLLOWUP, versions):
+        try:
+            with track_stage(rec, StageEvent.Stage.FOLLOWUP):
+                rec.status = CallRecording.Status.GENERATING_FOLLOWUP
+                rec.save(update_fields=["status"])
+
+                out = generate_followup_via_ai_service(
+                    recording_id=rec.id,
+                    transcript=rec.transcript,
+                    deal_title=rec.deal_title,
+                    analysis_json=rec.analysis_json,
+                    language=rec.language,
+                )
 
-            if rec.salesperson_email:
-                delivery = None
-                try:
-                    delivery, _ = NotificationDelivery.objects.get_or_create(
-                        recording=rec,
-                        kind=NotificationDelivery.Kind.FOLLOWUP,
-                        defaults={
-                            "channel": NotificationDelivery.Channel.EMAIL,
-                            "salesperson_email": rec.salesperson_email,
-                            "status": NotificationDelivery.Status.PENDING,
-                        },
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to create NotificationDelivery for recording %s: %s",
-                        rec.id, e,
-                    )
-                if delivery is not None:
-                    try:
-                        send_delivery.delay(delivery.id)
-                    except Exception as e:
-                        logger.error(
-                            "Failed to enqueue send_delivery for delivery %s (recording %s): %s",
-                            delivery.id, rec.id, e,
-                        )
+                rec.followup_json = out.get("followup_json") or out
+                rec.status = CallRecording.Status.FOLLOWUP_READY
+                stamp(rec, StageEvent.Stage.FOLLOWUP, out, versions)
+                with transaction.atomic():
+                    rec.save(update_fields=["followup_json", "stage_versions", "status"])
+                    queue_notification(rec, NotificationDelivery.Kind.FOLLOWUP)
 
         except Exception as e:
+            if _propagates(e, retry_transient):
+                _note_retry(rec, "followup", e)
+                raise
             rec.status = CallRecording.Status.FAILED
             rec.error_stage = "followup"
             rec.error_message = str(e)
@@ -344,4 +682,5 @@ def run_langgraph_pipeline(recording_id: int):
             return
 
     rec.status = CallRecording.Status.DONE
-    rec.save(update_fields=["status"])
+    rec.completed_at = rec.completed_at or timezone.now()
+    rec.save(update_fields=["status", "completed_at"])
@@ -0,0 +1,328 @@
+"""
+Query-count and memory budgets for the hottest endpoints and tasks.
+
+These fail when a change adds queries (typically an N+1) or makes serialization
+allocate much more. If a change legitimately needs another query, update the
+budget in the same commit and say why.
+"""
+
+import tracemalloc
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from services.accounts.authentication import get_cached_user
+from services.accounts.models import Organization, OrganizationUsage, User
+from services.accounts.usage import today
+from . import dashboard, export
+from .filters import filter_recordings
+from .models import CallRecording, NotificationDelivery
+from .tasks import (
+    poll_transcription_until_done,
+    run_langgraph_pipeline,
+    send_delivery,
+    sweep_stuck_deliveries,
+)
+
+ANALYSIS = {"analysis_text": "Buyer needs renewals tracked before Q3."}
+FEEDBACK = {"strengths": ["Good discovery"], "improvements": ["Confirm budget"]}
+FOLLOWUP = {"message": "Thanks for the call — next steps attached."}
+
+
+def large_transcript_json(utterances: int = 2000, words_per_utterance: int = 20) -> dict:
+    """AssemblyAI-shaped payload: utterances with word-level timings (~1 hour call)."""
+    items = []
+    for i in range(utterances):
+        words = [
+            {"text": f"word{j}", "start": i * 1000 + j * 40, "end": i * 1000 + j * 40 + 35,
+             "confidence": 0.93, "speaker": "A" if i % 2 else "B"}
+            for j in range(words_per_utterance)
+        ]
+        items.append({
+            "speaker": "A" if i % 2 else "B",
+            "text": " ".join(w["text"] for w in words),
+            "start": i * 1000,
+            "end": i * 1000 + 900,
+            "confidence": 0.93,
+            "words": words,
+        })
+    return {
+        "id": "job",
+        "status": "completed",
+        "text": " ".join(u["text"] for u in items),
+        "utterances": items,
+        "words": [w for u in items for w in u["words"]],
+    }
+
+
+class PerformanceTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Perf Org")
+        self.user = User.objects.create_user(
+            email="rep@example.com", password="testpass123", org=self.org
+        )
+        self.client = APIClient()
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        # Budgets are for the steady state: authentication served from cache and
+        # today's usage row already there (counters cost a single UPDATE).
+        get_cached_user(self.user.id)
+        OrganizationUsage.objects.create(org=self.org, date=today())
+
+    def _recording(self, **fields):
+        defaults = {
+            "org": self.org,
+            "uploaded_by": self.user,
+            "audio_file": "test/dummy.mp3",
+            "deal_title": "Deal",
+            "salesperson_email": "rep@example.com",
+            "transcript": "Speaker A: hello",
+            "transcription_job_id": "job",
+        }
+        return CallRecording.objects.create(**{**defaults, **fields})
+
+
+class EndpointQueryBudgetTestCase(PerformanceTestCase):
+    # ------------------------------------------------------------------
+    # List / detail
+    # ------------------------------------------------------------------
+
+    def test_list_query_count_does_not_grow_with_page(self):
+        self._recording()
+        with self.assertNumQueries(1):
+            self.client.get("/api/recordings/")
+
+        for _ in range(10):
+            self._recording()
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/recordings/")
+        self.assertEqual(len(response.data), 11)
+
+    def test_detail(self):
+        recording = self._recording()
+        with self.assertNumQueries(1):
+            self.client.get(f"/api/recordings/{recording.id}/")
+
+    # ------------------------------------------------------------------
+    # Pipeline actions
+    # ------------------------------------------------------------------
+
+    def test_transcript_when_ready(self):
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBED)
+        with self.assertNumQueries(1):
+            self.client.get(f"/api/recordings/{recording.id}/transcript/")
+
+    @patch("services.conversations.views.poll_transcription")
+    def test_transcript_completing(self, mock_poll):
+        mock_poll.return_value = {"status": "completed", "text": "hello there"}
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBING)
+        with self.assertNumQueries(3):
+            self.client.get(f"/api/recordings/{recording.id}/transcript/")
+
+    @patch("services.conversations.views.analyze_via_ai_service", return_value={"analysis_json": ANALYSIS})
+    def test_analyze(self, _):
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBED)
+        with self.assertNumQueries(18):
+            self.client.post(f"/api/recordings/{recording.id}/analyze/")
+
+    @patch("services.conversations.views.feedback_via_ai_service", return_value={"feedback_json": FEEDBACK})
+    def test_feedback(self, _):
+        recording = self._recording(status=CallRecording.Status.ANALYZED, analysis_json=ANALYSIS)
+        with self.assertNumQueries(18):
+            self.client.post(f"/api/recordings/{recording.id}/feedback/")
+
+    @patch("services.conversations.views.generate_followup_via_ai_service", return_value={"followup_json": FOLLOWUP})
+    def test_followup(self, _):
+        recording = self._recording(
+            status=CallRecording.Status.FEEDBACK_READY, analysis_json=ANALYSIS, feedback_json=FEEDBACK
+        )
+        with self.assertNumQueries(17):
+            self.client.post(f"/api/recordings/{recording.id}/followup/")
+
+    @patch("services.conversations.views.generate_followup_via_ai_service", return_value={"followup_json": FOLLOWUP})
+    def test_regenerate_followup(self, _):
+        recording = self._recording(
+            status=CallRecording.Status.DONE,
+            analysis_json=ANALYSIS,
+            feedback_json=FEEDBACK,
+            followup_json=FOLLOWUP,
+        )
+        with self.assertNumQueries(6):
+            self.client.post(f"/api/recordings/{recording.id}/regenerate_followup/")
+
+    # ------------------------------------------------------------------
+    # Dashboard
+    # ------------------------------------------------------------------
+
+    def test_dashboard_query_count_does_not_grow_with_recordings(self):
+        self.user.is_staff = True
+        self.user.save()
+        get_cached_user(self.user.id)
+        for i in range(10):
+            self._recording(salesperson_email=f"rep{i}@example.com", status=CallRecording.Status.DONE)
+        dashboard.rebuild_all()
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/recordings/dashboard/")
+        self.assertEqual(response.data["recordings"], 10)
+
+    def test_export_is_one_query_however_many_chunks(self):
+        for _ in range(5):
+            self._recording()
+        with self.assertNumQueries(1):
+            chunks = list(export.export_rows(CallRecording.objects.all(), chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+
+    def test_transcript_download(self):
+        recording = self._recording(transcript_json=large_transcript_json(utterances=20))
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/recordings/{recording.id}/transcript/download/?as=srt")
+            body = b"".join(response.streaming_content)
+        self.assertEqual(body.count(b" --> "), 20)
+
+
+class RecordingListIndexTestCase(PerformanceTestCase):
+    # Every accepted filter / ordering of the recordings list must be served by
+    # an index, never a full scan of the table.
+    PARAMS = [
+        {},
+        {"ordering": "created_at"},
+        {"ordering": "-deal_title"},
+        {"status": "done,failed"},
+        {"language": "he"},
+        {"salesperson_email": "rep@example.com"},
+        {"error_stage": "analyze"},
+        {"created_after": "2026-01-01T00:00:00Z", "created_before": "2026-02-01T00:00:00Z"},
+        {"status": "done", "created_after": "2026-01-01T00:00:00Z", "ordering": "created_at"},
+    ]
+
+    def _plan(self, params) -> str:
+        request = RequestFactory().get("/", params)
+        qs = filter_recordings(CallRecording.objects.filter(org=self.org), request.GET)
+        sql, sql_params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", sql_params)
+            return "\n".join(row[-1] for row in cursor.fetchall())
+
+    def test_filters_and_orderings_use_an_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("query plan assertions are written for SQLite")
+        table = CallRecording._meta.db_table
+        for params in self.PARAMS:
+            with self.subTest(params=params):
+                plan = self._plan(params)
+                self.assertIn("USING INDEX recording_org_", plan)
+                self.assertNotRegex(plan, rf"SCAN {table}(?! USING)")
+                self.assertNotIn("TEMP B-TREE", plan)
+
+
+class DashboardRebuildIndexTestCase(PerformanceTestCase):
+    # The beat refresh rebuilds recent days for every org, so its aggregation
+    # can't lean on the org-leading indexes; it must still not scan the table.
+    def test_recent_days_rebuild_uses_an_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("query plan assertions are written for SQLite")
+        table = CallRecording._meta.db_table
+        today = timezone.now().date()
+        with CaptureQueriesContext(connection) as queries:
+            dashboard.rebuild(today - timedelta(days=1), today)
+        sql = next(q["sql"] for q in queries if q["sql"].startswith("SELECT") and f'FROM "{table}"' in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plan = "\n".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("USING INDEX recording_created_idx", plan)
+        self.assertNotRegex(plan, rf"SCAN {table}(?! USING)")
+
+
+class TaskQueryBudgetTestCase(PerformanceTestCase):
+    @patch("services.conversations.tasks.poll_transcription")
+    def test_poll_completion(self, mock_poll):
+        mock_poll.return_value = {"status": "completed", "text": "hello there"}
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBING)
+        with self.assertNumQueries(8):
+            poll_transcription_until_done.apply(args=[recording.id])
+
+    @patch("services.conversations.tasks.stage_versions", return_value={})
+    @patch("services.conversations.tasks.generate_followup_via_ai_service", return_value={"followup_json": FOLLOWUP})
+    @patch("services.conversations.tasks.feedback_via_ai_service", return_value={"feedback_json": FEEDBACK})
+    @patch("services.conversations.tasks.analyze_via_ai_service", return_value={"analysis_json": ANALYSIS})
+    def test_full_pipeline(self, *_):
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBED)
+        with self.assertNumQueries(53):
+            run_langgraph_pipeline.apply(args=[recording.id])
+        recording.refresh_from_db()
+        self.assertEqual(recording.status, CallRecording.Status.DONE)
+
+    def test_send_delivery(self):
+        recording = self._recording(analysis_json=ANALYSIS)
+        delivery = NotificationDelivery.objects.create(
+            recording=recording,
+            kind=NotificationDelivery.Kind.ANALYSIS,
+            salesperson_email="rep@example.com",
+            subject="s",
+            body="b",
+        )
+        with self.assertNumQueries(5):
+            send_delivery.apply(args=[delivery.id])
+
+    @patch("services.conversations.tasks.send_delivery.delay")
+    @patch("services.conversations.tasks.send_digest.delay")
+    def test_sweeper_query_count_does_not_grow_with_stuck_rows(self, *_):
+        recording = self._recording()
+        old = timezone.now() - timedelta(hours=1)
+        for kind in NotificationDelivery.Kind.values:
+            NotificationDelivery.objects.create(
+                recording=recording, kind=kind, salesperson_email="rep@example.com"
+            )
+        NotificationDelivery.objects.update(updated_at=old)
+        with self.assertNumQueries(2):
+            sweep_stuck_deliveries()
+
+
+class SerializationMemoryTestCase(PerformanceTestCase):
+    # Each recording carries a ~1 hour AssemblyAI payload (2k utterances, 40k words,
+    # ~35 MB once decoded). The API never returns transcript_json, so neither
+    # serializing nor listing may decode or copy it.
+    SERIALIZE_CEILING = 256 * 1024
+    LIST_CEILING = 1024 * 1024
+    # Request handling plus one fetch of utterances; the payload is never decoded.
+    STREAM_CEILING = 512 * 1024
+
+    def _peak(self, fn) -> int:
+        tracemalloc.start()
+        try:
+            fn()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_serializing_large_transcript_json_stays_under_ceiling(self):
+        recording = self._recording(transcript_json=large_transcript_json())
+        url = f"/api/recordings/{recording.id}/"
+        self.client.get(url)  # warm up: first-request imports and URL resolving
+        # Traced from the fetch on, so loading transcript_json would count too.
+        peak = self._peak(lambda: self.client.get(url))
+        self.assertLess(peak, self.SERIALIZE_CEILING)
+
+    def test_list_of_large_recordings_stays_under_ceiling(self):
+        payload = large_transcript_json()
+        for _ in range(5):
+            self._recording(transcript_json=payload)
+        del payload
+        peak = self._peak(lambda: self.client.get("/api/recordings/"))
+        self.assertLess(peak, self.LIST_CEILING)
+
+    def test_streaming_a_large_transcript_stays_under_ceiling(self):
+        recording = self._recording(transcript_json=large_transcript_json())
+
+        def download():
+            response = self.client.get(f"/api/recordings/{recording.id}/transcript/download/?as=vtt")
+            for _ in response.streaming_content:
+                pass
+
+        self.assertLess(self._peak(download), self.STREAM_CEILING)
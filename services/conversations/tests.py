@@ -1,12 +1,61 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
 from datetime import timedelta
 from unittest.mock import patch
 
-from django.test import TestCase
+import requests
+from celery.exceptions import Retry
+from django.core import mail
+from django.core.management import call_command
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, modify_settings, override_settings
 from django.utils import timezone
 
-from services.accounts.models import Organization, User
-from .models import CallRecording, NotificationDelivery
-from .tasks import sweep_stuck_deliveries
+from prometheus_client import REGISTRY
+
+from core import tracing
+from services.accounts.models import DeliveryMode, Organization, OrganizationUsage, User
+from .models import (
+    BulkJob,
+    CallRecording,
+    NotificationDelivery,
+    NotificationDigest,
+    OutboxMessage,
+    PipelineJob,
+    RecordingInsights,
+    RecordingRollup,
+    StageEvent,
+)
+from . import ai_client, bulk, circuit, dashboard, export, insights
+from .ai_client import (
+    AIServiceError,
+    AIServiceUnavailable,
+    analyze_via_ai_service,
+    feedback_via_ai_service,
+    generate_followup_via_ai_service,
+)
+from .outbox import enqueue_task, relay_messages
+from .scheduler import admit_jobs, plan_admissions, schedule_pipeline
+from .timeline import stage_latency_percentiles, track_stage
+from .versioning import input_hash, is_current
+from .tasks import (
+    poll_transcription_until_done,
+    queue_notification,
+    refresh_dashboard_rollups,
+    resume_stuck_pipelines,
+    run_langgraph_pipeline,
+    schedule_daily_digests,
+    schedule_recording_digests,
+    send_delivery,
+    send_digest,
+    sweep_stuck_deliveries,
+)
 
 
 class SweepStuckDeliveriesTestCase(TestCase):
@@ -79,3 +128,1564 @@ class SweepStuckDeliveriesTestCase(TestCase):
         with patch("services.conversations.tasks.send_delivery.delay") as mock_delay:
             sweep_stuck_deliveries()
         mock_delay.assert_not_called()
+
+
+class OutboxTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        self.recording = CallRecording.objects.create(
+            org=self.org,
+            audio_file="test/dummy.mp3",
+            salesperson_email="rep@example.com",
+            analysis_json={"analysis_text": "Strong buying signals."},
+        )
+
+    # ------------------------------------------------------------------
+    # queue_notification writes the delivery and its outbox row together
+    # ------------------------------------------------------------------
+
+    def test_queue_notification_stages_send_after_commit(self):
+        with patch("services.conversations.outbox.current_app") as mock_app:
+            with self.captureOnCommitCallbacks(execute=True):
+                delivery = queue_notification(
+                    self.recording, NotificationDelivery.Kind.ANALYSIS
+                )
+        mock_app.send_task.assert_called_once_with(send_delivery.name, args=[delivery.id])
+        msg = OutboxMessage.objects.get()
+        self.assertIsNotNone(msg.dispatched_at)
+
+    def test_queue_notification_without_email_is_noop(self):
+        self.recording.salesperson_email = ""
+        self.assertIsNone(
+            queue_notification(self.recording, NotificationDelivery.Kind.ANALYSIS)
+        )
+        self.assertFalse(NotificationDelivery.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_already_sent_delivery_is_not_restaged(self):
+        NotificationDelivery.objects.create(
+            recording=self.recording,
+            kind=NotificationDelivery.Kind.ANALYSIS,
+            salesperson_email="rep@example.com",
+            status=NotificationDelivery.Status.SENT,
+        )
+        queue_notification(self.recording, NotificationDelivery.Kind.ANALYSIS)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    # ------------------------------------------------------------------
+    # Relay
+    # ------------------------------------------------------------------
+
+    def test_broker_failure_leaves_message_pending(self):
+        msg = OutboxMessage.objects.create(task_name=send_delivery.name, args=[1])
+        with patch("services.conversations.outbox.current_app") as mock_app:
+            mock_app.send_task.side_effect = ConnectionError("broker down")
+            self.assertEqual(relay_messages(), 0)
+        msg.refresh_from_db()
+        self.assertIsNone(msg.dispatched_at)
+        self.assertEqual(msg.attempts, 1)
+        self.assertIn("broker down", msg.last_error)
+
+    def test_relay_skips_dispatched_messages(self):
+        OutboxMessage.objects.create(
+            task_name=send_delivery.name, args=[1], dispatched_at=timezone.now()
+        )
+        pending = OutboxMessage.objects.create(task_name=send_delivery.name, args=[2])
+        with patch("services.conversations.outbox.current_app") as mock_app:
+            self.assertEqual(relay_messages(), 1)
+        mock_app.send_task.assert_called_once_with(send_delivery.name, args=[2])
+        pending.refresh_from_db()
+        self.assertIsNotNone(pending.dispatched_at)
+
+
+class RenderedDeliveryTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        self.recording = CallRecording.objects.create(
+            org=self.org,
+            audio_file="test/dummy.mp3",
+            deal_title="Acme renewal",
+            salesperson_email="rep@example.com",
+            feedback_json={
+                "strengths": ["Good rapport", "Clear pricing"],
+                "spin_scores": {"situation": 4, "implication": 2},
+                "summary": "Solid call <overall>",
+            },
+        )
+
+    def test_body_is_rendered_once_when_queued(self):
+        delivery = queue_notification(self.recording, NotificationDelivery.Kind.FEEDBACK)
+        self.assertEqual(delivery.subject, "Acme renewal — Feedback")
+        self.assertIn("- Good rapport", delivery.body)
+        self.assertIn("Spin scores", delivery.body)
+        self.assertIn("Solid call <overall>", delivery.body)
+        self.assertIn("<li>Good rapport</li>", delivery.html_body)
+        self.assertIn("Solid call &lt;overall&gt;", delivery.html_body)
+
+    def test_send_reuses_stored_body(self):
+        delivery = queue_notification(self.recording, NotificationDelivery.Kind.FEEDBACK)
+        with patch("services.conversations.tasks.build_stage_email") as mock_build:
+            send_delivery(delivery.id)
+        mock_build.assert_not_called()
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.body, delivery.body)
+        self.assertEqual(message.alternatives[0], (delivery.html_body, "text/html"))
+
+    def test_missing_output_fails_delivery_without_staging_send(self):
+        delivery = queue_notification(self.recording, NotificationDelivery.Kind.ANALYSIS)
+        self.assertEqual(delivery.status, NotificationDelivery.Status.FAILED)
+        self.assertIn("analysis_text", delivery.last_error)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+
+class DigestTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(
+            name="Test Org", delivery_mode=DeliveryMode.RECORDING_DIGEST
+        )
+        self.recording = self._make_recording("Acme renewal")
+
+    def _make_recording(self, deal_title, status=CallRecording.Status.DONE):
+        return CallRecording.objects.create(
+            org=self.org,
+            audio_file="test/dummy.mp3",
+            deal_title=deal_title,
+            salesperson_email="rep@example.com",
+            status=status,
+            analysis_json={"analysis_text": "Strong buying signals."},
+            feedback_json={"score": 7},
+            followup_json={"message": "Thanks for your time"},
+        )
+
+    def _queue_all(self, recording):
+        for kind in NotificationDelivery.Kind.values:
+            queue_notification(recording, kind)
+
+    # ------------------------------------------------------------------
+    # Delivery policy
+    # ------------------------------------------------------------------
+
+    def test_digest_mode_holds_deliveries_instead_of_sending(self):
+        self._queue_all(self.recording)
+        self.assertEqual(
+            NotificationDelivery.objects.filter(status=NotificationDelivery.Status.HELD).count(),
+            3,
+        )
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_user_mode_overrides_org_mode(self):
+        User.objects.create_user(
+            email="rep@example.com",
+            password="testpass123",
+            org=self.org,
+            delivery_mode=DeliveryMode.IMMEDIATE,
+        )
+        delivery = queue_notification(self.recording, NotificationDelivery.Kind.ANALYSIS)
+        self.assertEqual(delivery.status, NotificationDelivery.Status.PENDING)
+        self.assertTrue(OutboxMessage.objects.exists())
+
+    # ------------------------------------------------------------------
+    # Per-recording digests
+    # ------------------------------------------------------------------
+
+    def test_finished_recording_is_coalesced_into_one_email(self):
+        self._queue_all(self.recording)
+        schedule_recording_digests()
+        digest = NotificationDigest.objects.get()
+        self.assertEqual(digest.deliveries.count(), 3)
+
+        send_digest(digest.id)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Acme renewal", mail.outbox[0].subject)
+        self.assertIn("Strong buying signals.", mail.outbox[0].body)
+        self.assertFalse(
+            NotificationDelivery.objects.exclude(status=NotificationDelivery.Status.SENT).exists()
+        )
+
+    def test_in_progress_recording_is_not_coalesced(self):
+        recording = self._make_recording("Still running", status=CallRecording.Status.ANALYZED)
+        queue_notification(recording, NotificationDelivery.Kind.ANALYSIS)
+        schedule_recording_digests()
+        self.assertFalse(NotificationDigest.objects.exists())
+
+    def test_stage_with_missing_output_is_dropped_from_digest(self):
+        self.recording.analysis_json = {}
+        self.recording.save(update_fields=["analysis_json"])
+        self._queue_all(self.recording)
+        schedule_recording_digests()
+        send_digest(NotificationDigest.objects.get().id)
+
+        self.assertEqual(len(mail.outbox), 1)
+        analysis = NotificationDelivery.objects.get(kind=NotificationDelivery.Kind.ANALYSIS)
+        self.assertEqual(analysis.status, NotificationDelivery.Status.FAILED)
+
+    # ------------------------------------------------------------------
+    # Daily digests
+    # ------------------------------------------------------------------
+
+    def test_daily_digest_covers_all_recordings_for_recipient(self):
+        self.org.delivery_mode = DeliveryMode.DAILY_DIGEST
+        self.org.save(update_fields=["delivery_mode"])
+        second = self._make_recording("Globex intro")
+        self._queue_all(self.recording)
+        self._queue_all(second)
+
+        schedule_recording_digests()
+        self.assertFalse(NotificationDigest.objects.exists())
+
+        schedule_daily_digests()
+        digest = NotificationDigest.objects.get()
+        send_digest(digest.id)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("2 recording(s)", mail.outbox[0].subject)
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+
+    def _transitions(self, status):
+        return REGISTRY.get_sample_value(
+            "qcloser_recording_status_transitions_total",
+            {"status": status, "org": str(self.org.id)},
+        ) or 0
+
+    def test_status_changes_are_counted(self):
+        before = self._transitions(CallRecording.Status.ANALYZING)
+        recording = CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3")
+        recording.status = CallRecording.Status.ANALYZING
+        recording.save(update_fields=["status"])
+        recording.save(update_fields=["error_message"])
+        self.assertEqual(self._transitions(CallRecording.Status.ANALYZING), before + 1)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_metrics_endpoint_serves_prometheus_text_to_token_holders(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"qcloser_pipeline_stage_seconds", response.content)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_metrics_endpoint_is_closed_without_a_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    @modify_settings(MIDDLEWARE={"prepend": "core.metrics.QueryCountMiddleware"})
+    def test_query_count_header(self):
+        user = User.objects.create_user(email="rep@example.com", password="x", org=self.org)
+        CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3")
+        self.client.force_login(user)
+        response = self.client.get("/api/recordings/")
+        self.assertGreater(int(response["X-DB-Queries"]), 0)
+
+    @override_settings(ASSEMBLYAI_API_KEY="", MEDIA_ROOT=tempfile.mkdtemp())
+    def test_upload_without_assemblyai_key_fails_the_recording(self):
+        user = User.objects.create_user(email="rep@example.com", password="x", org=self.org)
+        self.client.force_login(user)
+        response = self.client.post(
+            "/api/recordings/",
+            {"audio_file": SimpleUploadedFile("call.wav", b"RIFF", content_type="audio/wav")},
+        )
+        self.assertEqual(response.status_code, 201)
+        recording = CallRecording.objects.get(id=response.data["id"])
+        self.assertEqual(recording.status, CallRecording.Status.FAILED)
+        self.assertEqual(recording.error_stage, "transcription_submit")
+        self.assertIn("ASSEMBLYAI_API_KEY", recording.error_message)
+
+
+class StageTimelineTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        self.user = User.objects.create_user(
+            email="rep@example.com", password="testpass123", org=self.org
+        )
+        self.recording = CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3")
+
+    def _event(self, stage, seconds, outcome=StageEvent.Outcome.SUCCEEDED, days_ago=1):
+        started_at = timezone.now() - timedelta(days=days_ago)
+        return StageEvent.objects.create(
+            recording=self.recording,
+            org=self.org,
+            stage=stage,
+            outcome=outcome,
+            started_at=started_at,
+            finished_at=started_at + timedelta(seconds=seconds),
+        )
+
+    # ------------------------------------------------------------------
+    # track_stage
+    # ------------------------------------------------------------------
+
+    def test_track_stage_records_attempts_and_outcomes(self):
+        with self.assertRaises(RuntimeError):
+            with track_stage(self.recording, StageEvent.Stage.ANALYZE):
+                raise RuntimeError("AI service 502")
+        with track_stage(self.recording, StageEvent.Stage.ANALYZE):
+            pass
+
+        first, second = StageEvent.objects.order_by("id")
+        self.assertEqual((first.attempt, first.outcome), (1, StageEvent.Outcome.FAILED))
+        self.assertEqual((second.attempt, second.outcome), (2, StageEvent.Outcome.SUCCEEDED))
+        self.assertIsNotNone(second.finished_at)
+
+    # ------------------------------------------------------------------
+    # Percentiles
+    # ------------------------------------------------------------------
+
+    def test_percentiles_per_stage_ignore_failures_and_old_events(self):
+        for seconds in range(1, 21):
+            self._event(StageEvent.Stage.ANALYZE, seconds)
+        self._event(StageEvent.Stage.ANALYZE, 999, outcome=StageEvent.Outcome.FAILED)
+        self._event(StageEvent.Stage.ANALYZE, 999, days_ago=30)
+        self._event(StageEvent.Stage.FOLLOWUP, 5)
+
+        now = timezone.now()
+        stats = stage_latency_percentiles(self.org.id, now - timedelta(days=7), now)
+
+        self.assertEqual([row["stage"] for row in stats], ["analyze", "followup"])
+        analyze = stats[0]
+        self.assertEqual(analyze["count"], 20)
+        self.assertAlmostEqual(analyze["p50"], 10, places=1)
+        self.assertAlmostEqual(analyze["p95"], 19, places=1)
+
+    def test_stage_latency_endpoint_is_scoped_to_org(self):
+        self._event(StageEvent.Stage.FEEDBACK, 3)
+        other_org = Organization.objects.create(name="Other Org")
+        other = CallRecording.objects.create(org=other_org, audio_file="test/dummy.mp3")
+        StageEvent.objects.create(
+            recording=other,
+            org=other_org,
+            stage=StageEvent.Stage.ANALYZE,
+            outcome=StageEvent.Outcome.SUCCEEDED,
+            started_at=timezone.now() - timedelta(hours=1),
+            finished_at=timezone.now(),
+        )
+
+        self.client.force_login(self.user)
+        response = self.client.get("/api/recordings/stage-latency/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["stage"] for row in response.data["stages"]], ["feedback"])
+
+    def test_stage_latency_rejects_bad_window(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            "/api/recordings/stage-latency/",
+            {"since": "2026-05-02T00:00:00", "until": "2026-05-01T00:00:00"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TracingTestCase(TestCase):
+    def setUp(self):
+        fd, self.trace_file = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        self.addCleanup(os.remove, self.trace_file)
+        saved = tracing._exporter._settings
+        tracing.configure(exporter="file", file=self.trace_file, service="test")
+        self.addCleanup(setattr, tracing._exporter, "_settings", saved)
+
+    def _exported_spans(self):
+        tracing.flush()
+        spans = []
+        with open(self.trace_file) as f:
+            for line in f:
+                for resource in json.loads(line)["resourceSpans"]:
+                    for scope in resource["scopeSpans"]:
+                        spans.extend(scope["spans"])
+        return {s["name"]: s for s in spans}
+
+    @patch("services.conversations.ai_client.service_info", return_value={})
+    def test_ai_service_call_is_a_child_span_and_propagates_traceparent(self, _):
+        with patch("services.conversations.ai_client.requests.post") as mock_post:
+            mock_post.return_value.json.return_value = {"analysis_text": "ok"}
+            with tracing.span("pipeline") as parent:
+                analyze_via_ai_service(
+                    transcript="hi", language="en", deal_title="Deal", recording_id=7
+                )
+
+        sent = mock_post.call_args.kwargs["headers"]["traceparent"]
+        trace_id, span_id = tracing.parse_traceparent(sent)
+        self.assertEqual(trace_id, parent.trace_id)
+
+        spans = self._exported_spans()
+        client = spans["ai_service POST /analyze"]
+        self.assertEqual(client["spanId"], span_id)
+        self.assertEqual(client["parentSpanId"], parent.span_id)
+        self.assertEqual(client["kind"], tracing.CLIENT)
+        self.assertNotIn("parentSpanId", spans["pipeline"])
+
+    def test_failed_span_is_exported_with_error_status(self):
+        with self.assertRaises(RuntimeError):
+            with tracing.span("boom"):
+                raise RuntimeError("nope")
+        self.assertEqual(self._exported_spans()["boom"]["status"]["code"], 2)
+
+    def test_request_continues_incoming_trace(self):
+        incoming = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+        response = self.client.get("/metrics", HTTP_TRACEPARENT=incoming)
+        self.assertEqual(response["X-Trace-Id"], "a" * 32)
+        server = self._exported_spans()["HTTP GET /metrics"]
+        self.assertEqual(server["parentSpanId"], "b" * 16)
+
+    def test_outbox_relay_carries_staging_trace(self):
+        org = Organization.objects.create(name="Test Org")
+        recording = CallRecording.objects.create(org=org, audio_file="test/dummy.mp3")
+        delivery = NotificationDelivery.objects.create(
+            recording=recording,
+            kind=NotificationDelivery.Kind.ANALYSIS,
+            salesperson_email="rep@example.com",
+        )
+        with tracing.span("upload") as parent:
+            msg = enqueue_task(send_delivery, delivery.id)
+        self.assertEqual(msg.traceparent, parent.traceparent)
+
+        with patch("services.conversations.outbox.current_app") as mock_app:
+            relay_messages()
+        mock_app.send_task.assert_called_once_with(
+            send_delivery.name,
+            args=[delivery.id],
+            headers={"traceparent": parent.traceparent},
+        )
+
+
+class PipelineSchedulerTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name="Bulk Org")
+        self.other = Organization.objects.create(name="Live Org")
+        self.user = User.objects.create_user(
+            email="rep@example.com", password="testpass123", org=self.other
+        )
+
+    def _recording(self, org, **fields):
+        return CallRecording.objects.create(
+            org=org, audio_file="test/dummy.mp3", transcript="Speaker A: hello", **fields
+        )
+
+    # ------------------------------------------------------------------
+    # plan_admissions
+    # ------------------------------------------------------------------
+
+    def test_fresh_calls_are_admitted_ahead_of_a_bulk_backlog(self):
+        waiting = {
+            PipelineJob.Lane.NORMAL: {2: (1, 900)},
+            PipelineJob.Lane.BULK: {1: (2000, 1)},
+        }
+        orgs = {1: (1, 3), 2: (1, 3)}
+        plan = plan_admissions(free=4, waiting=waiting, running={}, orgs=orgs, bulk_free=4)
+        self.assertEqual(
+            plan, {(PipelineJob.Lane.NORMAL, 2): 1, (PipelineJob.Lane.BULK, 1): 3}
+        )
+
+    def test_slots_are_shared_by_weight_within_org_caps(self):
+        waiting = {PipelineJob.Lane.NORMAL: {1: (50, 1), 2: (50, 2), 3: (50, 3)}}
+        orgs = {1: (2, 10), 2: (1, 10), 3: (1, 1)}
+        plan = plan_admissions(free=7, waiting=waiting, running={}, orgs=orgs, bulk_free=0)
+        self.assertEqual(
+            plan,
+            {(PipelineJob.Lane.NORMAL, 1): 4, (PipelineJob.Lane.NORMAL, 2): 2,
+             (PipelineJob.Lane.NORMAL, 3): 1},
+        )
+
+    def test_bulk_lane_is_capped(self):
+        waiting = {PipelineJob.Lane.BULK: {1: (100, 1), 2: (100, 2)}}
+        orgs = {1: (1, 10), 2: (1, 10)}
+        plan = plan_admissions(free=8, waiting=waiting, running={}, orgs=orgs, bulk_free=3)
+        self.assertEqual(sum(plan.values()), 3)
+
+    def test_interactive_lane_ignores_org_cap(self):
+        waiting = {PipelineJob.Lane.INTERACTIVE: {1: (2, 5)}, PipelineJob.Lane.NORMAL: {1: (5, 1)}}
+        plan = plan_admissions(free=8, waiting=waiting, running={1: 1}, orgs={1: (1, 1)}, bulk_free=0)
+        self.assertEqual(plan, {(PipelineJob.Lane.INTERACTIVE, 1): 2})
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    @override_settings(PIPELINE_MAX_CONCURRENCY=3, PIPELINE_ORG_MAX_CONCURRENCY=2)
+    def test_admit_dispatches_within_caps(self):
+        bulk = [self._recording(self.org) for _ in range(3)]
+        live = self._recording(self.other)
+        with patch("services.conversations.scheduler.request_admission"):
+            for recording in bulk:
+                schedule_pipeline(recording, lane=PipelineJob.Lane.BULK)
+            schedule_pipeline(live)
+
+        with patch("services.conversations.outbox.current_app") as mock_app:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(admit_jobs(), 3)
+        dispatched = sorted(call.kwargs["args"][0] for call in mock_app.send_task.call_args_list)
+        self.assertEqual(dispatched, sorted([live.id, bulk[0].id, bulk[1].id]))
+        self.assertEqual(PipelineJob.objects.filter(state=PipelineJob.State.QUEUED).get().recording, bulk[2])
+        self.assertEqual(admit_jobs(), 0)
+
+    def test_scheduling_twice_keeps_one_job_and_raises_its_priority(self):
+        recording = self._recording(self.org)
+        with patch("services.conversations.scheduler.request_admission"):
+            first = schedule_pipeline(recording, lane=PipelineJob.Lane.BULK)
+            second = schedule_pipeline(recording, lane=PipelineJob.Lane.INTERACTIVE)
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(PipelineJob.objects.get().lane, PipelineJob.Lane.INTERACTIVE)
+
+    @patch("services.conversations.tasks.stage_versions", return_value={})
+    @patch("services.conversations.tasks.generate_followup_via_ai_service", return_value={"followup_json": {"m": 1}})
+    @patch("services.conversations.tasks.feedback_via_ai_service", return_value={"feedback_json": {"f": 1}})
+    @patch("services.conversations.tasks.analyze_via_ai_service", return_value={"analysis_json": {"a": 1}})
+    def test_pipeline_run_releases_its_slot(self, *_):
+        recording = self._recording(self.org)
+        job = PipelineJob.objects.create(
+            recording=recording, org=self.org,
+            state=PipelineJob.State.RUNNING, admitted_at=timezone.now(),
+        )
+        with patch("services.conversations.scheduler.request_admission") as mock_request:
+            with self.captureOnCommitCallbacks(execute=True):
+                run_langgraph_pipeline.apply(args=[recording.id])
+        job.refresh_from_db()
+        self.assertEqual(job.state, PipelineJob.State.FINISHED)
+        mock_request.assert_called_once()
+
+    # ------------------------------------------------------------------
+    # POST /api/recordings/<id>/rerun/
+    # ------------------------------------------------------------------
+
+    def test_rerun_clears_outputs_and_queues_interactive_job(self):
+        recording = self._recording(
+            self.other, status=CallRecording.Status.DONE,
+            analysis_json={"a": 1}, feedback_json={"f": 1}, followup_json={"m": 1},
+        )
+        self.client.force_login(self.user)
+        with patch("services.conversations.scheduler.request_admission"):
+            response = self.client.post(
+                f"/api/recordings/{recording.id}/rerun/",
+                {"stages": ["followup"]},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 202)
+        recording.refresh_from_db()
+        self.assertIsNone(recording.followup_json)
+        self.assertEqual(recording.analysis_json, {"a": 1})
+        self.assertEqual(PipelineJob.objects.get().lane, PipelineJob.Lane.INTERACTIVE)
+
+    def test_rerun_rejected_while_running(self):
+        recording = self._recording(self.other)
+        PipelineJob.objects.create(recording=recording, org=self.other, state=PipelineJob.State.RUNNING)
+        self.client.force_login(self.user)
+        response = self.client.post(f"/api/recordings/{recording.id}/rerun/")
+        self.assertEqual(response.status_code, 409)
+
+    def test_rerun_replaces_a_job_that_lost_its_worker(self):
+        recording = self._recording(self.other, status=CallRecording.Status.TRANSCRIBED)
+        lost = PipelineJob.objects.create(
+            recording=recording, org=self.other, state=PipelineJob.State.RUNNING,
+            admitted_at=timezone.now() - timedelta(hours=1),
+        )
+        self.client.force_login(self.user)
+        with patch("services.conversations.scheduler.request_admission"):
+            response = self.client.post(f"/api/recordings/{recording.id}/rerun/")
+        self.assertEqual(response.status_code, 202)
+        lost.refresh_from_db()
+        self.assertEqual(lost.state, PipelineJob.State.FINISHED)
+        self.assertNotEqual(response.data["job_id"], lost.id)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class BulkImportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name="New Customer")
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="testpass123", org=self.org, is_staff=True
+        )
+
+    def _job(self, count):
+        items = [bulk.ImportItem(audio=f"archive/call{i}.mp3", deal_title=f"Deal {i}") for i in range(count)]
+        return bulk.create_import_job(self.org, items)
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def test_read_manifest_csv_and_jsonl(self):
+        csv_items = bulk.read_manifest(
+            io.BytesIO(b"audio,deal_title,language\na.mp3,Acme,he\nb.mp3,,\n"),
+            "calls.csv",
+            {"salesperson_email": "rep@example.com"},
+        )
+        self.assertEqual(csv_items[0], bulk.ImportItem("a.mp3", "Acme", "rep@example.com", "", "he"))
+        self.assertEqual(csv_items[1].language, "auto")
+
+        jsonl_items = bulk.read_manifest(
+            io.BytesIO(b'{"audio": "c.mp3", "deal_title": "Globex"}\n\n'), "calls.jsonl"
+        )
+        self.assertEqual([item.deal_title for item in jsonl_items], ["Globex"])
+
+        with self.assertRaises(bulk.BulkJobError):
+            bulk.read_manifest(io.BytesIO(b"audio,language\na.mp3,fr\n"), "calls.csv")
+
+    def test_command_imports_directory(self):
+        source = tempfile.mkdtemp()
+        for name in ("b.mp3", "a.wav", "notes.txt"):
+            with open(os.path.join(source, name), "wb") as f:
+                f.write(b"RIFF")
+        with patch("services.conversations.outbox.current_app") as mock_app:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("import_recordings", "--dir", source, "--org", str(self.org.id), stdout=io.StringIO())
+
+        job = BulkJob.objects.get()
+        self.assertEqual((job.total, job.state), (2, BulkJob.State.PENDING))
+        self.assertEqual(
+            sorted(job.recordings.values_list("deal_title", flat=True)), ["a", "b"]
+        )
+        mock_app.send_task.assert_called_once_with(
+            "services.conversations.tasks.advance_bulk_job", args=[job.id]
+        )
+
+    # ------------------------------------------------------------------
+    # Advancing
+    # ------------------------------------------------------------------
+
+    @override_settings(BULK_IMPORT_BATCH_SIZE=2, BULK_IMPORT_MAX_IN_FLIGHT=10)
+    @patch("services.conversations.bulk.submit_transcription")
+    def test_advance_submits_in_batches_and_resumes(self, mock_submit):
+        job = self._job(3)
+        first = job.recordings.order_by("id").first()
+
+        def submit(recording, **kwargs):
+            if recording.id == first.id:
+                raise RuntimeError("boom")
+            return {"id": f"t{recording.id}"}
+
+        mock_submit.side_effect = submit
+
+        self.assertTrue(bulk.advance(job.id))
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.processed, job.failed), (BulkJob.State.RUNNING, 1, 1))
+        first.refresh_from_db()
+        self.assertEqual(first.status, CallRecording.Status.FAILED)
+
+        self.assertTrue(bulk.advance(job.id))
+        self.assertFalse(bulk.advance(job.id))
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.processed, job.failed), (BulkJob.State.COMPLETED, 2, 1))
+        self.assertEqual(mock_submit.call_count, 3)
+
+    @override_settings(BULK_IMPORT_BATCH_SIZE=5, BULK_IMPORT_MAX_IN_FLIGHT=2)
+    @patch("services.conversations.bulk.submit_transcription", return_value={"id": "t"})
+    def test_advance_respects_in_flight_limit(self, mock_submit):
+        job = self._job(4)
+        bulk.advance(job.id)
+        self.assertTrue(bulk.advance(job.id))
+        self.assertEqual(mock_submit.call_count, 2)
+
+    @patch("services.conversations.tasks.poll_transcription")
+    def test_imported_recording_pipeline_runs_in_bulk_lane(self, mock_poll):
+        mock_poll.return_value = {"status": "completed", "text": "hello there"}
+        recording = self._job(1).recordings.get()
+        recording.transcription_job_id = "t"
+        recording.save()
+        with patch("services.conversations.scheduler.request_admission"):
+            poll_transcription_until_done.apply(args=[recording.id])
+        self.assertEqual(PipelineJob.objects.get().lane, PipelineJob.Lane.BULK)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+
+    def test_import_api_and_cancel(self):
+        self.client.force_login(self.admin)
+        manifest = SimpleUploadedFile(
+            "calls.csv", f"audio,deal_title\nimports/{self.org.id}/a.mp3,Acme\n".encode()
+        )
+        response = self.client.post("/api/bulk-jobs/import/", {"manifest": manifest})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["id"]
+
+        response = self.client.get(f"/api/bulk-jobs/{job_id}/")
+        self.assertEqual(response.data["progress"], {"waiting_transcription": 1})
+
+        response = self.client.post(f"/api/bulk-jobs/{job_id}/cancel/")
+        self.assertEqual(response.data["state"], BulkJob.State.CANCELLED)
+        recording = CallRecording.objects.get(bulk_job_id=job_id)
+        self.assertEqual(recording.error_stage, "cancelled")
+
+    def test_import_api_only_takes_unclaimed_audio_from_org_staging_prefix(self):
+        other = Organization.objects.create(name="Other Org")
+        CallRecording.objects.create(org=other, audio_file=f"imports/{self.org.id}/theirs.mp3")
+        self.client.force_login(self.admin)
+        for audio in (
+            "call_recordings/theirs.mp3",
+            f"imports/{other.id}/call.mp3",
+            f"imports/{self.org.id}/../{other.id}/call.mp3",
+            f"imports/{self.org.id}/theirs.mp3",
+        ):
+            manifest = SimpleUploadedFile("calls.csv", f"audio\n{audio}\n".encode())
+            response = self.client.post("/api/bulk-jobs/import/", {"manifest": manifest})
+            self.assertEqual(response.status_code, 400, audio)
+
+        with override_settings(USE_S3=True), patch("boto3.client") as mock_client:
+            response = self.client.post("/api/bulk-jobs/import/", {"s3_prefix": "call_recordings/"})
+        self.assertEqual(response.status_code, 400)
+        mock_client.assert_not_called()
+        self.assertFalse(BulkJob.objects.exists())
+
+    def test_import_api_requires_org_admin(self):
+        rep = User.objects.create_user(email="rep@example.com", password="x", org=self.org)
+        self.client.force_login(rep)
+        response = self.client.post("/api/bulk-jobs/import/", {"s3_prefix": "archive/"})
+        self.assertEqual(response.status_code, 403)
+
+
+class BulkRerunTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name="Test Org")
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="testpass123", org=self.org, is_staff=True
+        )
+        self.done = [
+            CallRecording.objects.create(
+                org=self.org, audio_file="test/dummy.mp3", transcript="Speaker A: hello",
+                status=CallRecording.Status.DONE,
+                analysis_json={"a": 1}, feedback_json={"f": 1}, followup_json={"m": 1},
+            )
+            for _ in range(3)
+        ]
+        CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", transcript="Speaker A: hi",
+            status=CallRecording.Status.ANALYZING,
+        )
+        CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", status=CallRecording.Status.FAILED
+        )
+        patcher = patch("services.conversations.scheduler.request_admission")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(BULK_RERUN_BATCH_SIZE=2, BULK_RERUN_MAX_QUEUED=100)
+    def test_rerun_clears_stage_and_queues_bulk_jobs_in_batches(self):
+        job = bulk.create_rerun_job(self.org, ["feedback"])
+        self.assertEqual(job.total, 3)
+
+        self.assertTrue(bulk.advance(job.id))
+        self.assertEqual(job.pipeline_jobs.count(), 2)
+        recording = CallRecording.objects.get(id=self.done[0].id)
+        self.assertIsNone(recording.feedback_json)
+        self.assertEqual(recording.followup_json, {"m": 1})
+        self.assertEqual(recording.status, CallRecording.Status.TRANSCRIBED)
+
+        self.assertTrue(bulk.advance(job.id))
+        self.assertFalse(bulk.advance(job.id))
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.processed), (BulkJob.State.COMPLETED, 3))
+        self.assertEqual(
+            set(job.pipeline_jobs.values_list("lane", flat=True)), {PipelineJob.Lane.BULK}
+        )
+
+    @override_settings(BULK_RERUN_BATCH_SIZE=10, BULK_RERUN_MAX_QUEUED=2)
+    def test_rerun_stops_topping_up_while_backlog_is_queued(self):
+        job = bulk.create_rerun_job(self.org, ["followup"])
+        bulk.advance(job.id)
+        self.assertTrue(bulk.advance(job.id))
+        self.assertEqual(job.pipeline_jobs.count(), 2)
+
+    def test_incremental_rerun_queues_without_clearing(self):
+        job = bulk.create_rerun_job(self.org, [], incremental=True)
+        bulk.advance(job.id)
+        self.assertEqual(job.pipeline_jobs.count(), 3)
+        recording = CallRecording.objects.get(id=self.done[0].id)
+        self.assertEqual((recording.analysis_json, recording.status), ({"a": 1}, CallRecording.Status.DONE))
+
+    def test_rerun_skips_recordings_with_a_running_pipeline(self):
+        PipelineJob.objects.create(
+            recording=self.done[1], org=self.org, state=PipelineJob.State.RUNNING
+        )
+        job = bulk.create_rerun_job(self.org, ["analyze"])
+        bulk.advance(job.id)
+        job.refresh_from_db()
+        self.assertEqual((job.processed, job.failed), (2, 1))
+        self.assertEqual(CallRecording.objects.get(id=self.done[1].id).analysis_json, {"a": 1})
+
+    def test_rerun_api_and_cancel(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            "/api/bulk-jobs/rerun/",
+            {"stages": ["followup"], "statuses": ["done"]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data["id"]
+        bulk.advance(job_id)
+
+        response = self.client.post(f"/api/bulk-jobs/{job_id}/cancel/")
+        self.assertEqual(response.data["state"], BulkJob.State.CANCELLED)
+        response = self.client.get(f"/api/bulk-jobs/{job_id}/")
+        self.assertEqual(response.data["progress"], {"cancelled": 3})
+
+    def test_rerun_api_rejects_unknown_stage(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            "/api/bulk-jobs/rerun/", {"stages": ["transcribe"]}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_creates_job_per_org(self):
+        out = io.StringIO()
+        call_command("rerun_pipeline", "--org", str(self.org.id), "--stages", "followup", stdout=out)
+        job = BulkJob.objects.get()
+        self.assertEqual((job.kind, job.total, job.params["stages"]), (BulkJob.Kind.RERUN, 3, ["followup"]))
+
+
+@patch("services.conversations.tasks.stage_versions")
+@patch("services.conversations.tasks.generate_followup_via_ai_service")
+@patch("services.conversations.tasks.feedback_via_ai_service")
+@patch("services.conversations.tasks.analyze_via_ai_service")
+class StageVersioningTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        self.recording = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", transcript="Speaker A: hello",
+            status=CallRecording.Status.TRANSCRIBED,
+        )
+
+    def _run(self, analyze, feedback, followup, versions, analysis=None):
+        versions.return_value = {"analyze": "v1", "feedback": "v1", "followup": "v1"}
+        analyze.return_value = {"analysis_json": analysis or {"a": 1}, "version": "v1"}
+        feedback.return_value = {"feedback_json": {"f": 1}}
+        followup.return_value = {"followup_json": {"m": 1}}
+        run_langgraph_pipeline.apply(args=[self.recording.id])
+        self.recording.refresh_from_db()
+
+    def test_outputs_are_stamped_and_rerun_skips_current_stages(self, analyze, feedback, followup, versions):
+        self._run(analyze, feedback, followup, versions)
+        stamp = self.recording.stage_versions["feedback"]
+        self.assertEqual(stamp["version"], "v1")
+        self.assertEqual(stamp["input_hash"], input_hash(self.recording, "feedback"))
+
+        self._run(analyze, feedback, followup, versions)
+        self.assertEqual((analyze.call_count, feedback.call_count, followup.call_count), (1, 1, 1))
+        self.assertEqual(self.recording.status, CallRecording.Status.DONE)
+
+    def test_new_version_reruns_only_that_stage_when_output_is_unchanged(
+        self, analyze, feedback, followup, versions
+    ):
+        self._run(analyze, feedback, followup, versions)
+        versions.return_value = {"analyze": "v2", "feedback": "v1", "followup": "v1"}
+        analyze.return_value = {"analysis_json": {"a": 1}, "version": "v2"}
+        run_langgraph_pipeline.apply(args=[self.recording.id])
+        self.assertEqual((analyze.call_count, feedback.call_count, followup.call_count), (2, 1, 1))
+
+    def test_changed_upstream_output_recomputes_downstream(self, analyze, feedback, followup, versions):
+        self._run(analyze, feedback, followup, versions)
+        versions.return_value = {"analyze": "v2", "feedback": "v1", "followup": "v1"}
+        analyze.return_value = {"analysis_json": {"a": 2}, "version": "v2"}
+        run_langgraph_pipeline.apply(args=[self.recording.id])
+        self.assertEqual((analyze.call_count, feedback.call_count, followup.call_count), (2, 2, 2))
+
+    def test_unstamped_output_is_current_only_without_a_reported_version(self, *_):
+        self.recording.analysis_json = {"a": 1}
+        self.assertTrue(is_current(self.recording, "analyze", {}))
+        self.assertFalse(is_current(self.recording, "analyze", {"analyze": "v1"}))
+
+
+@patch("services.conversations.scheduler.request_admission")
+@patch("services.conversations.tasks.stage_versions", return_value={})
+@patch("services.conversations.tasks.generate_followup_via_ai_service", return_value={"followup_json": {"m": 1}})
+@patch("services.conversations.tasks.feedback_via_ai_service", return_value={"feedback_json": {"f": 1}})
+@patch("services.conversations.tasks.analyze_via_ai_service", return_value={"analysis_json": {"a": 1}})
+class PipelineRetryTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(ai_client.INFO_KEY, {}, None)
+        self.org = Organization.objects.create(name="Test Org")
+        self.recording = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", transcript="Speaker A: hello",
+            status=CallRecording.Status.TRANSCRIBED,
+        )
+        self.job = PipelineJob.objects.create(
+            recording=self.recording, org=self.org,
+            state=PipelineJob.State.RUNNING, admitted_at=timezone.now(),
+        )
+
+    def _run(self):
+        run_langgraph_pipeline.apply(args=[self.recording.id])
+        self.recording.refresh_from_db()
+        self.job.refresh_from_db()
+
+    def test_transient_error_retries_from_the_failed_stage(self, analyze, feedback, *_):
+        feedback.side_effect = [
+            AIServiceError("HTTP 503", transient=True, status_code=503),
+            {"feedback_json": {"f": 1}},
+        ]
+        self._run()
+        self.assertEqual((analyze.call_count, feedback.call_count), (1, 2))
+        self.assertEqual(self.recording.status, CallRecording.Status.DONE)
+        self.assertEqual(self.job.state, PipelineJob.State.FINISHED)
+
+    def test_permanent_error_fails_without_retrying(self, analyze, *_):
+        analyze.side_effect = AIServiceError("HTTP 422", transient=False, status_code=422)
+        self._run()
+        self.assertEqual(analyze.call_count, 1)
+        self.assertEqual(self.recording.status, CallRecording.Status.FAILED)
+        self.assertEqual(self.job.state, PipelineJob.State.FINISHED)
+
+    @override_settings(PIPELINE_MAX_RETRIES=2)
+    def test_gives_up_after_max_retries(self, analyze, *_):
+        analyze.side_effect = AIServiceError("timed out", transient=True)
+        self._run()
+        self.assertEqual(analyze.call_count, 3)
+        self.assertEqual(self.recording.status, CallRecording.Status.FAILED)
+        self.assertEqual(self.recording.error_stage, "analyze")
+        self.assertEqual(self.job.state, PipelineJob.State.FINISHED)
+
+    @override_settings(PIPELINE_MAX_RETRIES=0)
+    def test_unavailable_service_defers_without_using_a_retry(self, analyze, *_):
+        analyze.side_effect = [AIServiceUnavailable("circuit open", retry_after=5), {"analysis_json": {"a": 1}}]
+        self._run()
+        self.assertEqual(analyze.call_count, 2)
+        self.assertEqual(self.recording.status, CallRecording.Status.DONE)
+
+    def test_http_errors_are_classified(self, *_):
+        for code, transient in ((503, True), (429, True), (400, False)):
+            response = requests.Response()
+            response.status_code = code
+            with patch("services.conversations.ai_client.requests.post", return_value=response):
+                with self.assertRaises(AIServiceError) as ctx:
+                    analyze_via_ai_service(transcript="hi", language="en", deal_title="Deal", recording_id=1)
+            self.assertEqual((ctx.exception.status_code, ctx.exception.transient), (code, transient))
+
+    def test_sweeper_requeues_pipelines_whose_worker_died(self, *_):
+        stale = timezone.now() - timedelta(hours=1)
+        CallRecording.objects.filter(id=self.recording.id).update(status=CallRecording.Status.ANALYZING)
+        PipelineJob.objects.filter(id=self.job.id).update(admitted_at=stale)
+        busy = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", status=CallRecording.Status.ANALYZING
+        )
+        StageEvent.objects.create(
+            recording=busy, org=self.org, stage=StageEvent.Stage.ANALYZE, started_at=timezone.now()
+        )
+
+        resume_stuck_pipelines()
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.state, PipelineJob.State.FINISHED)
+        queued = PipelineJob.objects.get(state=PipelineJob.State.QUEUED)
+        self.assertEqual((queued.recording_id, queued.lane), (self.recording.id, PipelineJob.Lane.NORMAL))
+
+    def test_sweeper_finishes_jobs_lost_before_the_first_stage(self, *_):
+        stale = timezone.now() - timedelta(hours=1)
+        PipelineJob.objects.filter(id=self.job.id).update(admitted_at=stale)
+        done = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", status=CallRecording.Status.DONE
+        )
+        done_job = PipelineJob.objects.create(
+            recording=done, org=self.org, state=PipelineJob.State.RUNNING, admitted_at=stale
+        )
+
+        resume_stuck_pipelines()
+
+        self.job.refresh_from_db()
+        done_job.refresh_from_db()
+        self.assertEqual(
+            (self.job.state, done_job.state), (PipelineJob.State.FINISHED, PipelineJob.State.FINISHED)
+        )
+        queued = PipelineJob.objects.get(state=PipelineJob.State.QUEUED)
+        self.assertEqual(queued.recording_id, self.recording.id)
+
+
+@override_settings(
+    AI_CIRCUIT_FAILURES=2, AI_CIRCUIT_COOLDOWN=30, AI_CONCURRENCY_MIN=2, AI_CONCURRENCY_MAX=4
+)
+class CircuitBreakerTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        cache.set(ai_client.INFO_KEY, {}, None)
+
+    def _call(self, status_code=200):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = b"{}"
+        with patch("services.conversations.ai_client.requests.post", return_value=response) as mock_post:
+            try:
+                analyze_via_ai_service(transcript="hi", language="en", deal_title="Deal", recording_id=1)
+            except (AIServiceError, AIServiceUnavailable):
+                pass
+        return mock_post.call_count
+
+    def test_consecutive_failures_open_the_circuit(self):
+        self._call(503)
+        self._call(200)
+        self._call(503)
+        self.assertEqual(circuit.circuit_state(), "closed")
+        self._call(503)
+        self.assertEqual(circuit.circuit_state(), "open")
+        self.assertEqual(self._call(200), 0)
+
+    def test_half_open_probe_closes_or_reopens(self):
+        for _ in range(2):
+            self._call(503)
+        cache.set(circuit.OPEN_UNTIL_KEY, 0, None)
+        self.assertEqual(circuit.circuit_state(), "half_open")
+        self.assertEqual(self._call(502), 1)
+        self.assertEqual(circuit.circuit_state(), "open")
+
+        cache.set(circuit.OPEN_UNTIL_KEY, 0, None)
+        with patch("services.conversations.circuit.cache.add", return_value=False):
+            self.assertEqual(self._call(200), 0)  # another process holds the probe
+        self.assertEqual(self._call(200), 1)
+        self.assertEqual(circuit.circuit_state(), "closed")
+
+    def test_client_errors_do_not_count(self):
+        for _ in range(3):
+            self._call(400)
+        self.assertEqual(circuit.circuit_state(), "closed")
+
+    @override_settings(AI_LATENCY_TARGET=0)
+    def test_slow_calls_halve_the_limit_and_fast_ones_grow_it(self):
+        self._call(200)
+        self.assertEqual(circuit.concurrency_limit(), 2)
+        cache.delete(circuit.DECREASED_KEY)
+        with override_settings(AI_LATENCY_TARGET=60):
+            self._call(200)
+        self.assertEqual(circuit.concurrency_limit(), 2.5)
+
+    def test_calls_beyond_the_limit_are_rejected(self):
+        cache.set(circuit.LIMIT_KEY, 2, None)
+        for slot in range(2):
+            cache.add(circuit.SLOT_KEY.format(slot), 1)
+        self.assertEqual(self._call(200), 0)
+        cache.delete(circuit.SLOT_KEY.format(1))
+        self.assertEqual(self._call(200), 1)
+
+    def test_action_returns_503_while_open(self):
+        org = Organization.objects.create(name="Test Org")
+        user = User.objects.create_user(email="rep@example.com", password="testpass123", org=org)
+        recording = CallRecording.objects.create(
+            org=org, audio_file="test/dummy.mp3", transcript="hello",
+            status=CallRecording.Status.TRANSCRIBED,
+        )
+        cache.set(circuit.OPEN_UNTIL_KEY, time.time() + 30, None)
+        self.client.force_login(user)
+        response = self.client.post(f"/api/recordings/{recording.id}/analyze/")
+        self.assertEqual(response.status_code, 503)
+        self.assertGreater(int(response["Retry-After"]), 0)
+        self.assertFalse(OrganizationUsage.objects.filter(org=org).exists())
+        self.assertFalse(StageEvent.objects.filter(recording=recording).exists())
+
+    @patch("services.conversations.tasks.stage_versions", return_value={})
+    def test_deferred_pipeline_run_charges_nothing(self, _):
+        org = Organization.objects.create(name="Test Org")
+        recording = CallRecording.objects.create(
+            org=org, audio_file="test/dummy.mp3", transcript="hello",
+            status=CallRecording.Status.TRANSCRIBED,
+        )
+        cache.set(circuit.OPEN_UNTIL_KEY, time.time() + 30, None)
+        with patch.object(run_langgraph_pipeline, "retry", side_effect=Retry()):
+            with self.assertRaises(Retry):
+                run_langgraph_pipeline.run(recording.id)
+        self.assertFalse(OrganizationUsage.objects.filter(org=org).exists())
+        self.assertFalse(StageEvent.objects.filter(recording=recording).exists())
+
+
+class AIPayloadTestCase(TestCase):
+    INFO = {
+        "version": "v1",
+        "features": ["gzip", "transcript_ref"],
+        "analysis_fields": {"followup": ["analysis_text"]},
+    }
+    ANALYSIS = {"analysis_text": "Needs renewals tracked", "spin": {"situation": "Spreadsheets"}}
+
+    def setUp(self):
+        cache.clear()
+        cache.set(ai_client.INFO_KEY, self.INFO, None)
+        self.transcript = "Speaker A: hello there. " * 2000
+
+    def _post(self, *statuses):
+        responses = []
+        for code in statuses:
+            response = requests.Response()
+            response.status_code = code
+            response._content = b"{}"
+            responses.append(response)
+        return patch("services.conversations.ai_client.requests.post", side_effect=responses)
+
+    def _sent(self, call):
+        body = call.kwargs["data"]
+        if call.kwargs["headers"].get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+    def test_large_bodies_are_gzipped_only_if_supported(self):
+        with self._post(200) as mock_post:
+            analyze_via_ai_service(transcript=self.transcript, language="en", deal_title="D", recording_id=1)
+        self.assertEqual(mock_post.call_args.kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertLess(len(mock_post.call_args.kwargs["data"]), 8192)
+
+        cache.set(ai_client.INFO_KEY, {}, None)
+        with self._post(200) as mock_post:
+            analyze_via_ai_service(transcript=self.transcript, language="en", deal_title="D", recording_id=1)
+        self.assertNotIn("Content-Encoding", mock_post.call_args.kwargs["headers"])
+        self.assertEqual(self._sent(mock_post.call_args)["transcript"], self.transcript)
+
+    def test_transcript_is_sent_once_then_by_hash(self):
+        with self._post(200, 200) as mock_post:
+            analyze_via_ai_service(transcript=self.transcript, language="en", deal_title="D", recording_id=1)
+            feedback_via_ai_service(
+                transcript=self.transcript, language="en", deal_title="D", recording_id=1,
+                analysis_json=self.ANALYSIS,
+            )
+        first, second = (self._sent(call) for call in mock_post.call_args_list)
+        self.assertEqual(first["transcript"], self.transcript)
+        self.assertNotIn("transcript", second)
+        self.assertEqual(second["transcript_sha256"], first["transcript_sha256"])
+
+    def test_evicted_transcript_is_resent(self):
+        with self._post(200, 409, 200) as mock_post:
+            analyze_via_ai_service(transcript=self.transcript, language="en", deal_title="D", recording_id=1)
+            analyze_via_ai_service(transcript=self.transcript, language="en", deal_title="D", recording_id=1)
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(self._sent(mock_post.call_args)["transcript"], self.transcript)
+
+    def test_analysis_is_projected_to_the_fields_a_stage_reads(self):
+        with self._post(200, 200) as mock_post:
+            generate_followup_via_ai_service(
+                recording_id=1, transcript="hi", deal_title="D", analysis_json=self.ANALYSIS
+            )
+            feedback_via_ai_service(
+                transcript="hi", language="en", deal_title="D", recording_id=1, analysis_json=self.ANALYSIS
+            )
+        followup, feedback = (self._sent(call) for call in mock_post.call_args_list)
+        self.assertEqual(followup["analysis_json"], {"analysis_text": "Needs renewals tracked"})
+        self.assertEqual(feedback["analysis_json"], self.ANALYSIS)
+
+
+class RecordingSearchTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        self.user = User.objects.create_user(email="rep@example.com", password="testpass123", org=self.org)
+        self.client.force_login(self.user)
+
+    def _recording(self, org=None, **fields):
+        return CallRecording.objects.create(org=org or self.org, audio_file="test/dummy.mp3", **fields)
+
+    def _search(self, q, **params):
+        return self.client.get("/api/recordings/search/", {"q": q, **params})
+
+    def test_ranks_title_matches_first_and_highlights_snippets(self):
+        in_transcript = self._recording(
+            deal_title="Acme", transcript="We keep losing <b>renewals</b> in spreadsheets."
+        )
+        in_title = self._recording(deal_title="Renewals tracking", transcript="Hello there.")
+        self._recording(deal_title="Other", transcript="Nothing relevant.")
+
+        response = self._search("renewals")
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([r["id"] for r in results], [in_title.id, in_transcript.id])
+        self.assertIn("<mark>renewals</mark>", results[1]["snippet"])
+        self.assertIn("&lt;b&gt;", results[1]["snippet"])
+        self.assertNotIn("transcript", results[0])
+
+    def test_index_follows_transcript_updates_and_org_scope(self):
+        recording = self._recording(deal_title="Acme")
+        self._recording(org=Organization.objects.create(name="Other Org"), transcript="budget approved")
+        self.assertEqual(self._search("budget").data["results"], [])
+
+        recording.transcript = "The budget is approved for Q3."
+        recording.save(update_fields=["transcript"])
+        self.assertEqual([r["id"] for r in self._search("budget").data["results"]], [recording.id])
+
+    def test_query_syntax_is_taken_literally(self):
+        self._recording(transcript="Pricing OR discounts")
+        self.assertEqual(self._search('pricing" OR (').status_code, 200)
+        self.assertEqual(self._search("").status_code, 400)
+        self.assertEqual(self._search("pricing", limit="x").status_code, 400)
+
+
+class RecordingListFilterTestCase(TestCase):
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        user = User.objects.create_user(email="rep@example.com", password="testpass123", org=self.org)
+        self.client.force_login(user)
+        self.done = self._recording(deal_title="Beta", status=CallRecording.Status.DONE, language="en")
+        self.failed = self._recording(
+            deal_title="Alpha", status=CallRecording.Status.FAILED, error_stage="analyze",
+            salesperson_email="other@example.com",
+        )
+        CallRecording.objects.filter(id=self.failed.id).update(created_at=timezone.now() - timedelta(days=3))
+
+    def _recording(self, **fields):
+        return CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3", **fields)
+
+    def _ids(self, **params):
+        response = self.client.get("/api/recordings/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [r["id"] for r in response.data]
+
+    def test_filters(self):
+        self.assertEqual(self._ids(status="done,transcribed"), [self.done.id])
+        self.assertEqual(self._ids(language="en"), [self.done.id])
+        self.assertEqual(self._ids(error_stage="analyze"), [self.failed.id])
+        self.assertEqual(self._ids(salesperson_email="other@example.com"), [self.failed.id])
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        self.assertEqual(self._ids(created_after=since), [self.done.id])
+        self.assertEqual(self._ids(created_before=since), [self.failed.id])
+
+    def test_ordering(self):
+        self.assertEqual(self._ids(), [self.done.id, self.failed.id])
+        self.assertEqual(self._ids(ordering="created_at"), [self.failed.id, self.done.id])
+        self.assertEqual(self._ids(ordering="deal_title"), [self.failed.id, self.done.id])
+
+    def test_unsupported_parameters_are_rejected(self):
+        for params in (
+            {"status": "nope"},
+            {"ordering": "status"},
+            {"ordering": "deal_title", "status": "done"},
+            {"created_after": "yesterday"},
+            {"created_after": "2026-02-01T00:00:00Z", "created_before": "2026-01-01T00:00:00Z"},
+        ):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/api/recordings/", params).status_code, 400)
+
+
+class DashboardTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name="Test Org")
+        self.admin = User.objects.create_user(
+            email="admin@example.com", password="testpass123", org=self.org, is_staff=True
+        )
+        self.client.force_login(self.admin)
+
+    def _recording(self, days_ago=0, turnaround=None, org=None, **fields):
+        recording = CallRecording.objects.create(org=org or self.org, audio_file="test/dummy.mp3", **fields)
+        created_at = timezone.now() - timedelta(days=days_ago)
+        completed_at = created_at + timedelta(seconds=turnaround) if turnaround is not None else None
+        CallRecording.objects.filter(id=recording.id).update(created_at=created_at, completed_at=completed_at)
+        return recording
+
+    def test_dashboard_aggregates_rollups(self):
+        self._recording(salesperson_email="a@example.com", status=CallRecording.Status.DONE, turnaround=60)
+        self._recording(salesperson_email="a@example.com", status=CallRecording.Status.DONE, turnaround=120)
+        self._recording(
+            salesperson_email="b@example.com", status=CallRecording.Status.FAILED, error_stage="analyze"
+        )
+        self._recording(salesperson_email="b@example.com", status=CallRecording.Status.ANALYZING, days_ago=1)
+        self._recording(org=Organization.objects.create(name="Other Org"), status=CallRecording.Status.FAILED)
+        call_command("rebuild_dashboard", stdout=io.StringIO())
+
+        response = self.client.get("/api/recordings/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data["recordings"], 4)
+        self.assertEqual(data["by_status"], {"done": 2, "failed": 1, "analyzing": 1})
+        self.assertEqual(data["failure_rate"], 0.25)
+        self.assertEqual(data["failures_by_stage"], {"analyze": 1})
+        self.assertEqual(data["avg_turnaround_seconds"], 90.0)
+        self.assertEqual([day["recordings"] for day in data["daily"]], [1, 3])
+        self.assertEqual(
+            [(p["salesperson_email"], p["done"], p["failed"]) for p in data["salespeople"]],
+            [("a@example.com", 2, 0), ("b@example.com", 0, 1)],
+        )
+
+        today = timezone.now().date().isoformat()
+        self.assertEqual(self.client.get("/api/recordings/dashboard/", {"since": today}).data["recordings"], 3)
+
+    def test_refresh_rebuilds_recent_days_and_finished_reruns(self):
+        old = self._recording(days_ago=10, status=CallRecording.Status.FAILED, error_stage="analyze")
+        refresh_dashboard_rollups.apply()
+        self.assertFalse(RecordingRollup.objects.exists())
+
+        self._recording(status=CallRecording.Status.TRANSCRIBED)
+        CallRecording.objects.filter(id=old.id).update(status=CallRecording.Status.DONE, error_stage=None)
+        PipelineJob.objects.create(
+            recording=old, org=self.org, state=PipelineJob.State.FINISHED, finished_at=timezone.now()
+        )
+        refresh_dashboard_rollups.apply()
+
+        rows = RecordingRollup.objects.values_list("status", "recordings")
+        self.assertCountEqual(rows, [("done", 1), ("transcribed", 1)])
+        self.assertIsNotNone(cache.get(dashboard.REFRESHED_AT_KEY))
+
+    def test_requires_org_admin_and_valid_dates(self):
+        self.assertEqual(self.client.get("/api/recordings/dashboard/", {"since": "2026-02-30"}).status_code, 400)
+        self.assertEqual(
+            self.client.get("/api/recordings/dashboard/", {"since": "2026-02-02", "until": "2026-02-01"}).status_code,
+            400,
+        )
+        rep = User.objects.create_user(email="rep@example.com", password="testpass123", org=self.org)
+        self.client.force_login(rep)
+        self.assertEqual(self.client.get("/api/recordings/dashboard/").status_code, 403)
+
+
+class RecordingInsightsTestCase(TestCase):
+    ANALYSIS = {
+        "analysis_text": "Needs renewals tracked",
+        "commitment_level": "Advance",
+        "outcome_likelihood": 70,
+        "buying_signal_score": "3.5",
+        "buying_signals": ["Quantified pain", "Explicit timeline"],
+        "spin": {"situation": "Spreadsheets", "problem": "Lost renewals", "implication": "", "need-payoff": "Q3"},
+    }
+    FEEDBACK = {"score": 7, "spin_scores": {"situation": 4, "implication": "n/a"}}
+
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+
+    def _recording(self, **fields):
+        return CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", transcript="Speaker A: hello", **fields
+        )
+
+    def test_extracts_typed_values_and_ignores_odd_ones(self):
+        values = insights.extract(self._recording(analysis_json=self.ANALYSIS, feedback_json=self.FEEDBACK))
+        self.assertEqual(values["commitment"], "advance")
+        self.assertEqual(values["outcome_likelihood"], 0.7)
+        self.assertEqual(values["buying_signal_score"], 3.5)
+        self.assertEqual(values["buying_signals"], 2)
+        self.assertEqual(values["spin_categories"], 3)
+        self.assertEqual(values["feedback_score"], 7.0)
+        self.assertEqual(values["spin_situation_score"], 4.0)
+        self.assertIsNone(values["spin_implication_score"])
+        self.assertIsNone(values["spin_problem_score"])
+
+        values = insights.extract(self._recording(analysis_json={"commitment": "maybe", "spin": ["x"]}))
+        self.assertEqual(values["commitment"], "")
+        self.assertIsNone(values["spin_categories"])
+        self.assertIsNone(values["feedback_score"])
+
+    @patch("services.conversations.tasks.stage_versions", return_value={})
+    @patch("services.conversations.tasks.generate_followup_via_ai_service", return_value={"followup_json": {}})
+    @patch("services.conversations.tasks.feedback_via_ai_service")
+    @patch("services.conversations.tasks.analyze_via_ai_service")
+    def test_pipeline_extracts_insights(self, mock_analyze, mock_feedback, *_):
+        mock_analyze.return_value = {"analysis_json": self.ANALYSIS}
+        mock_feedback.return_value = {"feedback_json": self.FEEDBACK}
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBED, salesperson_email="rep@example.com")
+        run_langgraph_pipeline.apply(args=[recording.id])
+
+        row = RecordingInsights.objects.get(recording=recording)
+        self.assertEqual((row.org_id, row.salesperson_email), (self.org.id, "rep@example.com"))
+        self.assertEqual((row.commitment, row.feedback_score), ("advance", 7.0))
+        self.assertEqual(
+            list(RecordingInsights.objects.filter(org=self.org, feedback_score__lt=8).values_list("recording", flat=True)),
+            [recording.id],
+        )
+
+    @patch("services.conversations.views.save_insights", side_effect=RuntimeError("boom"))
+    @patch("services.conversations.views.analyze_via_ai_service")
+    def test_failed_extraction_keeps_the_analysis(self, mock_analyze, _):
+        mock_analyze.return_value = {"analysis_json": self.ANALYSIS}
+        recording = self._recording(status=CallRecording.Status.TRANSCRIBED)
+        user = User.objects.create_user(email="rep@example.com", password="x", org=self.org)
+        self.client.force_login(user)
+        response = self.client.post(f"/api/recordings/{recording.id}/analyze/")
+        self.assertEqual(response.status_code, 200)
+        recording.refresh_from_db()
+        self.assertEqual(recording.analysis_json, self.ANALYSIS)
+
+    def test_backfill_command_creates_and_refreshes_rows(self):
+        analyzed = self._recording(analysis_json=self.ANALYSIS)
+        self._recording()
+        RecordingInsights.objects.create(
+            recording=analyzed, org=self.org, recording_created_at=analyzed.created_at,
+            commitment="no_sale", updated_at=timezone.now(),
+        )
+        call_command("backfill_insights", "--batch-size", "1", stdout=io.StringIO())
+
+        self.assertEqual(RecordingInsights.objects.count(), 1)
+        row = RecordingInsights.objects.get(recording=analyzed)
+        self.assertEqual((row.commitment, row.buying_signals, row.feedback_score), ("advance", 2, None))
+
+
+class RecordingExportTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name="Test Org")
+        admin = User.objects.create_user(
+            email="admin@example.com", password="testpass123", org=self.org, is_staff=True
+        )
+        self.client.force_login(admin)
+        self.recording = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", deal_title="Acme, Inc.",
+            status=CallRecording.Status.DONE, analysis_json={"commitment": "advance", "note": "שלום"},
+        )
+        insights.save_insights(self.recording)
+        NotificationDelivery.objects.create(
+            recording=self.recording, kind=NotificationDelivery.Kind.ANALYSIS,
+            salesperson_email="rep@example.com", status=NotificationDelivery.Status.SENT,
+        )
+        CallRecording.objects.create(org=Organization.objects.create(name="Other Org"), audio_file="test/dummy.mp3")
+
+    def _rows(self, response):
+        body = b"".join(response.streaming_content).decode("utf-8")
+        return list(csv.DictReader(io.StringIO(body)))
+
+    def test_csv_endpoint_streams_the_orgs_recordings(self):
+        response = self.client.get("/api/recordings/export/", {"as": "csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = self._rows(response)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["deal_title"], "Acme, Inc.")
+        self.assertEqual(rows[0]["commitment"], "advance")
+        self.assertEqual(rows[0]["notifications_sent"], "1")
+        self.assertEqual(json.loads(rows[0]["analysis_json"])["note"], "שלום")
+        self.assertIsNone(cache.get(export.LOCK_KEY.format(self.org.id)))
+
+    def test_one_export_per_org_and_admins_only(self):
+        busy = self.client.get("/api/recordings/export/")
+        self.assertEqual(self.client.get("/api/recordings/export/").status_code, 409)
+        busy.close()
+        self.assertEqual(self.client.get("/api/recordings/export/", {"as": "xlsx"}).status_code, 400)
+
+        rep = User.objects.create_user(email="rep@example.com", password="testpass123", org=self.org)
+        self.client.force_login(rep)
+        self.assertEqual(self.client.get("/api/recordings/export/").status_code, 403)
+
+    def test_command_writes_parquet_in_row_groups(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        for _ in range(2):
+            CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recordings.parquet")
+            call_command(
+                "export_recordings", "--org", str(self.org.id), "--chunk-size", "2",
+                "--output", path, stdout=io.StringIO(),
+            )
+            parquet = pq.ParquetFile(path)
+            self.assertEqual(parquet.metadata.num_rows, 3)
+            self.assertEqual(parquet.metadata.num_row_groups, 2)
+            table = parquet.read(columns=["id", "commitment", "notifications_sent"]).to_pylist()
+        self.assertEqual(table[0], {"id": self.recording.id, "commitment": "advance", "notifications_sent": 1})
+
+
+class TranscriptDownloadTestCase(TestCase):
+    TRANSCRIPT_JSON = {
+        "text": "Hi there. Hello.",
+        "utterances": [
+            {"speaker": "A", "text": "Hi <there>.", "start": 0, "end": 1500, "words": [{"text": "Hi"}]},
+            {"speaker": "B", "text": "Hello,\n\nagain.", "start": 3_661_001, "end": 3_662_500, "words": []},
+        ],
+    }
+
+    def setUp(self):
+        self.org = Organization.objects.create(name="Test Org")
+        user = User.objects.create_user(email="rep@example.com", password="testpass123", org=self.org)
+        self.client.force_login(user)
+        self.recording = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", transcript_json=self.TRANSCRIPT_JSON,
+            transcript="Speaker A: Hi <there>.\nSpeaker B: Hello, again.", status=CallRecording.Status.TRANSCRIBED,
+        )
+
+    def _download(self, recording=None, **params):
+        recording = recording or self.recording
+        return self.client.get(f"/api/recordings/{recording.id}/transcript/download/", params)
+
+    def _body(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_formats(self):
+        self.assertEqual(self._body(self._download()), "Speaker A: Hi <there>.\nSpeaker B: Hello,\n\nagain.\n")
+        self.assertEqual(
+            self._body(self._download(**{"as": "srt"})),
+            "1\n00:00:00,000 --> 00:00:01,500\nSpeaker A: Hi <there>.\n\n"
+            "2\n01:01:01,001 --> 01:01:02,500\nSpeaker B: Hello, again.\n\n",
+        )
+        vtt = self._body(self._download(**{"as": "vtt"}))
+        self.assertTrue(vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\n<v Speaker A>Hi &lt;there&gt;.\n\n"))
+        lines = self._body(self._download(**{"as": "jsonl"})).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [
+                {"speaker": "A", "text": "Hi <there>.", "start": 0, "end": 1500},
+                {"speaker": "B", "text": "Hello,\n\nagain.", "start": 3_661_001, "end": 3_662_500},
+            ],
+        )
+
+    def test_text_falls_back_without_utterances(self):
+        recording = CallRecording.objects.create(
+            org=self.org, audio_file="test/dummy.mp3", transcript_json={"text": "Plain text."},
+            transcript="Plain text.",
+        )
+        self.assertEqual(self._body(self._download(recording)), "Plain text.\n")
+        self.assertEqual(self._body(self._download(recording, **{"as": "srt"})), "")
+
+    def test_not_transcribed_other_org_and_bad_format(self):
+        pending = CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3")
+        self.assertEqual(self._download(pending).status_code, 409)
+        other = CallRecording.objects.create(
+            org=Organization.objects.create(name="Other Org"), audio_file="test/dummy.mp3",
+            transcript_json=self.TRANSCRIPT_JSON,
+        )
+        self.assertEqual(self._download(other).status_code, 404)
+        self.assertEqual(self._download(**{"as": "docx"}).status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), USE_S3=False)
+class AudioPlaybackTestCase(TestCase):
+    AUDIO = bytes(range(256)) * 4
+
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name="Test Org")
+        self.user = User.objects.create_user(email="rep@example.com", password="testpass123", org=self.org)
+        self.client.force_login(self.user)
+        self.recording = CallRecording.objects.create(
+            org=self.org, audio_file=SimpleUploadedFile("call.mp3", self.AUDIO, content_type="audio/mpeg")
+        )
+        self.url = f"/api/recordings/{self.recording.id}/audio/"
+
+    def _body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_range_requests(self):
+        whole = self.client.get(self.url)
+        self.assertEqual(whole.status_code, 200)
+        self.assertEqual(whole["Accept-Ranges"], "bytes")
+        self.assertEqual(whole["Content-Length"], "1024")
+        self.assertEqual(self._body(whole), self.AUDIO)
+
+        part = self.client.get(self.url, HTTP_RANGE="bytes=100-199")
+        self.assertEqual(part.status_code, 206)
+        self.assertEqual(part["Content-Range"], "bytes 100-199/1024")
+        self.assertEqual(self._body(part), self.AUDIO[100:200])
+
+        tail = self.client.get(self.url, HTTP_RANGE="bytes=-24")
+        self.assertEqual((tail.status_code, self._body(tail)), (206, self.AUDIO[-24:]))
+        self.assertEqual(self._body(self.client.get(self.url, HTTP_RANGE="bytes=1000-")), self.AUDIO[1000:])
+
+        beyond = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+        self.assertEqual((beyond.status_code, beyond["Content-Range"]), (416, "bytes */1024"))
+
+    def test_playback_url_is_signed_cached_and_scoped(self):
+        data = self.client.get(f"/api/recordings/{self.recording.id}/").data
+        playback_url = data["playback_url"]
+        self.assertIn(f"{self.url}?token=", playback_url)
+        self.assertEqual(self.client.get("/api/recordings/").data[0]["playback_url"], playback_url)
+
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        response = self.client.get(playback_url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual((response.status_code, self._body(response)), (206, self.AUDIO[:10]))
+
+        other = CallRecording.objects.create(org=self.org, audio_file="test/dummy.mp3")
+        token = playback_url.split("token=")[1]
+        self.assertEqual(self.client.get(f"/api/recordings/{other.id}/audio/?token={token}").status_code, 403)
+
+    @override_settings(USE_S3=True, AWS_QUERYSTRING_EXPIRE=3600)
+    def test_s3_presigned_urls_are_reused(self):
+        with patch("services.conversations.playback.default_storage.url", return_value="https://s3/signed") as sign:
+            for _ in range(3):
+                self.assertEqual(self.client.get("/api/recordings/").data[0]["audio_file"], "https://s3/signed")
+            response = self.client.get(self.url)
+        sign.assert_called_once_with(self.recording.audio_file.name, expire=3600)
+        self.assertEqual((response.status_code, response["Location"]), (302, "https://s3/signed"))
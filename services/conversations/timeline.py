@@ -0,0 +1,136 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.utils import timezone
+
+from core import tracing
+from core.metrics import PIPELINE_STAGE_DURATION
+from services.accounts.usage import record_usage
+
+from .circuit import AIServiceUnavailable
+from .models import StageEvent
+
+# Org usage counter charged each time an AI stage runs (including retries).
+_USAGE_COUNTERS = {
+    StageEvent.Stage.ANALYZE: "ai_analyze_calls",
+    StageEvent.Stage.FEEDBACK: "ai_feedback_calls",
+    StageEvent.Stage.FOLLOWUP: "ai_followup_calls",
+}
+
+
+def start_stage(recording, stage: str) -> StageEvent:
+    attempt = StageEvent.objects.filter(recording=recording, stage=stage).count() + 1
+    return StageEvent.objects.create(
+        recording=recording,
+        org_id=recording.org_id,
+        stage=stage,
+        attempt=attempt,
+        started_at=timezone.now(),
+    )
+
+
+def finish_stage(recording, stage: str, outcome: str):
+    """
+    Close the latest running event for `stage`. Stages that span tasks
+    (transcription starts at upload, ends in the poller) finish through here.
+    """
+    event = (
+        StageEvent.objects
+        .filter(recording=recording, stage=stage, outcome=StageEvent.Outcome.RUNNING)
+        .order_by("-started_at")
+        .first()
+    )
+    if event is None:
+        return None
+    _finish(event, outcome)
+    return event
+
+
+def _finish(event: StageEvent, outcome: str):
+    event.outcome = outcome
+    event.finished_at = timezone.now()
+    event.save(update_fields=["outcome", "finished_at"])
+    PIPELINE_STAGE_DURATION.labels(
+        stage=event.stage, org=str(event.org_id), outcome=outcome
+    ).observe((event.finished_at - event.started_at).total_seconds())
+
+
+@contextmanager
+def track_stage(recording, stage: str):
+    """
+    Record a StageEvent around the block: SUCCEEDED if it exits cleanly,
+    FAILED if it raises (the exception propagates). Also traced as a span.
+    AI stages are charged to the org's usage, unless the circuit breaker
+    turned the call away (AIServiceUnavailable): then nothing was attempted,
+    so the event is dropped and nothing is charged.
+    """
+    with tracing.span(f"pipeline.{stage}", recording_id=recording.id, org_id=recording.org_id):
+        event = start_stage(recording, stage)
+        try:
+            yield event
+        except AIServiceUnavailable:
+            event.delete()
+            raise
+        except Exception:
+            _charge(recording, stage)
+            _finish(event, StageEvent.Outcome.FAILED)
+            raise
+        _charge(recording, stage)
+        _finish(event, StageEvent.Outcome.SUCCEEDED)
+
+
+def _charge(recording, stage: str):
+    counter = _USAGE_COUNTERS.get(stage)
+    if counter:
+        record_usage(recording.org_id, **{counter: 1})
+
+
+def _duration_sql() -> str:
+    if connection.vendor == "postgresql":
+        return "EXTRACT(EPOCH FROM finished_at - started_at)"
+    return "(julianday(finished_at) - julianday(started_at)) * 86400.0"
+
+
+def stage_latency_percentiles(org_id: int, since, until) -> list:
+    """
+    Nearest-rank p50/p95 of succeeded stage durations (seconds) per stage, for
+    events started in [since, until). Computed in the database with window
+    functions, so only one row per stage comes back.
+    """
+    table = StageEvent._meta.db_table
+    duration = _duration_sql()
+    sql = f"""
+        WITH durations AS (
+            SELECT
+                stage,
+                {duration} AS seconds,
+                ROW_NUMBER() OVER (PARTITION BY stage ORDER BY {duration}) AS rn,
+                COUNT(*) OVER (PARTITION BY stage) AS n
+            FROM {table}
+            WHERE org_id = %s
+              AND outcome = %s
+              AND started_at >= %s
+              AND started_at < %s
+        )
+        SELECT
+            stage,
+            n,
+            MIN(CASE WHEN rn >= 0.50 * n THEN seconds END),
+            MIN(CASE WHEN rn >= 0.95 * n THEN seconds END)
+        FROM durations
+        GROUP BY stage, n
+        ORDER BY stage
+    """
+    params = [
+        org_id,
+        StageEvent.Outcome.SUCCEEDED,
+        connection.ops.adapt_datetimefield_value(since),
+        connection.ops.adapt_datetimefield_value(until),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {"stage": stage, "count": n, "p50": float(p50), "p95": float(p95)}
+        for stage, n, p50, p95 in rows
+    ]
@@ -0,0 +1,112 @@
+"""
+Transcript downloads: plain text, SRT, WebVTT or JSON lines, generated one
+utterance at a time.
+
+Utterances are read straight out of transcript_json by the database
+(jsonb_array_elements on Postgres, json_each on SQLite), speaker, text and
+timings only, through a chunked cursor. The payload, mostly word-level
+timings, is never loaded or decoded in Python, so a long call costs no more
+memory than a short one. AssemblyAI timings are in milliseconds.
+"""
+
+import json
+
+from django.db import connection
+
+from .models import CallRecording
+
+FORMATS = ("txt", "srt", "vtt", "jsonl")
+CONTENT_TYPES = {
+    "txt": "text/plain; charset=utf-8",
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+_FETCH_SIZE = 500
+_TABLE = CallRecording._meta.db_table
+
+_SQL = {
+    "postgresql": f"""
+        SELECT u->>'speaker', u->>'text',
+               round((u->>'start')::numeric)::bigint, round((u->>'end')::numeric)::bigint
+        FROM {_TABLE} r,
+             jsonb_array_elements(r.transcript_json->'utterances') WITH ORDINALITY AS e(u, n)
+        WHERE r.id = %s AND jsonb_typeof(r.transcript_json->'utterances') = 'array'
+        ORDER BY n
+    """,
+    "sqlite": f"""
+        SELECT json_extract(e.value, '$.speaker'), json_extract(e.value, '$.text'),
+               json_extract(e.value, '$.start'), json_extract(e.value, '$.end')
+        FROM {_TABLE} r, json_each(r.transcript_json, '$.utterances') e
+        WHERE r.id = %s AND json_type(r.transcript_json, '$.utterances') = 'array'
+        ORDER BY e.key
+    """,
+}
+
+
+def utterances(recording_id: int):
+    """Yield (speaker, text, start_ms, end_ms) of the recording's utterances, in order."""
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(_SQL[connection.vendor], [recording_id])
+        while True:
+            rows = cursor.fetchmany(_FETCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+
+def _timestamp(ms, separator: str) -> str:
+    ms = max(int(ms or 0), 0)
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+def _cue_text(text) -> str:
+    # A blank line would end the cue early.
+    return " ".join((text or "").split())
+
+
+def iter_txt(rows, fallback=None):
+    """'Speaker X: text' lines, as format_speaker_transcript; `fallback()` if no utterances."""
+    empty = True
+    for speaker, text, _, _ in rows:
+        text = (text or "").strip()
+        if text:
+            empty = False
+            yield f"Speaker {speaker}: {text}\n"
+    if empty and fallback is not None:
+        text = fallback()
+        if text:
+            yield text if text.endswith("\n") else text + "\n"
+
+
+def iter_srt(rows):
+    for number, (speaker, text, start, end) in enumerate(rows, start=1):
+        yield (
+            f"{number}\n{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n"
+            f"Speaker {speaker}: {_cue_text(text)}\n\n"
+        )
+
+
+def iter_vtt(rows):
+    yield "WEBVTT\n\n"
+    for speaker, text, start, end in rows:
+        cue = _cue_text(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        yield f"{_timestamp(start, '.')} --> {_timestamp(end, '.')}\n<v Speaker {speaker}>{cue}\n\n"
+
+
+def iter_jsonl(rows):
+    for speaker, text, start, end in rows:
+        line = {"speaker": speaker, "text": text, "start": start, "end": end}
+        yield json.dumps(line, ensure_ascii=False) + "\n"
+
+
+def render(recording, fmt: str):
+    """Lazy iterator of text chunks of `recording`'s transcript in `fmt`."""
+    rows = utterances(recording.id)
+    if fmt == "txt":
+        return iter_txt(rows, fallback=lambda: (recording.transcript or "").strip())
+    return {"srt": iter_srt, "vtt": iter_vtt, "jsonl": iter_jsonl}[fmt](rows)
@@ -5,18 +5,31 @@ import boto3
 from botocore.config import Config
 from django.conf import settings
 
+from core import tracing
+from core.metrics import ASSEMBLYAI_LATENCY, timed
+
 BASE_URL = getattr(
     settings, "ASSEMBLYAI_BASE_URL", "https://api.assemblyai.com"
 ).rstrip("/")
-HEADERS = {"Authorization": settings.ASSEMBLYAI_API_KEY}
-if not settings.ASSEMBLYAI_API_KEY:
-    raise RuntimeError("ASSEMBLYAI_API_KEY is missing from environment")
 
 
 class AssemblyAIError(RuntimeError):
     pass
 
 
+def _headers(**extra) -> dict:
+    # Checked per call rather than at import, so the app (tests, benchmarks,
+    # management commands) can start without AssemblyAI credentials.
+    api_key = settings.ASSEMBLYAI_API_KEY
+    if not api_key:
+        raise AssemblyAIError("ASSEMBLYAI_API_KEY is missing from environment")
+    return tracing.inject({"Authorization": api_key, **extra})
+
+
+def _traced(operation: str, **attributes):
+    return tracing.span(f"assemblyai {operation}", kind=tracing.CLIENT, **attributes)
+
+
 def _upload_local_file(file_path: str) -> str:
     """
     Uploads a local file to AssemblyAI and returns an upload_url.
@@ -24,14 +37,16 @@ def _upload_local_file(file_path: str) -> str:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Audio file not found at: {file_path}")
 
-    with open(file_path, "rb") as f:
+    with open(file_path, "rb") as f, _traced("upload"), timed(
+        ASSEMBLYAI_LATENCY, operation="upload"
+    ):
         resp = requests.post(
             f"{BASE_URL}/v2/upload",
-            headers={**HEADERS, "Content-Type": "application/octet-stream"},
+            headers=_headers(**{"Content-Type": "application/octet-stream"}),
             data=f,
             timeout=120,
         )
-    resp.raise_for_status()
+        resp.raise_for_status()
     data = resp.json()
     upload_url = data.get("upload_url")
     if not upload_url:
@@ -84,13 +99,16 @@ def submit_transcription(recording, language_code=None) -> dict:
     else:
         payload["language_detection"] = True
 
-    resp = requests.post(
-        f"{BASE_URL}/v2/transcript",
-        headers=HEADERS,
-        json=payload,
-        timeout=30,
-    )
-    resp.raise_for_status()
+    with _traced("submit", recording_id=recording.id), timed(
+        ASSEMBLYAI_LATENCY, operation="submit"
+    ):
+        resp = requests.post(
+            f"{BASE_URL}/v2/transcript",
+            headers=_headers(),
+            json=payload,
+            timeout=30,
+        )
+        resp.raise_for_status()
     data = resp.json()
 
     if "id" not in data:
@@ -104,10 +122,13 @@ def poll_transcription(transcript_id: str) -> dict:
     Async step 2: poll transcript status.
     Returns full transcript JSON when completed, or status if still processing.
     """
-    resp = requests.get(
-        f"{BASE_URL}/v2/transcript/{transcript_id}", headers=HEADERS, timeout=30
-    )
-    resp.raise_for_status()
+    with _traced("poll", transcript_id=transcript_id), timed(
+        ASSEMBLYAI_LATENCY, operation="poll"
+    ):
+        resp = requests.get(
+            f"{BASE_URL}/v2/transcript/{transcript_id}", headers=_headers(), timeout=30
+        )
+        resp.raise_for_status()
     data = resp.json()
 
     status = data.get("status")
@@ -0,0 +1,76 @@
+"""
+Stage-output stamps: which AI service version produced each stage output, from
+which inputs.
+
+CallRecording.stage_versions maps a stage to
+{"version": ..., "input_hash": ..., "at": ...}. An output is current when its
+stamp's input hash matches the recording's inputs now and its version matches
+what the AI service currently reports for the stage. The pipeline only runs
+stages that aren't current.
+
+Downstream hashes include the upstream output, so a re-analysis that changes
+the analysis makes feedback and follow-up stale, while one that reproduces it
+leaves them alone.
+"""
+
+import hashlib
+import json
+
+from django.utils import timezone
+
+from .models import StageEvent
+
+# Inputs of each stage. Follow-up channel/tone are deliberately left out: a
+# follow-up regenerated with a custom tone must not look stale to the pipeline.
+_STAGE_INPUTS = {
+    StageEvent.Stage.ANALYZE: ("transcript", "language", "deal_title"),
+    StageEvent.Stage.FEEDBACK: ("transcript", "language", "deal_title", "analysis_json"),
+    StageEvent.Stage.FOLLOWUP: ("transcript", "language", "deal_title", "analysis_json"),
+}
+
+_OUTPUT_FIELD = {
+    StageEvent.Stage.ANALYZE: "analysis_json",
+    StageEvent.Stage.FEEDBACK: "feedback_json",
+    StageEvent.Stage.FOLLOWUP: "followup_json",
+}
+
+
+def input_hash(recording, stage: str) -> str:
+    inputs = {name: getattr(recording, name) for name in _STAGE_INPUTS[stage]}
+    encoded = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def is_current(recording, stage: str, versions: dict) -> bool:
+    """
+    True if the stage's output exists and was produced from the current inputs
+    by the current version. `versions` is what the AI service reports
+    ({stage: version}); a stage it reports nothing for is judged on inputs alone.
+    Outputs without a stamp predate versioning and count as produced by an
+    unknown version.
+    """
+    if not getattr(recording, _OUTPUT_FIELD[stage]):
+        return False
+    stamp = (recording.stage_versions or {}).get(stage)
+    if stamp is None:
+        return not versions.get(stage)
+    if stamp.get("input_hash") != input_hash(recording, stage):
+        return False
+    current = versions.get(stage)
+    return not current or stamp.get("version") == current
+
+
+def stamp(recording, stage: str, result: dict, versions=None):
+    """
+    Record that the stage's output was just produced. Call after setting the
+    output field and before saving with "stage_versions" in update_fields.
+    """
+    version = (result or {}).get("version") or (versions or {}).get(stage) or ""
+    recording.stage_versions = {
+        **(recording.stage_versions or {}),
+        stage: {
+            "version": str(version),
+            "input_hash": input_hash(recording, stage),
+            "at": timezone.now().isoformat(),
+        },
+    }
@@ -1,15 +1,31 @@
 import logging
-
-from rest_framework import viewsets, permissions, status, parsers
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import mixins, viewsets, permissions, status, parsers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied, Throttled, ValidationError
 
 from langdetect import detect
 
-from .models import CallRecording, NotificationDelivery
-from .serializers import CallRecordingSerializer
-from .tasks import send_delivery, poll_transcription_until_done
+from . import bulk, dashboard, export, playback, transcript_formats
+from .models import BulkJob, CallRecording, NotificationDelivery, PipelineJob, StageEvent
+from .filters import filter_recordings, parse_datetime_value
+from .insights import save_insights
+from .outbox import enqueue_task
+from .scheduler import RERUN_CLEARS, lost_cutoff, rerun_fields, schedule_pipeline
+from .versioning import stamp
+from .search import search_recordings
+from .serializers import BulkJobSerializer, CallRecordingSerializer, RecordingSearchResultSerializer
+from .tasks import poll_transcription_until_done, queue_notification
+from .timeline import finish_stage, stage_latency_percentiles, start_stage, track_stage
 from .transcription_service import (
     submit_transcription,
     poll_transcription,
@@ -17,7 +33,16 @@ from .transcription_service import (
     compact_utterances,
 )
 
+from services.accounts.permissions import IsOrgAdmin
+from services.accounts.throttling import OrgUploadRateThrottle
+from services.accounts.usage import (
+    QuotaExceeded,
+    check_pipeline_quota,
+    check_upload_quota,
+    record_usage,
+)
 from services.conversations.ai_client import (
+    AIServiceUnavailable,
     analyze_via_ai_service,
     generate_followup_via_ai_service,
     feedback_via_ai_service,
@@ -25,6 +50,10 @@ from services.conversations.ai_client import (
 
 logger = logging.getLogger(__name__)
 
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+DASHBOARD_DEFAULT_DAYS = 30
+
 
 class CallRecordingViewSet(viewsets.ModelViewSet):
     serializer_class = CallRecordingSerializer
@@ -43,7 +72,40 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
         org = getattr(user, "org", None)
         if not org:
             return CallRecording.objects.none()
-        return CallRecording.objects.filter(org=org).order_by("-created_at")
+        qs = CallRecording.objects.filter(org=org).order_by("-created_at")
+        if self.action == "list":
+            qs = filter_recordings(qs, self.request.query_params)
+        if self.action in ("list", "retrieve"):
+            # The serializer never returns transcript_json, and for long calls it is
+            # megabytes of word timings — don't load and decode it just to drop it.
+            qs = qs.defer("transcript_json")
+        elif self.action == "audio":
+            qs = qs.only("id", "org_id", "audio_file")
+        elif self.action == "download_transcript":
+            # Utterances are streamed out of the database (transcript_formats.py).
+            qs = qs.defer("transcript", "transcript_json").annotate(
+                has_transcript=ExpressionWrapper(Q(transcript_json__isnull=False), output_field=BooleanField())
+            )
+        return qs
+
+    def get_throttles(self):
+        if self.action == "create":
+            return [*super().get_throttles(), OrgUploadRateThrottle()]
+        return super().get_throttles()
+
+    def _pipeline_quota_response(self, request):
+        """429 response if the org has used up its AI quota, else None."""
+        try:
+            check_pipeline_quota(request.user.org)
+        except QuotaExceeded as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        return None
+
+    def _unavailable_response(self, exc):
+        """503 while the AI service is shedding load; the client should retry later."""
+        response = Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response["Retry-After"] = str(max(int(exc.retry_after), 1))
+        return response
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -56,22 +118,31 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
                 }
             )
 
+        try:
+            check_upload_quota(org)
+        except QuotaExceeded as exc:
+            raise Throttled(detail=str(exc))
+
+        upload = serializer.validated_data.get("audio_file")
         recording = serializer.save(
             org=org,
             uploaded_by=user,
             status=CallRecording.Status.WAITING_TRANSCRIPTION,
         )
+        record_usage(org.id, uploads=1, uploaded_bytes=getattr(upload, "size", 0) or 0)
 
         language_code = recording.language
         if language_code == CallRecording.Language.AUTO:
             language_code = None
 
         # Auto-submit async transcription job (POC behavior)
+        start_stage(recording, StageEvent.Stage.TRANSCRIPTION)
         try:
             result = submit_transcription(recording, language_code=language_code)
             recording.transcription_job_id = result["id"]
-            recording.save(update_fields=["transcription_job_id"])
-            poll_transcription_until_done.delay(recording.id)
+            with transaction.atomic():
+                recording.save(update_fields=["transcription_job_id"])
+                enqueue_task(poll_transcription_until_done, recording.id)
         except Exception as e:
             # BUG 7 fix: was silently printing; now logs properly and marks recording FAILED
             logger.error(
@@ -81,6 +152,7 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
             recording.error_stage = "transcription_submit"
             recording.error_message = str(e)
             recording.save(update_fields=["status", "error_stage", "error_message"])
+            finish_stage(recording, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.FAILED)
 
     # ---------- TRANSCRIBE ACTION (POST submit, GET poll) ----------
     @action(detail=True, methods=["get"], url_path="transcript")
@@ -88,7 +160,8 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
         """
         GET /api/recordings/<id>/transcript/
 
-        - If already transcribed -> return saved transcript
+        - If already transcribed (whatever stage it has reached since) ->
+          return saved transcript
         - Else -> poll AssemblyAI
             - processing -> return awaiting
             - completed -> save + return transcript
@@ -96,15 +169,8 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
         recording = self.get_object()
 
         # If already ready, return from DB (fast, no provider call)
-        if recording.status == CallRecording.Status.TRANSCRIBED:
-            return Response(
-                {
-                    "state": "completed",
-                    "transcript": recording.transcript,
-                    "utterances": compact_utterances(recording.transcript_json or {}),
-                },
-                status=status.HTTP_200_OK,
-            )
+        if recording.transcript_json or recording.status == CallRecording.Status.TRANSCRIBED:
+            return self._saved_transcript_response(recording)
 
         # Not submitted / missing job id (shouldn't happen if upload auto-submits)
         if not recording.transcription_job_id:
@@ -148,9 +214,23 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
             else:
                 recording.language = "auto"
 
-            recording.save(
-                update_fields=["transcript_json", "transcript", "status", "language"]
+            # Only the first save counts the audio: the poller task may have
+            # stored the same transcript a moment ago.
+            saved = CallRecording.objects.filter(
+                id=recording.id, transcript_json__isnull=True
+            ).update(
+                transcript_json=recording.transcript_json,
+                transcript=recording.transcript,
+                status=recording.status,
+                language=recording.language,
+            )
+            if not saved:
+                recording.refresh_from_db()
+                return self._saved_transcript_response(recording)
+            finish_stage(
+                recording, StageEvent.Stage.TRANSCRIPTION, StageEvent.Outcome.SUCCEEDED
             )
+            record_usage(recording.org_id, audio_seconds=round(data.get("audio_duration") or 0))
             clean_utterances = []
             for u in data.get("utterances") or []:
                 clean_utterances.append(
@@ -174,6 +254,72 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
+    @staticmethod
+    def _saved_transcript_response(recording):
+        return Response(
+            {
+                "state": "completed",
+                "transcript": recording.transcript,
+                "utterances": compact_utterances(recording.transcript_json or {}),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=["get"], url_path="transcript/download")
+    def download_transcript(self, request, pk=None):
+        """
+        GET /api/recordings/<id>/transcript/download/?as=txt|srt|vtt|jsonl
+
+        The transcript as a streamed file: plain text (default), SRT or WebVTT
+        subtitles from utterance timings, or one JSON utterance per line.
+        409 until the recording is transcribed.
+        """
+        fmt = request.query_params.get("as", "txt")
+        if fmt not in transcript_formats.FORMATS:
+            raise ValidationError({"as": f"Choose from {list(transcript_formats.FORMATS)}."})
+        recording = self.get_object()
+        if not recording.has_transcript:
+            return Response(
+                {"detail": "The recording has not been transcribed yet."},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        response = StreamingHttpResponse(
+            transcript_formats.render(recording, fmt),
+            content_type=transcript_formats.CONTENT_TYPES[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="recording-{recording.id}.{fmt}"'
+        return response
+
+    @action(detail=True, methods=["get"], permission_classes=[permissions.AllowAny])
+    def audio(self, request, pk=None):
+        """
+        GET /api/recordings/<id>/audio/[?token=<playback token>]
+
+        The recording's audio, for the `playback_url` the API hands out. Locally
+        stored files are served here, honouring Range requests (206). On S3 this
+        redirects to the cached presigned URL. The token stands in for the
+        Authorization header, which <audio> elements can't send.
+        """
+        token = request.query_params.get("token")
+        if token:
+            if str(playback.verify_token(token)) != str(pk):
+                raise PermissionDenied("Invalid or expired playback token.")
+            recording = get_object_or_404(CallRecording.objects.only("id", "audio_file"), pk=pk)
+        elif request.user.is_authenticated:
+            recording = self.get_object()
+        else:
+            raise NotAuthenticated()
+
+        if not recording.audio_file:
+            raise Http404
+        if settings.USE_S3:
+            return HttpResponseRedirect(playback.playback_url(recording))
+        try:
+            return playback.serve_file(recording.audio_file.name, request.headers.get("Range"))
+        except FileNotFoundError:
+            raise Http404
+
     @action(detail=True, methods=["get", "post"])
     def analyze(self, request, pk=None):
         """
@@ -204,13 +350,20 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        quota_response = self._pipeline_quota_response(request)
+        if quota_response is not None:
+            return quota_response
+
         try:
-            result = analyze_via_ai_service(
-                transcript=recording.transcript,
-                language=recording.language,
-                deal_title=recording.deal_title,
-                recording_id=recording.id,
-            )
+            with track_stage(recording, StageEvent.Stage.ANALYZE):
+                result = analyze_via_ai_service(
+                    transcript=recording.transcript,
+                    language=recording.language,
+                    deal_title=recording.deal_title,
+                    recording_id=recording.id,
+                )
+        except AIServiceUnavailable as e:
+            return self._unavailable_response(e)
         except Exception as e:
             return Response(
                 {
@@ -221,33 +374,11 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
 
         recording.analysis_json = result.get("analysis_json") or result
         recording.status = CallRecording.Status.ANALYZED
-        recording.save(update_fields=["analysis_json", "status"])
-
-        if recording.salesperson_email:
-            delivery = None
-            try:
-                delivery, _ = NotificationDelivery.objects.get_or_create(
-                    recording=recording,
-                    kind=NotificationDelivery.Kind.ANALYSIS,
-                    defaults={
-                        "channel": NotificationDelivery.Channel.EMAIL,
-                        "salesperson_email": recording.salesperson_email,
-                        "status": NotificationDelivery.Status.PENDING,
-                    },
-                )
-            except Exception as e:
-                logger.error(
-                    "Failed to create NotificationDelivery for recording %s: %s",
-                    recording.id, e,
-                )
-            if delivery is not None:
-                try:
-                    send_delivery.delay(delivery.id)
-                except Exception as e:
-                    logger.error(
-                        "Failed to enqueue send_delivery for delivery %s (recording %s): %s",
-                        delivery.id, recording.id, e,
-                    )
+        stamp(recording, StageEvent.Stage.ANALYZE, result)
+        with transaction.atomic():
+            recording.save(update_fields=["analysis_json", "stage_versions", "status"])
+            queue_notification(recording, NotificationDelivery.Kind.ANALYSIS)
+        _refresh_insights(recording)
 
         return Response(
             CallRecordingSerializer(recording, context={"request": request}).data,
@@ -276,14 +407,21 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        quota_response = self._pipeline_quota_response(request)
+        if quota_response is not None:
+            return quota_response
+
         try:
-            result = feedback_via_ai_service(
-                transcript=recording.transcript,
-                language=recording.language,
-                deal_title=recording.deal_title,
-                recording_id=recording.id,
-                analysis_json=recording.analysis_json,
-            )
+            with track_stage(recording, StageEvent.Stage.FEEDBACK):
+                result = feedback_via_ai_service(
+                    transcript=recording.transcript,
+                    language=recording.language,
+                    deal_title=recording.deal_title,
+                    recording_id=recording.id,
+                    analysis_json=recording.analysis_json,
+                )
+        except AIServiceUnavailable as e:
+            return self._unavailable_response(e)
         except Exception as e:
             return Response(
                 {
@@ -307,33 +445,11 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
 
         recording.feedback_json = feedback_json
         recording.status = CallRecording.Status.FEEDBACK_READY
-        recording.save(update_fields=["feedback_json", "status"])
-
-        if recording.salesperson_email:
-            delivery = None
-            try:
-                delivery, _ = NotificationDelivery.objects.get_or_create(
-                    recording=recording,
-                    kind=NotificationDelivery.Kind.FEEDBACK,
-                    defaults={
-                        "channel": NotificationDelivery.Channel.EMAIL,
-                        "salesperson_email": recording.salesperson_email,
-                        "status": NotificationDelivery.Status.PENDING,
-                    },
-                )
-            except Exception as e:
-                logger.error(
-                    "Failed to create NotificationDelivery for recording %s: %s",
-                    recording.id, e,
-                )
-            if delivery is not None:
-                try:
-                    send_delivery.delay(delivery.id)
-                except Exception as e:
-                    logger.error(
-                        "Failed to enqueue send_delivery for delivery %s (recording %s): %s",
-                        delivery.id, recording.id, e,
-                    )
+        stamp(recording, StageEvent.Stage.FEEDBACK, result)
+        with transaction.atomic():
+            recording.save(update_fields=["feedback_json", "stage_versions", "status"])
+            queue_notification(recording, NotificationDelivery.Kind.FEEDBACK)
+        _refresh_insights(recording)
 
         return Response(
             CallRecordingSerializer(recording, context={"request": request}).data,
@@ -371,16 +487,23 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
 
         analysis_payload = recording.analysis_json
 
+        quota_response = self._pipeline_quota_response(request)
+        if quota_response is not None:
+            return quota_response
+
         try:
-            result = generate_followup_via_ai_service(
-                recording_id=recording.id,
-                transcript=recording.transcript,
-                deal_title=recording.deal_title,
-                analysis_json=analysis_payload,
-                language=getattr(recording, "language", "auto") or "auto",
-                channel=request.data.get("channel", "whatsapp"),
-                tone=request.data.get("tone", "friendly"),
-            )
+            with track_stage(recording, StageEvent.Stage.FOLLOWUP):
+                result = generate_followup_via_ai_service(
+                    recording_id=recording.id,
+                    transcript=recording.transcript,
+                    deal_title=recording.deal_title,
+                    analysis_json=analysis_payload,
+                    language=getattr(recording, "language", "auto") or "auto",
+                    channel=request.data.get("channel", "whatsapp"),
+                    tone=request.data.get("tone", "friendly"),
+                )
+        except AIServiceUnavailable as e:
+            return self._unavailable_response(e)
         except Exception as e:
             return Response(
                 {
@@ -402,33 +525,10 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
 
         recording.followup_json = followup_json
         recording.status = CallRecording.Status.FOLLOWUP_READY
-        recording.save(update_fields=["followup_json", "status"])
-
-        if recording.salesperson_email:
-            delivery = None
-            try:
-                delivery, _ = NotificationDelivery.objects.get_or_create(
-                    recording=recording,
-                    kind=NotificationDelivery.Kind.FOLLOWUP,
-                    defaults={
-                        "channel": NotificationDelivery.Channel.EMAIL,
-                        "salesperson_email": recording.salesperson_email,
-                        "status": NotificationDelivery.Status.PENDING,
-                    },
-                )
-            except Exception as e:
-                logger.error(
-                    "Failed to create NotificationDelivery for recording %s: %s",
-                    recording.id, e,
-                )
-            if delivery is not None:
-                try:
-                    send_delivery.delay(delivery.id)
-                except Exception as e:
-                    logger.error(
-                        "Failed to enqueue send_delivery for delivery %s (recording %s): %s",
-                        delivery.id, recording.id, e,
-                    )
+        stamp(recording, StageEvent.Stage.FOLLOWUP, result)
+        with transaction.atomic():
+            recording.save(update_fields=["followup_json", "stage_versions", "status"])
+            queue_notification(recording, NotificationDelivery.Kind.FOLLOWUP)
 
         return Response(
             CallRecordingSerializer(recording, context={"request": request}).data,
@@ -463,16 +563,23 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        quota_response = self._pipeline_quota_response(request)
+        if quota_response is not None:
+            return quota_response
+
         try:
-            result = generate_followup_via_ai_service(
-                recording_id=recording.id,
-                transcript=recording.transcript,
-                deal_title=recording.deal_title,
-                analysis_json=recording.analysis_json,
-                language=getattr(recording, "language", "auto") or "auto",
-                channel=request.data.get("channel", "whatsapp"),
-                tone=request.data.get("tone", "friendly"),
-            )
+            with track_stage(recording, StageEvent.Stage.FOLLOWUP):
+                result = generate_followup_via_ai_service(
+                    recording_id=recording.id,
+                    transcript=recording.transcript,
+                    deal_title=recording.deal_title,
+                    analysis_json=recording.analysis_json,
+                    language=getattr(recording, "language", "auto") or "auto",
+                    channel=request.data.get("channel", "whatsapp"),
+                    tone=request.data.get("tone", "friendly"),
+                )
+        except AIServiceUnavailable as e:
+            return self._unavailable_response(e)
         except Exception as e:
             return Response(
                 {"detail": f"AI service follow-up failed: {e} \n(generate_followup_via_ai_service)"},
@@ -494,9 +601,284 @@ class CallRecordingViewSet(viewsets.ModelViewSet):
         # analysis_json and feedback_json are guaranteed to exist (checked above),
         # and followup was just generated — the full pipeline is complete.
         recording.status = CallRecording.Status.DONE
-        recording.save(update_fields=["followup_json", "status"])
+        recording.completed_at = recording.completed_at or timezone.now()
+        stamp(recording, StageEvent.Stage.FOLLOWUP, result)
+        recording.save(update_fields=["followup_json", "stage_versions", "status", "completed_at"])
 
         return Response(
             CallRecordingSerializer(recording, context={"request": request}).data,
             status=status.HTTP_200_OK,
         )
+
+    @action(detail=True, methods=["post"])
+    def rerun(self, request, pk=None):
+        """
+        POST /api/recordings/<id>/rerun/
+        Body: {"stages": ["analyze", "feedback", "followup"]}  (default: all)
+
+        Clears the chosen stage outputs and queues the pipeline in the
+        interactive lane, ahead of normal and bulk work. Returns 202 at once.
+        """
+        recording = self.get_object()
+
+        stages = request.data.get("stages") or list(RERUN_CLEARS)
+        try:
+            fields = rerun_fields(stages if isinstance(stages, list) else [stages])
+        except ValueError as exc:
+            raise ValidationError({"stages": str(exc)})
+
+        if not recording.transcript:
+            return Response(
+                {"detail": "Cannot re-run: transcript is missing."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        quota_response = self._pipeline_quota_response(request)
+        if quota_response is not None:
+            return quota_response
+
+        with transaction.atomic():
+            running = recording.pipeline_jobs.filter(state=PipelineJob.State.RUNNING)
+            if running.exclude(admitted_at__lt=lost_cutoff()).exists():
+                return Response(
+                    {"detail": "The pipeline is already running for this recording."},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            for field in fields:
+                setattr(recording, field, None)
+            recording.status = CallRecording.Status.TRANSCRIBED
+            recording.error_stage = None
+            recording.error_message = None
+            recording.save(update_fields=[*fields, "status", "error_stage", "error_message"])
+            job = schedule_pipeline(recording, lane=PipelineJob.Lane.INTERACTIVE)
+
+        return Response(
+            {"job_id": job.id, "state": job.state, "cleared": fields},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        GET /api/recordings/search/?q=<text>&limit=<n>
+
+        The org's recordings whose transcript or deal title match `q`, best
+        first (at most `limit`, default 20, max 100), each with a highlighted
+        snippet. Matched words are wrapped in <mark>; the rest is HTML-escaped.
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required."})
+        try:
+            limit = min(max(int(request.query_params.get("limit", SEARCH_DEFAULT_LIMIT)), 1), SEARCH_MAX_LIMIT)
+        except ValueError:
+            raise ValidationError({"limit": "Expected an integer."})
+
+        results = search_recordings(self.get_queryset(), query, limit)
+        return Response(
+            {"results": RecordingSearchResultSerializer(results, many=True).data},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="stage-latency")
+    def stage_latency(self, request):
+        """
+        GET /api/recordings/stage-latency/?since=<iso>&until=<iso>
+
+        p50/p95 duration in seconds of each pipeline stage for the user's org.
+        Defaults to the last 7 days.
+        """
+        org_id = getattr(request.user, "org_id", None)
+        if not org_id:
+            return Response({"stages": []}, status=status.HTTP_200_OK)
+
+        until = _parse_datetime_param(request, "until") or timezone.now()
+        since = _parse_datetime_param(request, "since") or until - timedelta(days=7)
+        if since >= until:
+            raise ValidationError({"since": "Must be earlier than 'until'."})
+
+        return Response(
+            {
+                "since": since,
+                "until": until,
+                "stages": stage_latency_percentiles(org_id, since, until),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[IsOrgAdmin])
+    def dashboard(self, request):
+        """
+        GET /api/recordings/dashboard/?since=<date>&until=<date>
+
+        Org admins: volume, status mix, failure rate and stage, turnaround, and
+        per-day and per-salesperson counts for recordings uploaded on days
+        [since, until] (UTC). Defaults to the last 30 days. Served from rollups
+        refreshed every few minutes; `refreshed_at` says how current they are.
+        """
+        org_id = getattr(request.user, "org_id", None)
+        if not org_id:
+            raise ValidationError({"org": "User must belong to an organization."})
+
+        until = _parse_date_param(request, "until") or timezone.now().astimezone(dt_timezone.utc).date()
+        since = _parse_date_param(request, "since") or until - timedelta(days=DASHBOARD_DEFAULT_DAYS - 1)
+        if since > until:
+            raise ValidationError({"since": "Must not be later than 'until'."})
+
+        return Response(
+            {"since": since, "until": until, **dashboard.org_dashboard(org_id, since, until)},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], url_path="export", permission_classes=[IsOrgAdmin])
+    def export_recordings(self, request):
+        """
+        GET /api/recordings/export/?as=csv|parquet&since=<iso>&until=<iso>
+
+        Org admins: every recording of the org created in [since, until), with
+        insights, stage outputs (JSON text) and notification counts, streamed
+        as a file. One export per org at a time; a second gets 409.
+        """
+        org_id = getattr(request.user, "org_id", None)
+        if not org_id:
+            raise ValidationError({"org": "User must belong to an organization."})
+        fmt = request.query_params.get("as", "csv")
+
+        recordings = CallRecording.objects.all()
+        since = _parse_datetime_param(request, "since")
+        until = _parse_datetime_param(request, "until")
+        if since:
+            recordings = recordings.filter(created_at__gte=since)
+        if until:
+            recordings = recordings.filter(created_at__lt=until)
+
+        try:
+            body = export.OrgExport(org_id, fmt, recordings)
+        except export.ExportBusy as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        except export.ExportError as exc:
+            raise ValidationError({"as": str(exc)})
+
+        response = StreamingHttpResponse(body, content_type=export.CONTENT_TYPES[fmt])
+        filename = export.default_name(org_id, fmt, timezone.now())
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class BulkJobViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Bulk operations over the org's recordings (org admins only).
+
+    GET  /api/bulk-jobs/                 -> jobs, newest first
+    GET  /api/bulk-jobs/<id>/            -> job plus progress
+    POST /api/bulk-jobs/import/          -> manifest=<CSV/JSONL file> or {"s3_prefix": ...}
+    POST /api/bulk-jobs/rerun/           -> {"stages": [...], "since", "until", "statuses",
+                                             "incremental"}
+    POST /api/bulk-jobs/<id>/cancel/
+    """
+    serializer_class = BulkJobSerializer
+    permission_classes = [IsOrgAdmin]
+    parser_classes = [parsers.JSONParser, parsers.MultiPartParser, parsers.FormParser]
+
+    def get_queryset(self):
+        return BulkJob.objects.filter(org_id=self.request.user.org_id)
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        return Response({**self.get_serializer(job).data, "progress": bulk.job_progress(job)})
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_recordings(self, request):
+        """
+        Manifest rows reference audio already uploaded to the org's staging
+        prefix, imports/<org_id>/ (`audio` = storage key); s3_prefix must lie
+        within it too. Optional defaults: language, salesperson_email.
+        """
+        defaults = {
+            key: request.data[key]
+            for key in ("language", "salesperson_email")
+            if request.data.get(key)
+        }
+        manifest = request.FILES.get("manifest")
+        prefix = request.data.get("s3_prefix")
+        if bool(manifest) == bool(prefix):
+            raise ValidationError({"detail": "Send exactly one of 'manifest' or 's3_prefix'."})
+        try:
+            if manifest:
+                items = bulk.read_manifest(manifest, manifest.name, defaults)
+                source = manifest.name
+            else:
+                prefix = bulk.staged_prefix(request.user.org, prefix)
+                items = bulk.list_s3_prefix(prefix, defaults)
+                source = f"s3://{prefix}"
+            job = bulk.create_import_job(
+                request.user.org, items, created_by=request.user, source=source, staged=True
+            )
+        except bulk.BulkJobError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["post"])
+    def rerun(self, request):
+        """
+        Re-run pipeline stages for many recordings, in throttled batches in the
+        bulk lane. Filters: created_at in [since, until), status in statuses.
+        With "incremental": true, only outputs that are stale (new AI service
+        version or changed inputs) are regenerated and "stages" is ignored.
+        """
+        try:
+            check_pipeline_quota(request.user.org)
+        except QuotaExceeded as exc:
+            raise Throttled(detail=str(exc))
+        statuses = request.data.get("statuses") or []
+        stages = request.data.get("stages") or []
+        if not isinstance(statuses, list) or not isinstance(stages, list):
+            raise ValidationError({"detail": "'stages' and 'statuses' must be lists."})
+        try:
+            job = bulk.create_rerun_job(
+                request.user.org,
+                stages,
+                since=parse_datetime_value(request.data.get("since"), "since"),
+                until=parse_datetime_value(request.data.get("until"), "until"),
+                statuses=statuses,
+                created_by=request.user,
+                incremental=bool(request.data.get("incremental")),
+            )
+        except bulk.BulkJobError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        job = bulk.cancel_job(self.get_object())
+        return Response(self.get_serializer(job).data)
+
+
+def _refresh_insights(recording):
+    # After the stage output is committed: a failed extraction must not roll it
+    # back, and `manage.py backfill_insights` can redo it later.
+    try:
+        save_insights(recording)
+    except Exception as e:
+        logger.error("insights extraction failed for recording %s: %s", recording.id, e)
+
+
+def _parse_datetime_param(request, name):
+    return parse_datetime_value(request.query_params.get(name), name)
+
+
+def _parse_date_param(request, name):
+    raw = request.query_params.get(name)
+    if not raw:
+        return None
+    try:
+        value = parse_date(raw)
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Expected an ISO 8601 date."})
+    return value